@@ -0,0 +1,62 @@
+"""
+Compare benchmark results against a stored baseline.
+
+Every (source, stage) whose ops/sec fell by more than the threshold is
+flagged as a regression, and the exit status is 1 if any was, so this can
+gate a change. Compare results of the same size taken on the same machine.
+
+Usage:
+  python benchmarks/compare.py benchmarks/results/10k-20261019-101500.json
+  python benchmarks/compare.py new.json --baseline old.json --threshold 0.15
+  python benchmarks/compare.py benchmarks/results/parsers-20261019-101500.json   # parsers.py output
+"""
+import argparse
+import json
+import sys
+from pathlib import Path
+
+HERE = Path(__file__).resolve().parent
+
+
+def compare(baseline: dict, current: dict, threshold: float) -> list[dict]:
+    """One row per (source, stage) present in both, with the relative change."""
+    base = {(r["source"], r["stage"]): r for r in baseline["results"]}
+    rows = []
+    for r in current["results"]:
+        b = base.get((r["source"], r["stage"]))
+        if b is None or not b["ops_per_sec"]:
+            continue
+        change = r["ops_per_sec"] / b["ops_per_sec"] - 1
+        rows.append({
+            "source": r["source"], "stage": r["stage"], "baseline": b["ops_per_sec"],
+            "current": r["ops_per_sec"], "change": change, "regression": change < -threshold,
+        })
+    return rows
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="Flag per-stage throughput regressions against a baseline")
+    ap.add_argument("results", type=Path)
+    ap.add_argument("--baseline", type=Path, help="default benchmarks/baseline-<size>.json")
+    ap.add_argument("--threshold", type=float, default=0.10, help="allowed slowdown, as a fraction (default 0.10)")
+    args = ap.parse_args()
+
+    current = json.loads(args.results.read_text())
+    base_path = args.baseline or HERE / f"baseline-{current['meta']['size']}.json"
+    if not base_path.exists():
+        sys.exit(f"No baseline at {base_path} (run benchmarks/run.py --save-baseline first)")
+    baseline = json.loads(base_path.read_text())
+    if baseline["meta"]["size"] != current["meta"]["size"]:
+        sys.exit(f"Size mismatch: baseline {baseline['meta']['size']}, results {current['meta']['size']}")
+
+    rows = compare(baseline, current, args.threshold)
+    print(f"[COMPARE] {args.results.name} vs {base_path.name} "
+          f"({baseline['meta'].get('commit') or '?'} -> {current['meta'].get('commit') or '?'}), "
+          f"threshold -{args.threshold:.0%}")
+    for r in rows:
+        flag = "REGRESSION" if r["regression"] else ""
+        print(f"  {r['source']:11s} {r['stage']:14s} {r['baseline']:12,.0f} -> {r['current']:12,.0f} "
+              f"{r['change']:+7.1%}  {flag}")
+    regressions = [r for r in rows if r["regression"]]
+    print(f"[COMPARE] {len(regressions)} regression(s) in {len(rows)} measurements")
+    sys.exit(1 if regressions else 0)
@@ -0,0 +1,244 @@
+"""
+Synthetic payloads shaped like each source's raw API results.
+
+payloads(source, n) yields (unit, results) pairs the way the source's
+fetch() returns them — Greenhouse `jobs` entries, Lever posting lists,
+Ashby boards with compensation, the RemoteOK feed, JSearch `data`, SerpAPI
+`organic_results` and Adzuna `results` — until n postings have been
+produced. Boards hold 20-400 postings, query pages 10-40 results. Titles,
+locations, salary text and descriptions mix matching and non-matching
+values in roughly the proportions real boards show, and everything is
+drawn from a seeded Random, so a size and seed always give the same corpus.
+
+Usage:
+  python benchmarks/generate.py --size 10k --out benchmarks/corpus   # gzipped JSON lines per source
+"""
+import argparse
+import gzip
+import json
+import random
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Iterator
+
+SIZES = {"10k": 10_000, "100k": 100_000, "1m": 1_000_000}
+SOURCES = ("greenhouse", "lever", "ashby", "remoteok", "jsearch", "serp", "adzuna")
+
+_LEVELS = ["", "", "Senior ", "Staff ", "Lead ", "Principal ", "Junior ", "Sr. "]
+_ROLES = [
+    "Software Engineer", "Backend Engineer", "Frontend Developer", "Full Stack Engineer",
+    "SDE II", "Data Engineer", "Machine Learning Engineer", "Site Reliability Engineer",
+    "DevOps Engineer", "Android Developer", "iOS Engineer", "Platform Engineer",
+    "Golang Developer", "Python Developer", "React Developer", "Data Scientist",
+]
+_OTHER_ROLES = [
+    "Account Executive", "Recruiter", "Sales Development Representative", "Office Manager",
+    "Marketing Manager", "Customer Success Manager", "Legal Counsel", "HR Business Partner",
+    "Financial Analyst", "Product Designer", "Technical Writer", "Engineering Manager",
+]
+_TEAMS = ["", "", " - Payments", " (Infrastructure)", ", Growth", " - Search", " | Platform", " II"]
+_LOCATIONS = [
+    "Bengaluru, Karnataka, India", "Bangalore", "Hyderabad, India", "Pune, Maharashtra",
+    "Gurugram, Haryana", "Mumbai", "Chennai, Tamil Nadu, India", "Noida", "Remote - India",
+    "India (Remote)", "San Francisco, CA", "New York, NY, United States", "Seattle, WA",
+    "London, UK", "Berlin, Germany", "Toronto, Canada", "Singapore", "Remote",
+    "Anywhere", "Austin, Texas", "Dublin, Ireland", "Amsterdam, Netherlands", "",
+]
+_SALARY_TEXT = [
+    "", "", "", "₹25-40 LPA", "18 - 24 LPA", "$120,000 - $160,000", "$140k-$180k",
+    "INR 18,00,000 - 24,00,000 per annum", "€70,000 - €90,000", "£60k - £80k",
+    "$55/hour", "₹1,50,000 per month",
+]
+_PERKS = [
+    "We sponsor visas for the right candidates.", "Competitive equity (ESOPs) for every employee.",
+    "Health insurance for you and your family.", "Relocation support available.",
+    "Flexible remote-first working.", "Stock options and an annual learning budget.",
+]
+_FILLER = (
+    "You will design, build and operate services used by millions of people. "
+    "We care about clean code, thoughtful reviews and shipping small changes often. "
+    "Experience with distributed systems, SQL and cloud infrastructure is a plus. "
+)
+
+
+def _slugs() -> list[str]:
+    path = Path(__file__).resolve().parent.parent / "scraper" / "companies.json"
+    with open(path) as f:
+        boards = json.load(f)
+    return [*boards.get("greenhouse", []), *boards.get("lever", [])] or ["acme"]
+
+
+class _Gen:
+    def __init__(self, seed: int) -> None:
+        self.rng = random.Random(seed)
+        self.slugs = _slugs()
+        self.now = datetime(2026, 10, 1)
+        self.seq = 0
+
+    def title(self) -> str:
+        r = self.rng
+        if r.random() < 0.55:
+            return f"{r.choice(_LEVELS)}{r.choice(_ROLES)}{r.choice(_TEAMS)}"
+        return f"{r.choice(_LEVELS)}{r.choice(_OTHER_ROLES)}"
+
+    def location(self) -> str:
+        return self.rng.choice(_LOCATIONS)
+
+    def company(self) -> str:
+        return self.rng.choice(self.slugs).replace("-", " ").title()
+
+    def description(self) -> str:
+        r = self.rng
+        parts = [_FILLER * r.randint(1, 4), *r.sample(_PERKS, r.randint(0, 3)), r.choice(_SALARY_TEXT)]
+        return " ".join(parts)
+
+    def iso(self, days: int = 30) -> str:
+        return (self.now - timedelta(days=self.rng.randint(0, days), minutes=self.rng.randint(0, 1440))).isoformat()
+
+    def next_id(self) -> int:
+        self.seq += 1
+        return self.seq
+
+
+def _greenhouse(g: _Gen, slug: str) -> dict:
+    pid = g.next_id()
+    return {
+        "id": pid, "internal_job_id": pid * 7, "title": g.title(), "updated_at": g.iso() + "-04:00",
+        "location": {"name": g.location()}, "requisition_id": f"R{pid}",
+        "absolute_url": f"https://boards.greenhouse.io/{slug}/jobs/{pid}", "metadata": None,
+    }
+
+
+def _lever(g: _Gen, slug: str) -> dict:
+    pid = g.next_id()
+    return {
+        "id": f"{pid:08x}-lever", "text": g.title(), "createdAt": 1_780_000_000_000 + pid,
+        "categories": {"location": g.location(), "team": "Engineering", "commitment": "Full-time"},
+        "hostedUrl": f"https://jobs.lever.co/{slug}/{pid:08x}", "descriptionPlain": g.description()[:400],
+    }
+
+
+def _ashby(g: _Gen, slug: str) -> dict:
+    r = g.rng
+    pid = g.next_id()
+    comp: Any = {}
+    roll = r.random()
+    if roll < 0.35:
+        low = r.choice([80_000, 100_000, 120_000, 2_000_000, 3_000_000])
+        comp = {"min": low, "max": int(low * 1.4), "currency": "INR" if low > 1_000_000 else "USD", "period": "year"}
+    elif roll < 0.55:
+        comp = ""
+    return {
+        "id": f"ash-{pid}", "title": g.title(), "location": g.location(), "department": "Engineering",
+        "team": "Core", "employmentType": "FullTime", "isRemote": r.random() < 0.3,
+        "publishedAt": g.iso(), "updatedAt": g.iso(7), "jobUrl": f"https://jobs.ashbyhq.com/{slug}/{pid}",
+        "compensation": comp, "compensationTierSummary": r.choice(_SALARY_TEXT),
+        "descriptionPlain": g.description(),
+    }
+
+
+def _remoteok(g: _Gen) -> dict:
+    r = g.rng
+    pid = g.next_id()
+    low = r.choice([0, 0, 60_000, 90_000, 130_000])
+    return {
+        "id": str(pid), "epoch": 1_780_000_000 + pid, "date": g.iso(), "company": g.company(),
+        "position": g.title(), "tags": r.sample(["python", "react", "golang", "devops", "sales", "ml"], 3),
+        "description": g.description(), "location": r.choice(["Worldwide", "India", "USA", "Europe", ""]),
+        "salary_min": low, "salary_max": int(low * 1.3), "slug": f"remote-job-{pid}",
+        "url": f"https://remoteok.com/remote-jobs/{pid}",
+    }
+
+
+def _jsearch(g: _Gen) -> dict:
+    r = g.rng
+    pid = g.next_id()
+    loc = g.location()
+    has_salary = r.random() < 0.3
+    return {
+        "job_id": f"js{pid}", "job_title": g.title(), "employer_name": g.company() + r.choice(["", " Inc.", " Pvt Ltd"]),
+        "job_apply_link": f"https://example-ats.com/apply/{pid}", "job_location": loc,
+        "job_city": loc.split(",")[0] if r.random() < 0.5 else "", "job_state": "",
+        "job_country": r.choice(["IN", "US", "GB", ""]), "job_is_remote": r.random() < 0.25,
+        "job_min_salary": r.choice([50_000, 1_800_000]) if has_salary else None,
+        "job_max_salary": r.choice([90_000, 2_600_000]) if has_salary else None,
+        "job_salary_currency": r.choice(["USD", "INR"]) if has_salary else None,
+        "job_salary_period": r.choice(["YEAR", "MONTH", "HOUR"]) if has_salary else None,
+        "job_posted_at_datetime_utc": g.iso() + "Z", "job_description": g.description(),
+        "job_highlights": {"Benefits": [r.choice(_SALARY_TEXT) or "Health insurance"]},
+    }
+
+
+def _serp(g: _Gen) -> dict:
+    r = g.rng
+    pid = g.next_id()
+    slug = r.choice(g.slugs)
+    host = r.choice([
+        f"boards.greenhouse.io/{slug}/jobs/{pid}", f"jobs.lever.co/{slug}/{pid:08x}",
+        f"apply.workable.com/{slug}/j/{pid:X}", f"www.glassdoor.com/job-listing/{pid}",
+        f"careers.{slug}.com/jobs/{pid}",
+    ])
+    title = r.choice([f"{g.title()} - {g.company()}", f"{g.title()} at {g.company()}",
+                      f"{r.randint(100, 9000)} {g.title()} jobs in India", f"{g.title()} | Careers"])
+    return {
+        "position": pid % 40 + 1, "title": title, "link": f"https://{host}",
+        "displayed_link": host.split("/")[0], "snippet": f"{g.location()} · {g.description()[:160]}",
+        "date": r.choice(["", "2 days ago", "5 hours ago", "3 weeks ago", "Sep 28, 2026", "2026-09-30"]),
+    }
+
+
+def _adzuna(g: _Gen) -> dict:
+    r = g.rng
+    pid = g.next_id()
+    loc = g.location()
+    return {
+        "id": str(pid), "title": g.title(), "company": {"display_name": g.company()},
+        "location": {"display_name": loc, "area": [p.strip() for p in loc.split(",") if p.strip()]},
+        "redirect_url": f"https://www.adzuna.in/land/ad/{pid}", "created": g.iso() + "Z",
+        "salary_min": r.choice([None, 800_000, 1_500_000, 95_000]), "salary_max": r.choice([None, 2_400_000, 130_000]),
+        "description": g.description()[:500],
+    }
+
+
+_BOARD = {"greenhouse": _greenhouse, "lever": _lever, "ashby": _ashby}
+_FEED = {"remoteok": _remoteok, "jsearch": _jsearch, "serp": _serp, "adzuna": _adzuna}
+
+
+def payloads(source: str, n: int, seed: int = 0) -> Iterator[tuple[Any, list[dict]]]:
+    """(unit, raw results) pairs for a source until n postings have been yielded."""
+    g = _Gen(seed * 1000 + SOURCES.index(source))
+    made = 0
+    page = 0
+    while made < n:
+        if source in _BOARD:
+            slug = g.slugs[page % len(g.slugs)] + (f"-{page // len(g.slugs)}" if page >= len(g.slugs) else "")
+            size = min(n - made, g.rng.randint(20, 400))
+            unit: Any = slug
+            results = [_BOARD[source](g, slug) for _ in range(size)]
+        else:
+            size = min(n - made, g.rng.randint(10, 40))
+            unit = {"query": f"software engineer page {page}", "discover": True, "what": "software engineer"}
+            results = [_FEED[source](g) for _ in range(size)]
+            if source == "remoteok":
+                unit = "Remote OK API"
+        made += size
+        page += 1
+        yield unit, results
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="Write a synthetic payload corpus (gzipped JSON per source)")
+    ap.add_argument("--size", choices=SIZES, default="10k")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--out", type=Path, default=Path(__file__).resolve().parent / "corpus")
+    args = ap.parse_args()
+
+    args.out.mkdir(parents=True, exist_ok=True)
+    for src in SOURCES:
+        path = args.out / f"{src}-{args.size}.json.gz"
+        with gzip.open(path, "wt", encoding="utf-8") as f:
+            units = 0
+            for unit, results in payloads(src, SIZES[args.size], args.seed):
+                f.write(json.dumps({"unit": unit, "results": results}) + "\n")
+                units += 1
+        print(f"  {src:11s} {units:6d} units -> {path} ({path.stat().st_size / 1e6:.1f} MB)")
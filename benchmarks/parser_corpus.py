@@ -0,0 +1,269 @@
+"""
+Input strings for the parser benchmark (parsers.py).
+
+Each parser gets strings in the shapes the sources actually send:
+Greenhouse / Lever / Ashby location fields, salary snippets from job
+descriptions and Ashby compensation summaries, description paragraphs
+with and without perk wording, and the date formats seen in posted_date
+and SerpAPI results. Fragments are combined by a seeded Random, so
+build() is deterministic. Tricky cases the parsers are known to trip on
+("Indiana", "diversity, equity and inclusion", "pursuing") are included
+on purpose: the corpus pins current behaviour, quirks included.
+
+parsers.py --rebuild merges these inputs into benchmarks/oracles/, and
+parsers.py --harvest adds real strings from recorded HTTP fixtures.
+"""
+import random
+from datetime import date, datetime, timedelta
+
+TARGETS = {"location": 1500, "salary": 1200, "perks": 500, "normalize_date": 700, "serp_date": 500}
+
+_IN_CITIES = [
+    ("Bengaluru", "Karnataka"), ("Bangalore", "Karnataka"), ("Mumbai", "Maharashtra"),
+    ("Pune", "Maharashtra"), ("Hyderabad", "Telangana"), ("Chennai", "Tamil Nadu"),
+    ("Gurugram", "Haryana"), ("Gurgaon", "Haryana"), ("Noida", "Uttar Pradesh"),
+    ("New Delhi", "Delhi"), ("Kolkata", "West Bengal"), ("Ahmedabad", "Gujarat"),
+    ("Kochi", "Kerala"), ("Thiruvananthapuram", "Kerala"), ("Jaipur", "Rajasthan"),
+    ("Coimbatore", "Tamil Nadu"), ("Indore", "Madhya Pradesh"), ("Chandigarh", "Punjab"),
+    ("Bhubaneswar", "Odisha"), ("Mysore", "Karnataka"), ("Vadodara", "Gujarat"),
+]
+_US_CITIES = [
+    ("San Francisco", "CA"), ("New York", "NY"), ("Seattle", "WA"), ("Austin", "TX"),
+    ("Boston", "MA"), ("Chicago", "IL"), ("Denver", "CO"), ("Atlanta", "GA"),
+    ("Mountain View", "CA"), ("Palo Alto", "CA"), ("Sunnyvale", "CA"), ("Redmond", "WA"),
+    ("Portland", "OR"), ("Dallas", "TX"), ("Miami", "FL"), ("Pittsburgh", "PA"),
+    ("Salt Lake City", "UT"), ("Raleigh", "NC"), ("Nashville", "TN"), ("Indianapolis", "IN"),
+]
+_US_STATE_NAMES = ["California", "New York", "Texas", "Washington", "Massachusetts", "Colorado",
+                   "Illinois", "Georgia", "Virginia", "Indiana", "Delaware", "Oklahoma"]
+_WORLD_CITIES = [
+    ("London", "United Kingdom"), ("Manchester", "UK"), ("Edinburgh", "Scotland"),
+    ("Berlin", "Germany"), ("Munich", "Germany"), ("Amsterdam", "Netherlands"),
+    ("Dublin", "Ireland"), ("Paris", "France"), ("Toronto", "Canada"), ("Vancouver", "BC"),
+    ("Waterloo", "Ontario"), ("Sydney", "Australia"), ("Melbourne", "Victoria"),
+    ("Singapore", "Singapore"), ("Tokyo", "Japan"), ("Kuala Lumpur", "Malaysia"),
+    ("Auckland", "New Zealand"), ("Tel Aviv", "Israel"), ("Warsaw", "Poland"),
+    ("Lisbon", "Portugal"), ("Barcelona", "Spain"), ("Zurich", "Switzerland"),
+    ("Stockholm", "Sweden"), ("São Paulo", "Brazil"), ("Mexico City", "Mexico"),
+    ("Dubai", "UAE"), ("Seoul", "South Korea"), ("Shanghai", "China"), ("Krakow", "Poland"),
+]
+_COUNTRIES = ["India", "United States", "USA", "US", "UK", "Canada", "Germany", "Europe",
+              "EMEA", "APAC", "LATAM", "North America", "Worldwide", "Asia Pacific"]
+_REMOTE_FORMS = [
+    "Remote", "Remote - {c}", "{c} (Remote)", "Remote, {c}", "Remote ({c})", "Remote in {c}",
+    "Fully Remote - {c}", "{c} - Remote", "Work from home, {c}", "WFH", "Anywhere",
+    "Remote-first ({c})", "Distributed", "{c}; Remote", "Remote | {c}",
+]
+_MODES = ["Hybrid", "On-site", "Onsite", "In-office", "Hybrid Remote", "Office"]
+_FIXED_LOCATIONS = [
+    "", " ", "Multiple Locations", "Multiple locations in India", "Various", "HQ", "Head Office",
+    "TBD", "Global", "Flexible", "Remote (US & Canada)", "US or Canada", "Americas",
+    "Remote — Anywhere in the world", "Bay Area", "NYC", "SF Bay Area", "Greater London",
+    "Delhi NCR", "NCR", "Bangalore Urban", "Bengaluru East", "Hyderabad (Madhapur)",
+    "Pune / Mumbai", "Bangalore/Hyderabad/Pune", "Chennai, IN", "IN", "Indiana", "Indianapolis, IN",
+    "Columbus, OH", "Los Angeles, CA", "LA", "Washington, DC", "Washington DC", "Goa",
+    "Panaji, Goa", "Lagos, Nigeria", "Nairobi, Kenya", "Cairo, Egypt", "Karachi, Pakistan",
+    "Dhaka, Bangladesh", "Colombo, Sri Lanka", "Kathmandu, Nepal", "Manila, Philippines",
+    "Jakarta, Indonesia", "Ho Chi Minh City, Vietnam", "Bangkok, Thailand", "Cape Town, South Africa",
+]
+
+_SAL_INR_LPA = [
+    "{a}-{b} LPA", "{a} - {b} LPA", "₹{a}-{b} LPA", "INR {a} - {b} LPA", "{a} to {b} LPA",
+    "{a} to {b} lakhs per annum", "{a}-{b} Lakhs", "{a} - {b} lakh", "{a} LPA", "CTC: {a} LPA",
+    "Up to {b} LPA", "{a}L - {b}L", "{a} L.P.A", "{a}-{b} l.p.a.", "₹ {a} – {b} LPA + ESOPs",
+    "{a} lakhs per annum", "Salary: {a} LPA fixed + variable",
+]
+_SAL_INR_ABS = [
+    "₹{x} - ₹{y}", "₹{x}-₹{y} per annum", "INR {x} - {y}", "INR {x} to {y} per year",
+    "Rs. {x} - {y}", "Rs {x} per month", "₹{m} per month", "₹{m}/month", "Rs. {m} monthly",
+    "INR {x}", "₹{x} CTC", "Stipend: ₹{s} per month", "₹{s} p.m.",
+]
+_SAL_USD = [
+    "${lo}K - ${hi}K", "${lo}k-${hi}k", "${lo}K – ${hi}K per year", "${lo},000 - ${hi},000",
+    "${lo},000 – ${hi},000 USD", "USD ${lo},000 to ${hi},000", "$ {lo}k - {hi}k",
+    "${lo},000 annually", "${lo}K base + equity", "Up to ${hi}K", "${lo}K+", "${lo}k OTE",
+    "${h}/hour", "${h} - ${h2} per hour", "${h}/hr", "${h} hourly", "${mo},000/month",
+    "${mo},500 per month", "The base salary range is ${lo},000—${hi},000.",
+    "Compensation: ${lo},000 - ${hi},000 + bonus + equity",
+    "$ {lo}.5K - {hi}.5K",
+]
+_SAL_OTHER = [
+    "€{lo},000 - €{hi},000", "€{lo}k - €{hi}k", "£{lo},000 - £{hi},000", "£{lo}k-£{hi}k",
+    "EUR {lo},000 – {hi},000", "GBP {lo}k", "CA${lo},000 - CA${hi},000", "AUD {lo}k - {hi}k",
+    "SGD {lo},000 – {hi},000", "{lo},000 - {hi},000 EUR",
+]
+_TITLES = [
+    "Senior Software Engineer", "SDE II", "Backend Engineer (Go)", "Staff Engineer, Payments",
+    "Data Scientist - 12 LPA", "Intern - Stipend 50k/month", "ML Engineer ($180K-$220K)",
+    "Engineering Manager", "Frontend Developer - React", "DevOps Engineer (Remote, India)",
+]
+_SAL_FIXED = [
+    "", " ", "Competitive", "Competitive salary", "Not disclosed", "As per industry standards",
+    "Best in industry", "DOE", "Negotiable", "Market rate", "Unpaid", "Equity only",
+    "Salary not specified", "Commensurate with experience", "Attractive package",
+    "0 - 0", "N/A", "—", "Paid internship", "Top of market", "$$$",
+]
+
+_PERK_SENTENCES = [
+    "We offer visa sponsorship for exceptional candidates.", "H1B sponsorship is available for this role.",
+    "We can sponsor H-1B transfers.", "Relocation support is provided to Bengaluru.",
+    "Relocation assistance and a relocation package are available.", "We provide immigration support.",
+    "Work permit assistance available.", "This role is eligible for a Skilled Worker visa.",
+    "Tier 2 sponsorship may be available.", "Candidates must have work authorization in the US.",
+    "We are unable to sponsor visas.", "Employment visa support for international hires.",
+    "Competitive equity and ESOPs for all employees.", "Generous stock options with 4-year vesting.",
+    "RSUs vest quarterly.", "Employee stock purchase plan (ESPP).", "Restricted stock units on joining.",
+    "Equity package with early exercise.", "Phantom stock for senior hires.",
+    "An ownership stake in what we build.", "Stock grants refreshed annually.",
+    "Our stock plan is open to every full-time employee.",
+]
+_NEUTRAL_SENTENCES = [
+    "You will design, build and operate services used by millions of people.",
+    "We care about clean code, thoughtful reviews and shipping small changes often.",
+    "Experience with distributed systems, SQL and cloud infrastructure is a plus.",
+    "We are committed to diversity, equity and inclusion in everything we do.",
+    "Everyone shares ownership of production quality.", "Ideal for graduates pursuing a career in data.",
+    "You will work closely with product, design and customer success.",
+    "Health insurance for you and your family, including parents.",
+    "Flexible working hours and a home office allowance.", "Annual learning and development budget.",
+    "Unlimited PTO and a 4-day work week in summer.", "Free meals at our Bengaluru office.",
+    "Our mission is to make payments work for everyone.", "The team shares knowledge through weekly demos.",
+    "We value curiosity, humility and ownership.", "Gym membership and wellness stipend.",
+    "Experience with Kubernetes, Terraform and AWS.", "Strong fundamentals in data structures and algorithms.",
+]
+
+_DATE_FORMATS = [
+    "%Y-%m-%d", "%Y-%m-%dT%H:%M:%S", "%Y-%m-%dT%H:%M:%SZ", "%Y-%m-%dT%H:%M:%S.000Z",
+    "%Y-%m-%dT%H:%M:%S+05:30", "%Y-%m-%d %H:%M:%S", "%d/%m/%Y", "%m/%d/%Y", "%B %d, %Y",
+    "%b %d, %Y", "%d-%m-%Y", "%d %b %Y", "%d %B %Y", "%Y/%m/%d", "%Y%m%d", "%b %d %Y",
+    "%A, %B %d, %Y", "%d.%m.%Y", "%B %Y", "%a, %d %b %Y %H:%M:%S GMT",
+]
+_DATE_FIXED = [
+    "", " ", "today", "Today", "yesterday", "Just posted", "N/A", "null", "None", "0",
+    "1717171717", "1717171717000", "2024-02-30", "2024-13-01", "2024-00-10", "31/02/2024",
+    "Sept 5, 2025", "Sep. 5, 2025", "5th September 2025", "2025-9-5", "25-09-05",
+    "2025-09-05T10:00", "2025-W36", "Q3 2025", "recently", "30+ days ago",
+]
+_REL_UNITS = ["second", "minute", "hour", "day", "week", "month", "year"]
+_REL_FORMS = [
+    "{n} {u}s ago", "{n} {u} ago", "{n} {U}s ago", "{n} {u}s  ago", "{n}  {u}s ago",
+    "Posted {n} {u}s ago", "{n}+ {u}s ago", "{n} {u}s ago · via LinkedIn", "  {n} {u}s ago  ",
+    "an {u} ago", "a {u} ago", "{n}{u}s ago", "{n} {u}s", "{n} {u}s ago.",
+]
+
+
+def _unique(gen, target: int, rng: random.Random, fixed: list[str]) -> list[str]:
+    out = dict.fromkeys(fixed)
+    attempts = 0
+    while len(out) < target and attempts < target * 20:
+        out[gen(rng)] = None
+        attempts += 1
+    return list(out)
+
+
+def _location(r: random.Random) -> str:
+    roll = r.random()
+    if roll < 0.30:
+        city, state = r.choice(_IN_CITIES)
+        return r.choice([city, f"{city}, {state}", f"{city}, {state}, India", f"{city}, India",
+                         f"{city}, IN", f"{r.choice(_MODES)} - {city}", f"{city} ({r.choice(_MODES)})",
+                         f"{city.upper()}", f"  {city}  ", f"{city}, Karnataka 560103, India"])
+    if roll < 0.50:
+        city, state = r.choice(_US_CITIES)
+        return r.choice([city, f"{city}, {state}", f"{city}, {state}, United States", f"{city}, {state}, USA",
+                         f"{city}, {r.choice(_US_STATE_NAMES)}", f"{r.choice(_MODES)} - {city}, {state}",
+                         f"{city}, {state} (Hybrid)", f"{r.choice(_US_STATE_NAMES)}"])
+    if roll < 0.68:
+        city, country = r.choice(_WORLD_CITIES)
+        return r.choice([city, f"{city}, {country}", f"{city} ({r.choice(_MODES)})", f"{country}",
+                         f"{r.choice(_MODES)}: {city}", f"{city} - {country}"])
+    if roll < 0.88:
+        return r.choice(_REMOTE_FORMS).format(c=r.choice(_COUNTRIES))
+    a = r.choice([c for c, _ in _IN_CITIES + _US_CITIES + _WORLD_CITIES])
+    b = r.choice([c for c, _ in _IN_CITIES + _US_CITIES + _WORLD_CITIES])
+    return r.choice([f"{a} / {b}", f"{a}; {b}", f"{a}, {b}, Remote", f"{a} or {b}", f"{a} | {b} | Remote"])
+
+
+def _lakh(n: int) -> str:
+    """Indian digit grouping: 1800000 -> 18,00,000."""
+    s = str(n)
+    if len(s) <= 3:
+        return s
+    head, tail = s[:-3], s[-3:]
+    groups = []
+    while len(head) > 2:
+        groups.insert(0, head[-2:])
+        head = head[:-2]
+    return ",".join(([head] if head else []) + groups) + "," + tail
+
+
+def _salary(r: random.Random) -> str:
+    roll = r.random()
+    if roll < 0.30:
+        a = r.choice([r.randint(3, 60), round(r.uniform(3, 60), 1)])
+        b = a + r.choice([2, 4, 5, 8, 10, 15, 0.5])
+        return r.choice(_SAL_INR_LPA).format(a=a, b=round(b, 1) if isinstance(b, float) else b)
+    if roll < 0.50:
+        x = r.randint(3, 80) * 100_000
+        y = x + r.randint(1, 20) * 100_000
+        m = r.randint(20, 400) * 1000
+        grouped = r.random() < 0.7
+        fmt = _lakh if grouped else (lambda v: f"{v:,}")
+        return r.choice(_SAL_INR_ABS).format(x=fmt(x), y=fmt(y), m=fmt(m), s=fmt(r.randint(5, 80) * 1000))
+    if roll < 0.75:
+        lo = r.randint(40, 250)
+        hi = lo + r.choice([10, 20, 30, 40, 60])
+        h = r.randint(15, 120)
+        return r.choice(_SAL_USD).format(lo=lo, hi=hi, h=h, h2=h + r.randint(5, 30), mo=r.randint(3, 20))
+    if roll < 0.90:
+        lo = r.randint(30, 150)
+        return r.choice(_SAL_OTHER).format(lo=lo, hi=lo + r.choice([10, 20, 30]))
+    if r.random() < 0.5:
+        # enrich_job parses "<location> <title>", which rarely carries a salary
+        return f"{_location(r)} {r.choice(_TITLES)}"
+    sentence = r.choice(_NEUTRAL_SENTENCES)
+    return f"{sentence} {r.choice(_SAL_INR_LPA).format(a=r.randint(5, 40), b=r.randint(41, 80))}"
+
+
+def _perks(r: random.Random) -> str:
+    parts = r.sample(_NEUTRAL_SENTENCES, r.randint(1, 6))
+    for s in r.sample(_PERK_SENTENCES, r.choice([0, 0, 1, 1, 2, 3])):
+        parts.insert(r.randint(0, len(parts)), s)
+    text = " ".join(parts)
+    return text.upper() if r.random() < 0.05 else text
+
+
+def _normalize_date(r: random.Random) -> str:
+    d = date(2019, 1, 1) + timedelta(days=r.randint(0, 7 * 365))
+    dt = datetime(d.year, d.month, d.day, r.randint(0, 23), r.randint(0, 59), r.randint(0, 59))
+    text = dt.strftime(r.choice(_DATE_FORMATS))
+    return f"  {text} " if r.random() < 0.05 else text
+
+
+def _serp_date(r: random.Random) -> str:
+    if r.random() < 0.6:
+        unit = r.choice(_REL_UNITS)
+        return r.choice(_REL_FORMS).format(n=r.randint(1, 30), u=unit, U=unit.upper())
+    return _normalize_date(r)
+
+
+_BUILDERS = {
+    "location": (_location, _FIXED_LOCATIONS),
+    "salary": (_salary, _SAL_FIXED),
+    "perks": (_perks, [""]),
+    "normalize_date": (_normalize_date, _DATE_FIXED),
+    "serp_date": (_serp_date, _DATE_FIXED),
+}
+
+
+def build(seed: int = 50) -> dict[str, list[str]]:
+    """{parser name: input strings}, deterministic for a seed."""
+    out = {}
+    for name, (gen, fixed) in _BUILDERS.items():
+        out[name] = _unique(gen, TARGETS[name], random.Random(f"{seed}-{name}"), fixed)
+    return out
+
+
+if __name__ == "__main__":
+    for name, inputs in build().items():
+        print(f"  {name:15s} {len(inputs):5d} inputs, e.g. {inputs[len(inputs) // 2]!r}")
@@ -0,0 +1,310 @@
+"""
+Parser benchmark — correctness oracles, ops/sec and allocations for the
+per-job parsers.
+
+  location        location_parser.parse_location
+  salary          salary_parser.parse_salary
+  perks           perks_detector.detect_perks
+  normalize_date  db._normalize_date
+  serp_date       serp_scraper.parse_result_date
+
+benchmarks/oracles/<parser>.jsonl holds one {"input", "expected"} line per
+string. The expected outputs record the behaviour at the time they were
+written, quirks included, so an optimisation has to reproduce every one
+of them. The clock is frozen at FROZEN_NOW for the check, which makes
+"today" fallbacks and "3 days ago" results deterministic. Dates are
+compared as ISO strings.
+
+For each parser the harness then reports:
+  ops/sec      best of --repeat timed passes over the whole corpus
+  blocks/call  memory blocks still allocated per call afterwards (the
+               result plus anything cached), from a tracemalloc snapshot
+  peak B/call  mean tracemalloc peak above the starting point during a
+               call, which includes temporaries freed before it returned
+
+Results use run.py's JSON layout with size "parsers", so compare.py
+checks them against baseline-parsers.json. The exit status is 1 if any
+output differs from its oracle.
+
+Usage:
+  python benchmarks/parsers.py                   # check + benchmark every parser
+  python benchmarks/parsers.py --check           # correctness only
+  python benchmarks/parsers.py --only salary,perks --save-baseline
+  python benchmarks/parsers.py --update          # re-record expectations after an intended change
+  python benchmarks/parsers.py --rebuild         # add new inputs from parser_corpus.py
+  python benchmarks/parsers.py --harvest [DIR]   # add real strings from HTTP fixtures
+"""
+import argparse
+import contextlib
+import gzip
+import json
+import platform
+import sqlite3
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Iterator
+
+HERE = Path(__file__).resolve().parent
+ORACLE_DIR = HERE / "oracles"
+RESULTS_DIR = HERE / "results"
+FROZEN_NOW = datetime(2026, 1, 15, 12, 0, 0)
+SHOW_MISMATCHES = 5
+
+sys.path.insert(0, str(HERE))
+sys.path.insert(0, str(HERE.parent / "scraper"))
+import db  # noqa: E402
+import serp_scraper  # noqa: E402
+from location_parser import parse_location  # noqa: E402
+from perks_detector import detect_perks  # noqa: E402
+from salary_parser import parse_salary  # noqa: E402
+from run import _git_commit  # noqa: E402
+
+PARSERS: dict[str, Callable[[str], Any]] = {
+    "location": parse_location,
+    "salary": parse_salary,
+    "perks": detect_perks,
+    "normalize_date": db._normalize_date,
+    "serp_date": serp_scraper.parse_result_date,
+}
+
+
+class _FrozenDatetime(datetime):
+    @classmethod
+    def now(cls, tz=None):
+        return FROZEN_NOW
+
+    @classmethod
+    def utcnow(cls):
+        return FROZEN_NOW
+
+
+@contextlib.contextmanager
+def frozen_clock() -> Iterator[None]:
+    """The parser modules see FROZEN_NOW as the current time."""
+    saved = db.datetime, serp_scraper.datetime
+    db.datetime = serp_scraper.datetime = _FrozenDatetime
+    try:
+        yield
+    finally:
+        db.datetime, serp_scraper.datetime = saved
+
+
+def _encode(value: Any) -> Any:
+    """Parser output as it is stored in an oracle file."""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return json.loads(json.dumps(value))
+
+
+def load(name: str) -> list[dict]:
+    path = ORACLE_DIR / f"{name}.jsonl"
+    if not path.exists():
+        return []
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def save(name: str, cases: list[dict]) -> None:
+    ORACLE_DIR.mkdir(parents=True, exist_ok=True)
+    with open(ORACLE_DIR / f"{name}.jsonl", "w", encoding="utf-8") as f:
+        for case in cases:
+            f.write(json.dumps(case, ensure_ascii=False) + "\n")
+
+
+def check(name: str, cases: list[dict]) -> list[dict]:
+    """Cases whose current output differs from the oracle, with the output as "got"."""
+    fn = PARSERS[name]
+    bad = []
+    with frozen_clock():
+        for case in cases:
+            got = _encode(fn(case["input"]))
+            if got != case["expected"]:
+                bad.append({**case, "got": got})
+    return bad
+
+
+def record(name: str, inputs: list[str], previous: dict[str, Any] | None = None) -> tuple[list[dict], int]:
+    """Cases with the current outputs as expectations, and how many differ from previous."""
+    fn = PARSERS[name]
+    previous = previous or {}
+    out, changed = [], 0
+    with frozen_clock():
+        for text in inputs:
+            expected = _encode(fn(text))
+            changed += text not in previous or previous[text] != expected
+            out.append({"input": text, "expected": expected})
+    return out, changed
+
+
+def bench(name: str, inputs: list[str], repeat: int, rounds: int) -> dict:
+    fn = PARSERS[name]
+    for text in inputs:   # warm regex and strptime caches
+        fn(text)
+
+    best = float("inf")
+    for _ in range(repeat):
+        t = time.perf_counter()
+        for _ in range(rounds):
+            for text in inputs:
+                fn(text)
+        best = min(best, time.perf_counter() - t)
+    calls = len(inputs) * rounds
+
+    tracemalloc.start()
+    try:
+        peak_total = 0
+        kept = []
+        before = tracemalloc.take_snapshot()
+        for text in inputs:
+            tracemalloc.reset_peak()
+            start = tracemalloc.get_traced_memory()[0]
+            kept.append(fn(text))
+            peak_total += tracemalloc.get_traced_memory()[1] - start
+        after = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+    # The list holding the results is the harness's, not the parser's
+    blocks = sum(s.count_diff for s in after.compare_to(before, "filename")
+                 if s.traceback[0].filename != __file__)
+
+    return {
+        "source": "parsers", "stage": name, "items": calls, "seconds": round(best, 4),
+        "ops_per_sec": round(calls / best, 1) if best else 0.0,
+        "blocks_per_call": round(blocks / len(inputs), 2) if inputs else 0.0,
+        "peak_bytes_per_call": round(peak_total / len(inputs)) if inputs else 0,
+    }
+
+
+def _walk(value: Any, key: str = "") -> Iterator[tuple[str, Any]]:
+    if isinstance(value, dict):
+        for k, v in value.items():
+            yield from _walk(v, k)
+    elif isinstance(value, list):
+        for v in value:
+            yield from _walk(v, key)
+    else:
+        yield key, value
+
+
+# Fixture JSON keys whose string values feed each parser
+_HARVEST_KEYS = {
+    "location": {"location", "job_location", "candidate_required_location", "display_name", "name"},
+    "salary": {"compensationTierSummary", "salary", "salary_range", "job_salary"},
+    "perks": {"description", "descriptionPlain", "job_description", "content", "snippet"},
+    "normalize_date": {"updated_at", "publishedAt", "created", "date", "job_posted_at_datetime_utc"},
+    "serp_date": {"date"},
+}
+
+
+def harvest(root: Path, limit: int) -> dict[str, list[str]]:
+    """Distinct real strings per parser from a recorded HTTP fixture store (http_fixtures.py)."""
+    found: dict[str, dict[str, None]] = {name: {} for name in PARSERS}
+    for path in sorted(root.glob("*/*.json.gz")):
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            body = json.load(f).get("body")
+        try:
+            payload = json.loads(body or "")
+        except ValueError:
+            continue
+        serp = path.parent.name.endswith("serpapi.com")
+        for key, value in _walk(payload):
+            if not isinstance(value, str) or len(value) > 4000:
+                continue
+            for name, keys in _HARVEST_KEYS.items():
+                if key in keys and (name != "serp_date" or serp) and len(found[name]) < limit:
+                    found[name][value] = None
+    return {name: list(values) for name, values in found.items()}
+
+
+def _show(name: str, bad: list[dict]) -> None:
+    for case in bad[:SHOW_MISMATCHES]:
+        print(f"    {case['input'][:60]!r}\n      expected {case['expected']}\n      got      {case['got']}")
+    if len(bad) > SHOW_MISMATCHES:
+        print(f"    ... and {len(bad) - SHOW_MISMATCHES} more")
+
+
+def _grow(names: list[str], new: dict[str, list[str]], label: str) -> None:
+    for name in names:
+        cases = load(name)
+        have = {c["input"] for c in cases}
+        extra = [s for s in new.get(name, []) if s not in have]
+        added, _ = record(name, extra)
+        save(name, cases + added)
+        print(f"  {name:15s} +{len(added)} inputs from {label} ({len(cases) + len(added)} total)")
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="Parser correctness oracles and microbenchmarks")
+    ap.add_argument("--only", default=",".join(PARSERS), help="comma-separated subset of " + ",".join(PARSERS))
+    ap.add_argument("--check", action="store_true", help="correctness only, no timing")
+    ap.add_argument("--update", action="store_true", help="re-record every expectation from the current code")
+    ap.add_argument("--rebuild", action="store_true", help="add parser_corpus.py inputs missing from the oracles")
+    ap.add_argument("--harvest", nargs="?", const="", metavar="DIR",
+                    help="add strings from an HTTP fixture store (default HTTP_FIXTURES_DIR)")
+    ap.add_argument("--limit", type=int, default=500, help="max harvested strings per parser")
+    ap.add_argument("--repeat", type=int, default=5, help="timed passes; the best is kept")
+    ap.add_argument("--rounds", type=int, default=10, help="corpus iterations per timed pass")
+    ap.add_argument("--out", type=Path, help="results file (default benchmarks/results/parsers-<time>.json)")
+    ap.add_argument("--save-baseline", action="store_true", help="also write benchmarks/baseline-parsers.json")
+    args = ap.parse_args()
+    names = [n for n in args.only.split(",") if n]
+    unknown = set(names) - set(PARSERS)
+    if unknown:
+        ap.error(f"unknown parsers: {', '.join(sorted(unknown))}")
+
+    if args.rebuild:
+        from parser_corpus import build
+        _grow(names, build(), "parser_corpus.py")
+        sys.exit(0)
+    if args.harvest is not None:
+        from config import HTTP_FIXTURES_DIR
+        root = Path(args.harvest) if args.harvest else HTTP_FIXTURES_DIR
+        _grow(names, harvest(root, args.limit), str(root))
+        sys.exit(0)
+    if args.update:
+        for name in names:
+            old = load(name)
+            cases, changed = record(name, [c["input"] for c in old], {c["input"]: c["expected"] for c in old})
+            save(name, cases)
+            print(f"  {name:15s} {changed} of {len(cases)} expectations changed")
+        sys.exit(0)
+
+    failed = 0
+    rows = []
+    print(f"[PARSERS] {'parser':15s} {'cases':>6s} {'wrong':>6s}" +
+          ("" if args.check else f" {'ops/sec':>12s} {'blocks/call':>12s} {'peak B/call':>12s}"))
+    for name in names:
+        cases = load(name)
+        bad = check(name, cases)
+        failed += len(bad)
+        line = f"[PARSERS] {name:15s} {len(cases):6d} {len(bad):6d}"
+        if not args.check and cases:
+            row = bench(name, [c["input"] for c in cases], args.repeat, args.rounds)
+            rows.append({**row, "mismatches": len(bad)})
+            line += f" {row['ops_per_sec']:12,.0f} {row['blocks_per_call']:12.2f} {row['peak_bytes_per_call']:12,d}"
+        print(line, flush=True)
+        _show(name, bad)
+
+    if rows:
+        report = {
+            "meta": {
+                "size": "parsers", "repeat": args.repeat, "rounds": args.rounds, "commit": _git_commit(),
+                "python": platform.python_version(), "sqlite": sqlite3.sqlite_version,
+                "platform": platform.platform(), "date": datetime.utcnow().isoformat(timespec="seconds") + "Z",
+            },
+            "results": rows,
+        }
+        out = args.out or RESULTS_DIR / f"parsers-{datetime.now().strftime('%Y%m%d-%H%M%S')}.json"
+        out.parent.mkdir(parents=True, exist_ok=True)
+        out.write_text(json.dumps(report, indent=2))
+        print(f"[PARSERS] Results: {out}")
+        if args.save_baseline:
+            base = HERE / "baseline-parsers.json"
+            base.write_text(json.dumps(report, indent=2))
+            print(f"[PARSERS] Baseline: {base}")
+    if failed:
+        print(f"[PARSERS] {failed} output(s) differ from the oracles")
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,198 @@
+"""
+Pipeline benchmark — per-stage throughput on a synthetic corpus.
+
+For every source, generated payloads (generate.py) go through the same
+stages as a real run, each timed on its own:
+
+  extract  source.extract(raw, unit) on every raw result (includes the
+           source's own scoring and enrichment)
+  score    scraper.calc_match_score on every extracted job
+  enrich   scraper.enrich_job (location, salary, perks parsing) on a copy
+  dedup    the pipeline's in-run dedup (job id + seen set)
+  insert   pipeline.Writer into a fresh SQLite database with the full schema
+
+Each repeat runs in a child process with its own temporary database and
+cold caches; the best repeat per (source, stage) is kept. Results are
+written as JSON (see compare.py for regression checks).
+
+Usage:
+  python benchmarks/run.py --size 10k
+  python benchmarks/run.py --size 100k --sources greenhouse,ashby --repeat 3
+  python benchmarks/run.py --size 10k --save-baseline
+"""
+import argparse
+import json
+import os
+import platform
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+HERE = Path(__file__).resolve().parent
+SCRAPER_DIR = HERE.parent / "scraper"
+RESULTS_DIR = HERE / "results"
+STAGES = ("extract", "score", "enrich", "dedup", "insert")
+
+sys.path.insert(0, str(HERE))
+from generate import SIZES, SOURCES, payloads  # noqa: E402
+
+
+def _sources() -> dict:
+    """Source objects by name, imported from the scraper package."""
+    from scraper import GREENHOUSE_SOURCE, LEVER_SOURCE
+    from ashby_scraper import SOURCE as ashby
+    from remoteok_scraper import SOURCE as remoteok
+    from jsearch_scraper import SOURCE as jsearch
+    from serp_scraper import SOURCE as serp
+    from adzuna_scraper import SOURCE as adzuna
+    return {s.name: s for s in (GREENHOUSE_SOURCE, LEVER_SOURCE, ashby, remoteok, jsearch, serp, adzuna)}
+
+
+def bench_source(name: str, n: int, seed: int) -> list[dict]:
+    """Run one source's corpus through every stage. Must run with the scraper modules importable."""
+    from pipeline import PipelineStats, Writer, _dedup
+    from scraper import calc_match_score, enrich_job
+
+    source = _sources()[name]
+    stats = PipelineStats()
+    writer = Writer(stats)
+    seen: set[str] = set()
+    items = dict.fromkeys(STAGES, 0)
+    seconds = dict.fromkeys(STAGES, 0.0)
+
+    for unit, results in payloads(name, n, seed):
+        t = time.perf_counter()
+        jobs = [job for raw in results if (job := source.extract(raw, unit)) is not None]
+        seconds["extract"] += time.perf_counter() - t
+        items["extract"] += len(results)
+
+        t = time.perf_counter()
+        for job in jobs:
+            calc_match_score(job["title"], job.get("location", ""), job["company"])
+        seconds["score"] += time.perf_counter() - t
+        items["score"] += len(jobs)
+
+        copies = [dict(job) for job in jobs]
+        t = time.perf_counter()
+        for job in copies:
+            enrich_job(job)
+        seconds["enrich"] += time.perf_counter() - t
+        items["enrich"] += len(jobs)
+
+        t = time.perf_counter()
+        unique = list(_dedup(iter(jobs), seen, stats))
+        seconds["dedup"] += time.perf_counter() - t
+        items["dedup"] += len(jobs)
+
+        t = time.perf_counter()
+        for job in unique:
+            writer.add(job)
+        seconds["insert"] += time.perf_counter() - t
+        items["insert"] += len(unique)
+
+    t = time.perf_counter()
+    writer.flush()
+    seconds["insert"] += time.perf_counter() - t
+    writer.close()
+
+    return [
+        {"source": name, "stage": stage, "items": items[stage], "seconds": round(seconds[stage], 4),
+         "ops_per_sec": round(items[stage] / seconds[stage], 1) if seconds[stage] else 0.0}
+        for stage in STAGES
+    ]
+
+
+def _child(args: argparse.Namespace) -> None:
+    """One repeat: fresh database, cold caches, results as JSON on stdout."""
+    os.chdir(SCRAPER_DIR)
+    sys.path.insert(0, str(SCRAPER_DIR))
+    import contextlib
+    import io
+    from db import init_db
+
+    rows = []
+    with contextlib.redirect_stdout(io.StringIO()):   # migration / pipeline chatter
+        init_db()
+        for name in args.sources:
+            rows.extend(bench_source(name, SIZES[args.size], args.seed))
+    json.dump(rows, sys.stdout)
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=HERE, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+def run(args: argparse.Namespace) -> dict:
+    best: dict[tuple[str, str], dict] = {}
+    for i in range(args.repeat):
+        with tempfile.TemporaryDirectory(prefix="jobhorizon-bench-") as tmp:
+            env = {**os.environ, "RAILWAY_VOLUME_MOUNT_PATH": tmp, "HTTP_FIXTURES": ""}
+            cmd = [sys.executable, str(Path(__file__).resolve()), "--child", "--size", args.size,
+                   "--seed", str(args.seed), "--sources", ",".join(args.sources)]
+            out = subprocess.run(cmd, env=env, capture_output=True, text=True)
+            if out.returncode != 0:
+                sys.stderr.write(out.stderr)
+                raise SystemExit(f"benchmark repeat {i + 1} failed")
+            for row in json.loads(out.stdout):
+                key = (row["source"], row["stage"])
+                if key not in best or row["ops_per_sec"] > best[key]["ops_per_sec"]:
+                    best[key] = row
+        print(f"  repeat {i + 1}/{args.repeat} done", flush=True)
+    return {
+        "meta": {
+            "size": args.size, "postings_per_source": SIZES[args.size], "seed": args.seed,
+            "repeat": args.repeat, "commit": _git_commit(), "python": platform.python_version(),
+            "sqlite": sqlite3.sqlite_version, "platform": platform.platform(),
+            "date": datetime.utcnow().isoformat(timespec="seconds") + "Z",
+        },
+        "results": [best[k] for k in sorted(best, key=lambda k: (args.sources.index(k[0]), STAGES.index(k[1])))],
+    }
+
+
+def print_results(report: dict) -> None:
+    print(f"\n[BENCH] {report['meta']['size']} postings per source, best of {report['meta']['repeat']}")
+    print(f"  {'source':11s} " + " ".join(f"{s:>12s}" for s in STAGES) + "   (ops/sec)")
+    by_source: dict[str, dict] = {}
+    for row in report["results"]:
+        by_source.setdefault(row["source"], {})[row["stage"]] = row["ops_per_sec"]
+    for src, stages in by_source.items():
+        print(f"  {src:11s} " + " ".join(f"{stages.get(s, 0):12,.0f}" for s in STAGES))
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="Per-stage pipeline throughput on a synthetic corpus")
+    ap.add_argument("--size", choices=SIZES, default="10k")
+    ap.add_argument("--sources", default=",".join(SOURCES), help="comma-separated subset of " + ",".join(SOURCES))
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--repeat", type=int, default=1, help="runs per source; the best is kept")
+    ap.add_argument("--out", type=Path, help="results file (default benchmarks/results/<size>-<time>.json)")
+    ap.add_argument("--save-baseline", action="store_true", help="also write benchmarks/baseline-<size>.json")
+    ap.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = ap.parse_args()
+    args.sources = [s for s in args.sources.split(",") if s]
+    unknown = set(args.sources) - set(SOURCES)
+    if unknown:
+        ap.error(f"unknown sources: {', '.join(sorted(unknown))}")
+
+    if args.child:
+        _child(args)
+        sys.exit(0)
+
+    report = run(args)
+    print_results(report)
+    out = args.out or RESULTS_DIR / f"{args.size}-{datetime.now().strftime('%Y%m%d-%H%M%S')}.json"
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps(report, indent=2))
+    print(f"\n[BENCH] Results: {out}")
+    if args.save_baseline:
+        base = HERE / f"baseline-{args.size}.json"
+        base.write_text(json.dumps(report, indent=2))
+        print(f"[BENCH] Baseline: {base}")
@@ -2,10 +2,7 @@
 Adzuna API Integration — searches jobs across India, US, UK.
 API docs: https://developer.adzuna.com/overview
 """
-import time
-import random
 import httpx
-from datetime import datetime
 from typing import Optional
 
 from config import (
@@ -14,11 +11,10 @@ from config import (
     INCLUDE_KEYWORDS,
     EXCLUDE_KEYWORDS,
     SCORING,
-    USER_AGENT,
     FAANG_COMPANIES,
     ADZUNA_QUERIES,
 )
-from db import init_db, insert_jobs_batch
+from pipeline import Source, PipelineStats, run_pipeline
 from salary_parser import parse_salary
 from location_parser import parse_location
 from perks_detector import detect_perks
@@ -51,18 +47,14 @@ def search_adzuna(
     if where:
         params["where"] = where
 
-    try:
-        resp = client.get(url, params=params, timeout=15)
-        if resp.status_code != 200:
-            print(f"  [ADZ] HTTP {resp.status_code} for: {what} in {country}", flush=True)
-            return []
+    # Raised errors are counted by the pipeline; messages leave out the URL (it carries the key)
+    resp = client.get(url, params=params, timeout=15)
+    if resp.status_code != 200:
+        raise httpx.HTTPStatusError(f"HTTP {resp.status_code} for: {what} in {country}",
+                                    request=resp.request, response=resp)
 
-        data = resp.json()
-        return data.get("results", [])
-
-    except Exception as e:
-        print(f"  [ADZ] Error: {e}", flush=True)
-        return []
+    data = resp.json()
+    return data.get("results", [])
 
 
 def extract_job_from_adzuna(result: dict) -> Optional[dict]:
@@ -215,60 +207,26 @@ def calc_adzuna_score(title: str, location: str, company: str) -> int:
     return min(score, 100)
 
 
-def run_adzuna_scraper() -> None:
-    """Run Adzuna API job search."""
-    print(f"\n{'='*60}", flush=True)
-    print(f"[ADZ] Adzuna Job Search - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}", flush=True)
-    print(f"{'='*60}\n", flush=True)
-
-    if not ADZUNA_APP_ID or not ADZUNA_APP_KEY:
-        print("  [!] Adzuna credentials not set. Skipping.", flush=True)
-        return
-
-    init_db()
-    all_jobs: list[dict] = []
-
-    client = httpx.Client(
-        headers={"User-Agent": USER_AGENT},
-        follow_redirects=True,
-    )
-
-    queries = ADZUNA_QUERIES
-    print(f"  Running {len(queries)} Adzuna queries...\n", flush=True)
-
-    for i, q in enumerate(queries, 1):
-        what = q["what"]
-        where = q.get("where", "")
-        country = q.get("country", "in")
+def _adzuna_label(q: dict) -> str:
+    return f"{q['what']} in {q.get('where', '') or q.get('country', 'in').upper()}"
 
-        label = f"{what} in {where or country.upper()}"
-        print(f"  [{i}/{len(queries)}] {label}...", end=" ", flush=True)
 
-        results = search_adzuna(client, what=what, where=where, country=country)
-        jobs_found = 0
-
-        for r in results:
-            job = extract_job_from_adzuna(r)
-            if job:
-                all_jobs.append(job)
-                jobs_found += 1
-
-        print(f"-> {len(results)} results, {jobs_found} jobs", flush=True)
-
-        # Polite delay
-        time.sleep(random.uniform(0.5, 1.0))
-
-    client.close()
+SOURCE = Source(
+    name="adzuna",
+    tag="ADZ",
+    title="Adzuna Job Search",
+    units=lambda: ADZUNA_QUERIES,
+    fetch=lambda client, q: search_adzuna(client, what=q["what"], where=q.get("where", ""), country=q.get("country", "in")),
+    extract=lambda result, q: extract_job_from_adzuna(result),
+    label=_adzuna_label,
+    delay=(0.5, 1.0),
+    skip_reason=None if ADZUNA_APP_ID and ADZUNA_APP_KEY else "Adzuna credentials not set",
+)
 
-    # Insert
-    new_count = insert_jobs_batch(all_jobs)
 
-    print(f"\n{'='*60}", flush=True)
-    print(f"[OK] Adzuna Done!", flush=True)
-    print(f"   Total extracted: {len(all_jobs)}", flush=True)
-    print(f"   New jobs added: {new_count}", flush=True)
-    print(f"   Duplicates skipped: {len(all_jobs) - new_count}", flush=True)
-    print(f"{'='*60}\n", flush=True)
+def run_adzuna_scraper() -> PipelineStats:
+    """Run Adzuna API job search."""
+    return run_pipeline([SOURCE])
 
 
 if __name__ == "__main__":
@@ -3,22 +3,19 @@ Ashby Job Board API Integration — scrapes public Ashby job boards.
 API: https://api.ashbyhq.com/posting-api/job-board/{company}
 Free, no auth required. Returns JSON with all published job postings.
 """
-import time
-import random
 import re
 import httpx
-from datetime import datetime
 from typing import Optional
 
 from config import (
     INCLUDE_KEYWORDS,
     EXCLUDE_KEYWORDS,
     SCORING,
-    USER_AGENT,
     FAANG_COMPANIES,
     ASHBY_COMPANIES,
 )
-from db import init_db, insert_jobs_batch
+from pipeline import Source, PipelineStats, run_pipeline
+from fingerprints import content_version
 from salary_parser import parse_salary
 from location_parser import parse_location
 from perks_detector import detect_perks
@@ -27,22 +24,18 @@ ASHBY_API_BASE = "https://api.ashbyhq.com/posting-api/job-board"
 
 
 def fetch_ashby_board(client: httpx.Client, company: str) -> list[dict]:
-    """Fetch all jobs from an Ashby company job board."""
+    """Fetch all jobs from an Ashby company job board. Raises on a transport error or non-200."""
     url = f"{ASHBY_API_BASE}/{company}?includeCompensation=true"
-    try:
-        resp = client.get(url, timeout=15)
-        if resp.status_code != 200:
-            return []
+    resp = client.get(url, timeout=15)
+    if resp.status_code != 200:
+        raise httpx.HTTPStatusError(f"HTTP {resp.status_code}", request=resp.request, response=resp)
 
-        data = resp.json()
-        # Ashby returns { jobs: [...] }
-        jobs = data.get("jobs", [])
-        if isinstance(jobs, list):
-            return jobs
-        return []
-    except Exception as e:
-        print(f"  [ASH] {company}: Error - {e}", flush=True)
-        return []
+    data = resp.json()
+    # Ashby returns { jobs: [...] }
+    jobs = data.get("jobs", [])
+    if isinstance(jobs, list):
+        return jobs
+    return []
 
 
 def extract_job_from_ashby(result: dict, board_company: str) -> Optional[dict]:
@@ -272,50 +265,29 @@ def calc_ashby_score(title: str, location: str, company: str, is_remote: bool =
     return min(score, 100)
 
 
-def run_ashby_scraper() -> None:
-    """Run Ashby job board scraper across configured companies."""
-    print(f"\n{'='*60}", flush=True)
-    print(f"[ASH] Ashby Job Board Scraper - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}", flush=True)
-    print(f"{'='*60}\n", flush=True)
-
-    init_db()
-    all_jobs: list[dict] = []
-
-    client = httpx.Client(
-        headers={"User-Agent": USER_AGENT},
-        follow_redirects=True,
+def ashby_posting_key(result: dict) -> tuple[str, str]:
+    """(id, version) for board diffs; compensation can change without updatedAt."""
+    return str(result.get("id", "")), content_version(
+        result, "updatedAt", "publishedAt", "title", "location", "isRemote", "jobUrl",
+        "externalLink", "organizationName", "compensation", "compensationTierSummary",
     )
 
-    companies = ASHBY_COMPANIES
-    print(f"  Scraping {len(companies)} Ashby boards...\n", flush=True)
-
-    for i, company in enumerate(companies, 1):
-        print(f"  [{i}/{len(companies)}] {company}...", end=" ", flush=True)
-        results = fetch_ashby_board(client, company)
-        jobs_found = 0
 
-        for r in results:
-            job = extract_job_from_ashby(r, company)
-            if job:
-                all_jobs.append(job)
-                jobs_found += 1
-
-        print(f"-> {len(results)} postings, {jobs_found} matches", flush=True)
-
-        # Polite delay between requests
-        time.sleep(random.uniform(0.3, 0.8))
-
-    client.close()
+SOURCE = Source(
+    name="ashby",
+    tag="ASH",
+    title="Ashby Job Board Scraper",
+    units=lambda: ASHBY_COMPANIES,
+    fetch=fetch_ashby_board,
+    extract=extract_job_from_ashby,
+    delay=(0.3, 0.8),
+    posting_key=ashby_posting_key,
+)
 
-    # Insert
-    new_count = insert_jobs_batch(all_jobs)
 
-    print(f"\n{'='*60}", flush=True)
-    print(f"[OK] Ashby Done!", flush=True)
-    print(f"   Total extracted: {len(all_jobs)}", flush=True)
-    print(f"   New jobs added: {new_count}", flush=True)
-    print(f"   Duplicates skipped: {len(all_jobs) - new_count}", flush=True)
-    print(f"{'='*60}\n", flush=True)
+def run_ashby_scraper() -> PipelineStats:
+    """Run Ashby job board scraper across configured companies."""
+    return run_pipeline([SOURCE])
 
 
 if __name__ == "__main__":
@@ -0,0 +1,59 @@
+"""In-process LRU cache whose entries are tied to the database write generation."""
+import time
+from collections import OrderedDict
+from typing import Any
+
+_MISSING = object()
+
+
+class GenerationCache:
+    """
+    LRU map of key -> value, valid only while the write generation is unchanged.
+    An optional ttl (seconds) also expires entries for data that can go stale
+    without a write, e.g. filters relative to the current time.
+    """
+
+    def __init__(self, maxsize: int = 256, ttl: float | None = None) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: OrderedDict[Any, tuple[int, float, Any]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Any, generation: int, default: Any = None) -> Any:
+        entry = self._data.get(key, _MISSING)
+        if entry is _MISSING:
+            self.misses += 1
+            return default
+        if entry[0] != generation or (self.ttl is not None and time.monotonic() - entry[1] > self.ttl):
+            del self._data[key]
+            self.misses += 1
+            return default
+        self._data.move_to_end(key)
+        self.hits += 1
+        return entry[2]
+
+    def put(self, key: Any, generation: int, value: Any) -> None:
+        self._data[key] = (generation, time.monotonic(), value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+        }
+
+    def __len__(self) -> int:
+        return len(self._data)
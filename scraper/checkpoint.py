@@ -0,0 +1,79 @@
+"""
+Scrape Checkpoints — lets an interrupted scrape continue where it stopped.
+
+Every pipeline run gets a scrape_runs row. As each unit (a board slug or a
+query) finishes, the writer records it in scrape_checkpoints in the same
+transaction that commits the unit's last jobs, so a checkpoint never
+claims jobs that were lost. A run that is killed keeps status 'running';
+run_pipeline(resume=True) picks up the latest such run from the last day
+and skips the units already recorded for it.
+
+Usage:
+  python daily_run.py --resume   # continue the last interrupted run
+"""
+import json
+import sqlite3
+from datetime import datetime, timedelta
+from typing import Any
+
+KEEP_RUNS = 20            # runs whose checkpoints are kept for inspection
+RESUME_WINDOW_HOURS = 24  # older interrupted runs are not resumed (their jobs are stale)
+
+
+def unit_key(unit: Any) -> str:
+    """Stable text key for a unit: the slug itself, or a query dict as sorted JSON."""
+    if isinstance(unit, str):
+        return unit
+    return json.dumps(unit, sort_keys=True, separators=(",", ":"))
+
+
+def start_run(conn: sqlite3.Connection) -> int:
+    cur = conn.execute(
+        "INSERT INTO scrape_runs (started_at) VALUES (?)", (datetime.utcnow().isoformat(),)
+    )
+    conn.commit()
+    return int(cur.lastrowid)
+
+
+def interrupted_run(conn: sqlite3.Connection) -> int | None:
+    """Latest run that never finished and started within RESUME_WINDOW_HOURS."""
+    since = (datetime.utcnow() - timedelta(hours=RESUME_WINDOW_HOURS)).isoformat()
+    row = conn.execute(
+        "SELECT id FROM scrape_runs WHERE status = 'running' AND started_at >= ? ORDER BY id DESC LIMIT 1",
+        (since,),
+    ).fetchone()
+    return int(row[0]) if row else None
+
+
+def resume_run(conn: sqlite3.Connection, run_id: int) -> None:
+    conn.execute("UPDATE scrape_runs SET resumes = resumes + 1 WHERE id = ?", (run_id,))
+    conn.commit()
+
+
+def done_units(conn: sqlite3.Connection, run_id: int) -> dict[str, set[str]]:
+    """{source: {unit key}} already finished in a run."""
+    done: dict[str, set[str]] = {}
+    for source, unit in conn.execute("SELECT source, unit FROM scrape_checkpoints WHERE run_id = ?", (run_id,)):
+        done.setdefault(str(source), set()).add(str(unit))
+    return done
+
+
+def record_units(conn: sqlite3.Connection, run_id: int, units: list[tuple[str, str, int, int, float]]) -> None:
+    """Record finished (source, unit key, results, jobs, seconds). Caller commits with the jobs."""
+    now = datetime.utcnow().isoformat()
+    conn.executemany(
+        """INSERT OR REPLACE INTO scrape_checkpoints (run_id, source, unit, results, jobs, seconds, done_at)
+           VALUES (?, ?, ?, ?, ?, ?, ?)""",
+        [(run_id, source, unit, results, jobs, seconds, now) for source, unit, results, jobs, seconds in units],
+    )
+
+
+def finish_run(conn: sqlite3.Connection, run_id: int) -> None:
+    """Mark a run done and drop per-run rows (checkpoints, board diffs, leases) of all but the last KEEP_RUNS runs."""
+    conn.execute(
+        "UPDATE scrape_runs SET status = 'done', finished_at = ? WHERE id = ?",
+        (datetime.utcnow().isoformat(), run_id),
+    )
+    for table in ("scrape_checkpoints", "board_diffs", "scrape_leases"):
+        conn.execute(f"DELETE FROM {table} WHERE run_id <= (SELECT MAX(id) FROM scrape_runs) - ?", (KEEP_RUNS,))
+    conn.commit()
@@ -0,0 +1,178 @@
+"""
+Companies — canonical company dimension with alias resolution.
+
+Scrapers name the same employer differently: "Cockroachlabs" (a Greenhouse
+slug title-cased), "Cockroach Labs" (Ashby organizationName), "Cockroach
+Labs, Inc." (JSearch employer_name). resolve_company() maps each of these
+to one companies row:
+
+  1. an alias seen before (the name squashed to [a-z0-9]) -> its id
+  2. the canonical key — dedup.company_key() squashed ("cockroachlabs")
+  3. the key without trailing brand words ("razorpay software" -> "razorpay"),
+     only when that is already a known company
+  4. otherwise a new company
+
+Board slugs from companies.json and ASHBY_COMPANIES are registered first,
+so they anchor steps 2 and 3. Every resolved name is stored as an alias;
+the company filter matches aliases and joins on the indexed jobs.company_id.
+"""
+import json
+import re
+import sqlite3
+
+from config import COMPANIES_FILE, ASHBY_COMPANIES
+from dedup import company_key
+
+# Trailing words that name a product line or entity rather than the employer
+_BRAND_SUFFIXES = {
+    "technologies", "technology", "tech", "labs", "software", "solutions", "systems",
+    "india", "hq", "global", "group", "services", "digital",
+}
+
+_NON_ALNUM_RE = re.compile(r"[^a-z0-9]")
+
+# Resolver caches (same rule as db._source_ids). Ids read outside a
+# transaction are cached at once; ids read inside one wait in the pending
+# maps until the caller reports a commit (keep_pending) or a rollback
+# (drop_pending), since it may roll back rows it just added.
+_alias_ids: dict[str, int] = {}
+_key_ids: dict[str, int] = {}
+_pending_aliases: dict[str, int] = {}
+_pending_keys: dict[str, int] = {}
+_loaded = False
+
+
+def squash(name: str) -> str:
+    """Lowercase with everything but a-z0-9 removed: "Cockroach Labs, Inc." -> "cockroachlabsinc"."""
+    return _NON_ALNUM_RE.sub("", (name or "").lower())
+
+
+def canonical_key(name: str) -> str:
+    return squash(company_key(name))
+
+
+def board_slugs() -> list[str]:
+    with open(COMPANIES_FILE, "r") as f:
+        boards = json.load(f)
+    return [*boards.get("greenhouse", []), *boards.get("lever", []), *ASHBY_COMPANIES]
+
+
+def _lookup(conn: sqlite3.Connection, cache: dict[str, int], pending: dict[str, int],
+            sql: str, value: str) -> int | None:
+    cid = cache.get(value)
+    if cid is None:
+        row = conn.execute(sql, (value,)).fetchone()
+        if row is None:
+            return None
+        cid = int(row[0])
+        (pending if conn.in_transaction else cache)[value] = cid
+    return cid
+
+
+def _key_id(conn: sqlite3.Connection, key: str) -> int | None:
+    return _lookup(conn, _key_ids, _pending_keys, "SELECT id FROM companies WHERE key = ?", key)
+
+
+def _alias_id(conn: sqlite3.Connection, alias: str) -> int | None:
+    return _lookup(conn, _alias_ids, _pending_aliases,
+                   "SELECT company_id FROM company_aliases WHERE alias = ?", alias)
+
+
+def keep_pending() -> None:
+    """The transaction the resolver ran in was committed: cache the ids it read."""
+    _key_ids.update(_pending_keys)
+    _alias_ids.update(_pending_aliases)
+    drop_pending()
+
+
+def drop_pending() -> None:
+    """The transaction the resolver ran in was rolled back: forget the ids it read."""
+    _pending_keys.clear()
+    _pending_aliases.clear()
+
+
+def _create(conn: sqlite3.Connection, key: str, name: str, slug: str | None = None) -> int:
+    conn.execute("INSERT OR IGNORE INTO companies (key, name, slug) VALUES (?, ?, ?)", (key, name, slug))
+    return _key_id(conn, key)
+
+
+def _add_alias(conn: sqlite3.Connection, alias: str, cid: int) -> int:
+    """Store alias -> cid unless the alias exists; returns the company the alias points at."""
+    conn.execute("INSERT OR IGNORE INTO company_aliases (alias, company_id) VALUES (?, ?)", (alias, cid))
+    return _alias_id(conn, alias)
+
+
+def warm_resolver(conn: sqlite3.Connection) -> None:
+    """Load the resolver once per process; call with no transaction open (pipeline.Writer does)."""
+    if not _loaded and not conn.in_transaction:
+        _load(conn)
+
+
+def _load(conn: sqlite3.Connection) -> None:
+    """Register board slugs and commit them, then read every key and alias into the caches.
+
+    Only called with no transaction open, so the commit covers nothing of the caller's.
+    """
+    global _loaded
+    for slug in board_slugs():
+        name = slug.replace("-", " ").title()
+        key = canonical_key(name)
+        if not key:
+            continue
+        cid = _key_id(conn, key) or _create(conn, key, name, slug)
+        for alias in {key, squash(slug)}:
+            _add_alias(conn, alias, cid)
+    conn.commit()
+    keep_pending()
+    _key_ids.update((str(k), int(i)) for k, i in conn.execute("SELECT key, id FROM companies"))
+    _alias_ids.update((str(a), int(i)) for a, i in conn.execute("SELECT alias, company_id FROM company_aliases"))
+    _loaded = True
+
+
+def resolve_company(conn: sqlite3.Connection, name: str) -> int | None:
+    """companies.id for a scraped company name (creating it if new); None for a blank name."""
+    alias = squash(name)
+    if not alias:
+        return None
+    cid = _alias_ids.get(alias)
+    if cid is not None:
+        return cid
+    warm_resolver(conn)
+    cid = _alias_id(conn, alias)
+    if cid is not None:
+        return cid
+    words = company_key(name).split()
+    key = "".join(words)
+    cid = _key_id(conn, key) if key else None
+    while cid is None and len(words) > 1 and words[-1] in _BRAND_SUFFIXES:
+        words = words[:-1]
+        cid = _key_id(conn, "".join(words))
+    if cid is None:
+        cid = _create(conn, key or alias, name.strip())
+    return _add_alias(conn, alias, cid)
+
+
+def assign_companies(conn: sqlite3.Connection) -> int:
+    """Resolve company_id for jobs that have none yet. Returns rows updated; caller commits."""
+    rows = conn.execute("SELECT rowid, company FROM jobs WHERE company_id IS NULL").fetchall()
+    updates = [(cid, rowid) for rowid, company in rows if (cid := resolve_company(conn, company)) is not None]
+    conn.executemany("UPDATE jobs SET company_id = ? WHERE rowid = ?", updates)
+    return len(updates)
+
+
+if __name__ == "__main__":
+    # Resolve a few name variants against an in-memory schema
+    from schema import migrate
+
+    conn = sqlite3.connect(":memory:")
+    migrate(conn)
+    groups = [
+        ["Cockroachlabs", "Cockroach Labs", "Cockroach Labs, Inc."],
+        ["Razorpay", "Razorpay Software", "razorpay"],
+        ["Stripe", "Stripe, Inc.", "The Stripe"],
+    ]
+    for names in groups:
+        ids = [resolve_company(conn, n) for n in names]
+        print(f"  {len(set(ids)) == 1!s:5s} {names} -> {ids}")
+    print(f"  {resolve_company(conn, 'Stripe Payments') != resolve_company(conn, 'Stripe')!s:5s} "
+          "'Stripe Payments' stays separate (not a brand suffix)")
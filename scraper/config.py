@@ -8,15 +8,22 @@ DATA_DIR = Path(os.environ["RAILWAY_VOLUME_MOUNT_PATH"]) if os.environ.get("RAIL
 DB_PATH = DATA_DIR / "jobs.db"
 COMPANIES_FILE = Path(__file__).resolve().parent / "companies.json"
 
+# ─── Recorded HTTP fixtures (see http_fixtures.py) ────────────
+HTTP_FIXTURES = os.environ.get("HTTP_FIXTURES", "")            # "record", "replay" or "" (live)
+HTTP_FIXTURES_DIR = Path(os.environ.get("HTTP_FIXTURES_DIR", str(DATA_DIR / "fixtures")))
+HTTP_REPLAY_LATENCY = float(os.environ.get("HTTP_REPLAY_LATENCY", "0"))  # x recorded latency
+# Credentials are stripped from fixtures, so a replay runs with placeholder keys
+_KEY_DEFAULT = "replay" if HTTP_FIXTURES == "replay" else ""
+
 # ─── SerpAPI ──────────────────────────────────────────────────
-SERPAPI_KEY = os.environ.get("SERPAPI_KEY", "")
+SERPAPI_KEY = os.environ.get("SERPAPI_KEY", _KEY_DEFAULT)
 
 # ─── Adzuna API ───────────────────────────────────────────────
-ADZUNA_APP_ID = os.environ.get("ADZUNA_APP_ID", "")
-ADZUNA_APP_KEY = os.environ.get("ADZUNA_APP_KEY", "")
+ADZUNA_APP_ID = os.environ.get("ADZUNA_APP_ID", _KEY_DEFAULT)
+ADZUNA_APP_KEY = os.environ.get("ADZUNA_APP_KEY", _KEY_DEFAULT)
 
 # ─── JSearch API (RapidAPI) ────────────────────────────────
-JSEARCH_API_KEY = os.environ.get("JSEARCH_API_KEY", "")
+JSEARCH_API_KEY = os.environ.get("JSEARCH_API_KEY", _KEY_DEFAULT)
 
 # ─── Request settings ─────────────────────────────────────────
 REQUEST_DELAY_MIN = 0.5
@@ -24,6 +31,25 @@ REQUEST_DELAY_MAX = 1.5
 REQUEST_TIMEOUT = 15
 USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
 
+# ─── Scrape pipeline ──────────────────────────────────────────
+PIPELINE_BATCH_SIZE = 200       # jobs per write transaction
+PIPELINE_FLUSH_SECONDS = 30     # commit a partial batch after this long
+
+# ─── Sharded runs (daily_run.py --workers N) ─────────────────
+SCRAPE_WORKERS = int(os.environ.get("SCRAPE_WORKERS", "4"))
+SHARD_BATCH_SIZE = 10           # units (boards / queries) per lease
+LEASE_SECONDS = 120             # a lease not renewed for this long is reclaimed
+BUSY_TIMEOUT = 30               # seconds a connection waits for another writer's lock
+
+# ─── Budgeted runs (daily_run.py --budget-seconds N) ─────────
+SCRAPE_BUDGET_SECONDS = int(os.environ.get("SCRAPE_BUDGET_SECONDS", "1800"))
+BUDGET_RESERVE_SECONDS = 120    # kept back for scoring, reclustering and publishing
+
+# ─── Retention ────────────────────────────────────────────────
+RETENTION_DAYS = 30
+RETENTION_BATCH = 1000          # rows per delete transaction
+ARCHIVE_EXPIRED = os.environ.get("ARCHIVE_EXPIRED", "") == "1"  # copy to jobs_archive first
+
 # ─── FAANG / Big Tech companies ───────────────────────────────
 # Normalized lowercase for matching
 FAANG_COMPANIES = {
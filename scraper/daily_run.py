@@ -8,6 +8,19 @@ Usage:
   python daily_run.py              # Run everything
   python daily_run.py --cleanup    # Only cleanup old jobs
   python daily_run.py --scrape     # Only run scrapers
+  python daily_run.py --resume     # Like the default run, but continue an interrupted scrape
+  python daily_run.py --workers 4  # Like the default run, scraping with 4 worker processes (see shards.py)
+  python daily_run.py --budget-seconds 1800  # Like the default run, finishing within 30 min (see scheduler.py)
+  python daily_run.py --verify-stats   # Compare the stats table to a full recount
+  python daily_run.py --rebuild-stats  # Recompute the stats table from scratch
+  python daily_run.py --publish    # Only publish a fresh read snapshot for the web app
+  python daily_run.py --export     # Append new jobs to the analytics export (add --full to redo)
+  python daily_run.py --compact    # One-off VACUUM + switch to incremental auto_vacuum
+  python daily_run.py --recluster  # Recompute near-duplicate clusters for every job
+
+Set ARCHIVE_EXPIRED=1 to copy expired jobs into jobs_archive before cleanup deletes them.
+
+Every mode that writes ends by publishing a read snapshot (see snapshot.py).
 """
 
 import sys
@@ -21,11 +34,24 @@ SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 os.chdir(SCRIPT_DIR)
 sys.path.insert(0, SCRIPT_DIR)
 
-from db import get_connection, init_db
-from config import DATA_DIR
-
-
-def save_last_run(new_jobs: int = 0, total: int = 0, elapsed: float = 0.0) -> None:
+from db import (
+    get_connection, init_db, bump_write_generation,
+    read_stats, verify_stats, rebuild_stats, prune_stats, assign_sources,
+)
+from config import (
+    DATA_DIR, RETENTION_DAYS, RETENTION_BATCH, ARCHIVE_EXPIRED, SCRAPE_WORKERS,
+    SCRAPE_BUDGET_SECONDS, BUDGET_RESERVE_SECONDS,
+)
+from ranking import refresh_smart_scores
+from snapshot import publish_snapshot
+from dedup import recluster, repair_cluster_heads
+from companies import assign_companies
+
+
+def save_last_run(
+    new_jobs: int = 0, total: int = 0, elapsed: float = 0.0, run_id: int | None = None, resumed: bool = False,
+    skipped_units: dict[str, int] | None = None,
+) -> None:
     """Write last run timestamp to data/last_run.json for the frontend."""
     DATA_DIR.mkdir(parents=True, exist_ok=True)
     info = {
@@ -33,67 +59,189 @@ def save_last_run(new_jobs: int = 0, total: int = 0, elapsed: float = 0.0) -> No
         "new_jobs": new_jobs,
         "total": total,
         "elapsed_seconds": round(elapsed, 1),
+        "scrape_run_id": run_id,
+        "resumed": resumed,
+        "skipped_units": skipped_units or {},
     }
     with open(str(DATA_DIR / "last_run.json"), "w") as f:
         json.dump(info, f, indent=2)
     print(f"[INFO] Saved last_run.json: {info['last_run']}", flush=True)
 
 
-def cleanup_old_jobs(max_age_days: int = 30) -> int:
-    """Delete jobs older than max_age_days based on created_at. Returns count deleted."""
+def _archive_columns(conn) -> str:
+    """Columns jobs and jobs_archive share, quoted for INSERT ... SELECT."""
+    jobs_cols = [r[1] for r in conn.execute("PRAGMA table_xinfo(jobs)") if r[6] in (0, 2, 3)]
+    archive_cols = {r[1] for r in conn.execute("PRAGMA table_info(jobs_archive)")}
+    return ", ".join(f'"{c}"' for c in jobs_cols if c in archive_cols)
+
+
+def cleanup_old_jobs(max_age_days: int = RETENTION_DAYS, archive: bool = ARCHIVE_EXPIRED) -> int:
+    """
+    Delete jobs created more than max_age_days ago (to the second, served by
+    idx_jobs_sort_recent on created_at), RETENTION_BATCH rows per short
+    transaction so readers and the scraper never queue behind one large
+    delete. Saved jobs are kept. With archive, rows are copied to
+    jobs_archive in the same transaction. Returns count deleted.
+    """
     conn = get_connection()
     cutoff = (datetime.utcnow() - timedelta(days=max_age_days)).isoformat()
+    archived_at = datetime.utcnow().isoformat()
+    columns = _archive_columns(conn) if archive else ""
+    deleted = 0
+
+    while True:
+        conn.execute("BEGIN IMMEDIATE")
+        batch = [r[0] for r in conn.execute(
+            "SELECT rowid FROM jobs WHERE created_at < ? AND saved = 0 LIMIT ?",
+            (cutoff, RETENTION_BATCH),
+        )]
+        if not batch:
+            conn.rollback()
+            break
+        in_batch = "rowid IN (" + ",".join("?" * len(batch)) + ")"
+        if archive:
+            conn.execute(
+                f"INSERT INTO jobs_archive ({columns}, archived_at) "
+                f"SELECT {columns}, ? FROM jobs WHERE {in_batch}",
+                [archived_at, *batch],
+            )
+        conn.execute(f"DELETE FROM jobs WHERE {in_batch}", batch)
+        deleted += conn.execute("SELECT changes()").fetchone()[0]
+        bump_write_generation(conn)
+        conn.commit()
+
+    prune_stats(conn)
+    conn.commit()
+    if deleted:
+        reclaim_space(conn)
+    conn.close()
+    return deleted
 
-    # Count before
-    before = conn.execute("SELECT COUNT(*) FROM jobs").fetchone()[0]
 
-    # Delete old jobs (but never delete saved ones)
-    conn.execute(
-        "DELETE FROM jobs WHERE created_at < ? AND saved = 0",
-        (cutoff,)
-    )
+def reclaim_space(conn) -> None:
+    """Return free pages to the OS when the DB is in incremental auto_vacuum mode."""
+    if conn.execute("PRAGMA auto_vacuum").fetchone()[0] != 2:
+        free = conn.execute("PRAGMA freelist_count").fetchone()[0]
+        if free:
+            print(f"[CLEANUP] {free} free pages kept (run --compact once to enable incremental vacuum)", flush=True)
+        return
+    free = conn.execute("PRAGMA freelist_count").fetchone()[0]
+    # executescript steps the pragma to completion (execute() frees one page)
+    conn.executescript("PRAGMA incremental_vacuum;")
+    print(f"[CLEANUP] Reclaimed {free} free pages", flush=True)
+
+
+def compact_db() -> None:
+    """
+    One-off full VACUUM that also switches the DB to incremental auto_vacuum,
+    so later cleanups can reclaim space in place. VACUUM may renumber rowids,
+    so the FTS index is rebuilt, outstanding keyset cursors are invalidated
+    (rowid_generation) and the analytics export must be redone with
+    --export --full.
+    """
+    conn = get_connection()
+    conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+    conn.execute("VACUUM")
+    conn.execute("INSERT INTO jobs_fts(jobs_fts) VALUES('rebuild')")
+    repair_cluster_heads(conn)
+    conn.execute("UPDATE meta SET value = value + 1 WHERE key = 'rowid_generation'")
+    bump_write_generation(conn)
     conn.commit()
+    mode = conn.execute("PRAGMA auto_vacuum").fetchone()[0]
+    conn.close()
+    print(f"[COMPACT] VACUUM done, auto_vacuum={mode}, FTS rebuilt", flush=True)
+
 
-    # Count after
-    after = conn.execute("SELECT COUNT(*) FROM jobs").fetchone()[0]
-    deleted = before - after
+def recluster_jobs(force: bool = False) -> None:
+    """
+    Recompute near-duplicate clusters and match keys. Without force, only
+    runs when some jobs are missing them (rows from before migration 0010/0012).
+    """
+    conn = get_connection()
+    missing = "SELECT 1 FROM jobs WHERE cluster_id IS NULL OR title_key IS NULL LIMIT 1"
+    if not force and not conn.execute(missing).fetchone():
+        conn.close()
+        return
+    start = time.time()
+    jobs, clusters = recluster(conn)
+    bump_write_generation(conn)
+    conn.commit()
     conn.close()
-    return deleted
+    print(f"[DEDUP] {jobs} jobs in {clusters} clusters ({jobs - clusters} near-duplicates) "
+          f"in {time.time() - start:.1f}s", flush=True)
+
+
+def assign_company_ids() -> None:
+    """Resolve company_id for jobs inserted before migration 0011 (no-op once done)."""
+    conn = get_connection()
+    if not conn.execute("SELECT 1 FROM jobs WHERE company_id IS NULL LIMIT 1").fetchone():
+        conn.close()
+        return
+    updated = assign_companies(conn)
+    if updated:
+        bump_write_generation(conn)
+    conn.commit()
+    companies = conn.execute("SELECT COUNT(*) FROM companies").fetchone()[0]
+    conn.close()
+    print(f"[COMPANIES] Linked {updated} jobs to {companies} companies", flush=True)
+
+
+def assign_source_ids() -> None:
+    """Set source_id for jobs inserted before migration 0007 (no-op once done)."""
+    conn = get_connection()
+    if not conn.execute("SELECT 1 FROM jobs WHERE source_id IS NULL LIMIT 1").fetchone():
+        conn.close()
+        return
+    updated = assign_sources(conn)
+    if updated:
+        bump_write_generation(conn)
+    conn.commit()
+    sources = conn.execute("SELECT COUNT(*) FROM sources").fetchone()[0]
+    conn.close()
+    print(f"[SOURCES] Linked {updated} jobs to {sources} sources", flush=True)
+
+
+def refresh_scores() -> int:
+    """Re-score smart_score for freshness decay. Returns rows changed."""
+    conn = get_connection()
+    changed = refresh_smart_scores(conn)
+    if changed:
+        bump_write_generation(conn)
+    conn.commit()
+    conn.close()
+    print(f"[RANK] Refreshed smart_score on {changed} jobs", flush=True)
+    return changed
+
+
+def publish() -> None:
+    """Publish a read snapshot; on failure the web keeps serving the previous one."""
+    try:
+        publish_snapshot()
+    except Exception as e:
+        print(f"[ERROR] Snapshot publish failed: {e}", flush=True)
 
 
 def get_db_stats() -> dict:
     """Get current DB statistics."""
     conn = get_connection()
-    total = conn.execute("SELECT COUNT(*) FROM jobs").fetchone()[0]
-    today = datetime.utcnow().strftime("%Y-%m-%d")
-    today_count = conn.execute(
-        "SELECT COUNT(*) FROM jobs WHERE created_at LIKE ?",
-        (f"{today}%",)
-    ).fetchone()[0]
-
-    sources = conn.execute(
-        "SELECT source, COUNT(*) as cnt FROM jobs GROUP BY source ORDER BY cnt DESC"
-    ).fetchall()
-
-    duplicates = conn.execute("""
-        SELECT COUNT(*) FROM (
-            SELECT title, company, COUNT(*) as cnt
-            FROM jobs GROUP BY LOWER(title), LOWER(company)
-            HAVING cnt > 1
-        )
-    """).fetchone()[0]
+    stats = read_stats(conn, datetime.utcnow().strftime("%Y-%m-%d"))
 
     conn.close()
     return {
-        "total": total,
-        "today": today_count,
-        "sources": {row[0]: row[1] for row in sources},
-        "potential_dupes": duplicates,
+        "total": stats["total"],
+        "today": stats["today"],
+        "sources": dict(sorted(stats["by_source"].items(), key=lambda kv: kv[1], reverse=True)),
+        "potential_dupes": stats["dupe_groups"],
     }
 
 
-def run_all_scrapers():
-    """Run all scrapers in sequence."""
+def run_all_scrapers(resume: bool = False, workers: int = 1, budget_seconds: float | None = None):
+    """
+    Run all scrapers in sequence. Returns (stats before, stats after, pipeline
+    stats or None if the scrape failed). resume continues an interrupted run;
+    workers > 1 shards the run across that many processes; budget_seconds
+    scrapes only what is expected to fit.
+    """
     print(f"\n{'='*60}", flush=True)
     print(f"  DAILY JOB SCRAPE — {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}", flush=True)
     print(f"{'='*60}\n", flush=True)
@@ -107,10 +255,15 @@ def run_all_scrapers():
     # 1. ATS Scraper (Greenhouse + Lever + Adzuna + JSearch + RemoteOK + Ashby)
     print(f"\n{'─'*40}", flush=True)
     print("[1/6] Running ATS Scraper (Greenhouse + Lever + RemoteOK + Ashby + Adzuna + JSearch)...", flush=True)
+    run = None
     try:
-        from scraper import run_scraper
-        # run_scraper already calls SerpAPI, Adzuna, JSearch internally
-        run_scraper()
+        if workers > 1:
+            from shards import run_sharded
+            run = run_sharded(workers)
+        else:
+            from scraper import run_scraper
+            # run_scraper already calls SerpAPI, Adzuna, JSearch internally
+            run = run_scraper(resume=resume, budget_seconds=budget_seconds)
     except Exception as e:
         print(f"[ERROR] ATS Scraper failed: {e}", flush=True)
 
@@ -118,7 +271,7 @@ def run_all_scrapers():
     new_jobs = stats_after["total"] - stats_before["total"]
     print(f"\n[DB] After scraping: {stats_after['total']} total jobs (+{new_jobs} new)", flush=True)
 
-    return stats_before, stats_after
+    return stats_before, stats_after, run
 
 
 def main():
@@ -126,30 +279,82 @@ def main():
     mode = sys.argv[1] if len(sys.argv) > 1 else "--all"
 
     init_db()
+    assign_source_ids()
+    assign_company_ids()
 
     if mode == "--cleanup":
-        print("[CLEANUP] Removing jobs older than 30 days...", flush=True)
-        deleted = cleanup_old_jobs(30)
+        print(f"[CLEANUP] Removing jobs older than {RETENTION_DAYS} days...", flush=True)
+        deleted = cleanup_old_jobs()
         print(f"[CLEANUP] Deleted {deleted} old jobs", flush=True)
         s = get_db_stats()
+        publish()
         save_last_run(new_jobs=0, total=s["total"], elapsed=time.time() - start_time)
 
+    elif mode == "--publish":
+        publish()
+
+    elif mode == "--compact":
+        compact_db()
+        publish()
+
+    elif mode == "--recluster":
+        recluster_jobs(force=True)
+        publish()
+
+    elif mode == "--export":
+        from export import export_jobs
+        export_jobs(full="--full" in sys.argv[2:])
+
+    elif mode in ("--verify-stats", "--rebuild-stats"):
+        conn = get_connection()
+        drift = verify_stats(conn)
+        for dim, key, stored, actual in drift:
+            print(f"[STATS] {dim:8s} {key[:40]:40s} stored={stored:<8} actual={actual}", flush=True)
+        print(f"[STATS] {len(drift)} counters out of step", flush=True)
+        if mode == "--rebuild-stats":
+            rebuild_stats(conn)
+            bump_write_generation(conn)
+            conn.commit()
+            print("[STATS] Rebuilt job_stats from a full recount", flush=True)
+        conn.close()
+        if mode == "--rebuild-stats":
+            publish()
+        if drift and mode == "--verify-stats":
+            sys.exit(1)
+
     elif mode == "--scrape":
-        stats_before, stats_after = run_all_scrapers()
+        stats_before, stats_after, run = run_all_scrapers()
+        refresh_scores()
+        publish()
         new_jobs = stats_after["total"] - stats_before["total"]
-        save_last_run(new_jobs=new_jobs, total=stats_after["total"], elapsed=time.time() - start_time)
+        save_last_run(new_jobs=new_jobs, total=stats_after["total"], elapsed=time.time() - start_time,
+                      run_id=run.run_id if run else None)
 
-    else:  # --all (default)
+    else:  # --all (default), --resume, --workers [N] or --budget-seconds [N]
         # Step 1: Cleanup old jobs first
-        print("[STEP 1] Cleaning up jobs older than 30 days...", flush=True)
-        deleted = cleanup_old_jobs(30)
+        print(f"[STEP 1] Cleaning up jobs older than {RETENTION_DAYS} days...", flush=True)
+        deleted = cleanup_old_jobs()
         print(f"[CLEANUP] Deleted {deleted} old jobs", flush=True)
 
         # Step 2: Run all scrapers
         print(f"\n[STEP 2] Running all scrapers...", flush=True)
-        stats_before, stats_after = run_all_scrapers()
+        workers = 1
+        if mode == "--workers":
+            workers = int(sys.argv[2]) if len(sys.argv) > 2 else SCRAPE_WORKERS
+        budget = None
+        if mode == "--budget-seconds":
+            total_budget = float(sys.argv[2]) if len(sys.argv) > 2 else SCRAPE_BUDGET_SECONDS
+            budget = max(0.0, total_budget - (time.time() - start_time) - BUDGET_RESERVE_SECONDS)
+            print(f"[BUDGET] {total_budget:.0f}s total, {budget:.0f}s for scraping", flush=True)
+        stats_before, stats_after, run = run_all_scrapers(
+            resume=mode == "--resume", workers=workers, budget_seconds=budget
+        )
+
+        # Step 3: Age smart_score freshness; cluster any jobs not yet clustered
+        refresh_scores()
+        recluster_jobs()
 
-        # Step 3: Summary
+        # Step 4: Summary
         elapsed = time.time() - start_time
         new_jobs = stats_after['total'] - stats_before['total'] + deleted
         print(f"\n{'='*60}", flush=True)
@@ -163,10 +368,18 @@ def main():
         print(f"  Sources:", flush=True)
         for src, cnt in stats_after["sources"].items():
             print(f"    {src:20s} {cnt:>6}", flush=True)
+        skipped = run.skipped_units() if run else {}
+        if skipped:
+            print(f"  Skipped (budget):", flush=True)
+            for src, cnt in skipped.items():
+                print(f"    {src:20s} {cnt:>6} units", flush=True)
         print(f"{'='*60}\n", flush=True)
 
-        # Step 4: Save last run timestamp for frontend
-        save_last_run(new_jobs=new_jobs, total=stats_after["total"], elapsed=elapsed)
+        # Step 5: Publish the read snapshot, then tell the frontend
+        publish()
+        save_last_run(new_jobs=new_jobs, total=stats_after["total"], elapsed=elapsed,
+                      run_id=run.run_id if run else None, resumed=bool(run and run.resumed),
+                      skipped_units=run.skipped_units() if run else None)
 
 
 if __name__ == "__main__":
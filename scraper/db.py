@@ -1,98 +1,59 @@
 """Database module — SQLite storage for jobs with location + salary + FAANG support."""
+import re
+import json
+import base64
 import sqlite3
 import hashlib
-from datetime import datetime
+from datetime import date, datetime
 from typing import Any
-from config import DB_PATH, DATA_DIR, FAANG_COMPANIES
+from config import DB_PATH, DATA_DIR, FAANG_COMPANIES, BUSY_TIMEOUT
+from schema import migrate
+from cache import GenerationCache
+from ranking import smart_score, source_quality
+from dedup import match_keys, find_cluster
+from companies import drop_pending, keep_pending, resolve_company, squash
 
 
 def get_connection() -> sqlite3.Connection:
     DATA_DIR.mkdir(parents=True, exist_ok=True)
-    conn = sqlite3.connect(str(DB_PATH))
+    # Shard workers queue on each other's write transactions (BEGIN IMMEDIATE
+    # included) for up to BUSY_TIMEOUT seconds before "database is locked"
+    conn = sqlite3.connect(str(DB_PATH), timeout=BUSY_TIMEOUT)
     conn.row_factory = sqlite3.Row
     conn.execute("PRAGMA journal_mode=WAL")
     return conn
 
 
+_schema_ready = False
+
+
 def init_db() -> None:
+    """Bring the schema up to date. Costs one PRAGMA read when nothing changed."""
+    global _schema_ready
+    if _schema_ready:
+        return
     conn = get_connection()
-    conn.execute("""
-        CREATE TABLE IF NOT EXISTS jobs (
-            id TEXT PRIMARY KEY,
-            title TEXT NOT NULL,
-            company TEXT NOT NULL,
-            location TEXT DEFAULT '',
-            remote INTEGER DEFAULT 0,
-            apply_url TEXT NOT NULL,
-            source TEXT NOT NULL,
-            posted_date TEXT,
-            match_score INTEGER DEFAULT 0,
-            saved INTEGER DEFAULT 0,
-            created_at TEXT NOT NULL,
-            country TEXT DEFAULT '',
-            state TEXT DEFAULT '',
-            city TEXT DEFAULT '',
-            is_india INTEGER DEFAULT 0,
-            is_faang INTEGER DEFAULT 0,
-            salary_min_lpa REAL,
-            salary_max_lpa REAL,
-            salary_currency TEXT DEFAULT '',
-            source_type TEXT DEFAULT 'ATS',
-            visa_sponsored INTEGER DEFAULT 0,
-            has_equity INTEGER DEFAULT 0
-        )
-    """)
-    conn.commit()
+    try:
+        migrate(conn)
+    finally:
+        conn.close()
+    _schema_ready = True
 
-    # Run migration FIRST (adds new columns to existing tables)
-    _migrate(conn)
-
-    # Then create indexes (including on new columns)
-    for idx_sql in [
-        "CREATE INDEX IF NOT EXISTS idx_jobs_company ON jobs(company)",
-        "CREATE INDEX IF NOT EXISTS idx_jobs_match_score ON jobs(match_score DESC)",
-        "CREATE INDEX IF NOT EXISTS idx_jobs_created_at ON jobs(created_at DESC)",
-        "CREATE INDEX IF NOT EXISTS idx_jobs_remote ON jobs(remote)",
-        "CREATE INDEX IF NOT EXISTS idx_jobs_country ON jobs(country)",
-        "CREATE INDEX IF NOT EXISTS idx_jobs_is_india ON jobs(is_india)",
-        "CREATE INDEX IF NOT EXISTS idx_jobs_is_faang ON jobs(is_faang)",
-        "CREATE INDEX IF NOT EXISTS idx_jobs_salary ON jobs(salary_min_lpa)",
-    ]:
-        conn.execute(idx_sql)
-    conn.commit()
-    conn.close()
 
+def get_write_generation(conn: sqlite3.Connection) -> int:
+    row = conn.execute("SELECT value FROM meta WHERE key = 'write_generation'").fetchone()
+    return int(row[0]) if row else 0
 
-def _migrate(conn: sqlite3.Connection) -> None:
-    """Add new columns if they don't exist (safe migration)."""
-    cursor = conn.execute("PRAGMA table_info(jobs)")
-    existing_cols: set[str] = set()
-    for row in cursor.fetchall():
-        existing_cols.add(str(row[1]))
-
-    new_columns = {
-        "country": "TEXT DEFAULT ''",
-        "state": "TEXT DEFAULT ''",
-        "city": "TEXT DEFAULT ''",
-        "is_india": "INTEGER DEFAULT 0",
-        "is_faang": "INTEGER DEFAULT 0",
-        "salary_min_lpa": "REAL",
-        "salary_max_lpa": "REAL",
-        "salary_currency": "TEXT DEFAULT ''",
-        "source_type": "TEXT DEFAULT 'ATS'",
-        "visa_sponsored": "INTEGER DEFAULT 0",
-        "has_equity": "INTEGER DEFAULT 0",
-    }
 
-    for col, col_type in new_columns.items():
-        if col not in existing_cols:
-            try:
-                conn.execute(f"ALTER TABLE jobs ADD COLUMN {col} {col_type}")
-                print(f"  [DB] Added column: {col}")
-            except sqlite3.OperationalError:
-                pass
+def get_rowid_generation(conn: sqlite3.Connection) -> int:
+    """Bumped when rowids may have been renumbered (compact_db); keyset cursors carry it."""
+    row = conn.execute("SELECT value FROM meta WHERE key = 'rowid_generation'").fetchone()
+    return int(row[0]) if row else 0
 
-    conn.commit()
+
+def bump_write_generation(conn: sqlite3.Connection) -> None:
+    """Invalidate cached counts/results. Call once per write batch, before commit."""
+    conn.execute("UPDATE meta SET value = value + 1 WHERE key = 'write_generation'")
 
 
 def _check_faang(company: str) -> bool:
@@ -110,11 +71,75 @@ def make_job_id(title: str, company: str, location: str = "") -> str:
     return hashlib.md5(raw.encode()).hexdigest()
 
 
+# Feed family per source name (sources.family); serp_* are all "serp"
+_SOURCE_FAMILIES = {
+    "greenhouse": "ats", "lever": "ats", "ashby": "ats",
+    "jsearch": "aggregator", "adzuna": "aggregator", "remoteok": "aggregator",
+}
+
+# Ids read outside a transaction are cached at once. Ids read inside one may
+# belong to rows that vanish on rollback, so they wait in _pending_sources
+# until the caller reports the outcome (ids_committed / ids_rolled_back).
+_source_ids: dict[str, int] = {}
+_pending_sources: dict[str, int] = {}
+
+
+def ids_committed() -> None:
+    """Cache the source and company ids read inside the transaction just committed."""
+    _source_ids.update(_pending_sources)
+    _pending_sources.clear()
+    keep_pending()
+
+
+def ids_rolled_back() -> None:
+    """Forget the source and company ids read inside the transaction just rolled back."""
+    _pending_sources.clear()
+    drop_pending()
+
+
+def source_id(conn: sqlite3.Connection, name: str) -> int:
+    """Integer id for a source name, registering new names in the sources table."""
+    cached = _source_ids.get(name)
+    if cached is not None:
+        return cached
+    row = conn.execute("SELECT id FROM sources WHERE name = ?", (name,)).fetchone()
+    if row is None:
+        family = "serp" if name.startswith("serp") else _SOURCE_FAMILIES.get(name, "other")
+        conn.execute(
+            "INSERT OR IGNORE INTO sources (name, family, quality) VALUES (?, ?, ?)",
+            (name, family, source_quality(name)),
+        )
+        row = conn.execute("SELECT id FROM sources WHERE name = ?", (name,)).fetchone()
+    (_pending_sources if conn.in_transaction else _source_ids)[name] = int(row[0])
+    return int(row[0])
+
+
+def assign_sources(conn: sqlite3.Connection) -> int:
+    """Set source_id on jobs inserted before migration 0007. Returns rows updated; caller commits."""
+    names = [r[0] for r in conn.execute(
+        "SELECT DISTINCT source FROM jobs WHERE source_id IS NULL AND source IS NOT NULL"
+    )]
+    updated = 0
+    for name in names:
+        updated += conn.execute(
+            "UPDATE jobs SET source_id = ? WHERE source_id IS NULL AND source = ?", (source_id(conn, name), name)
+        ).rowcount
+    return updated
+
+
 def job_exists(conn: sqlite3.Connection, job_id: str) -> bool:
     row = conn.execute("SELECT 1 FROM jobs WHERE id = ?", (job_id,)).fetchone()
     return row is not None
 
 
+_EPOCH = date(1970, 1, 1)
+
+
+def epoch_day(d: date) -> int:
+    """Days since 1970-01-01 — the unit of jobs.created_day / posted_day."""
+    return (d - _EPOCH).days
+
+
 def _normalize_date(date_str: str) -> str:
     """Normalize a date string to ISO format (YYYY-MM-DD). Fallback to today."""
     if not date_str or not date_str.strip():
@@ -138,7 +163,7 @@ def _normalize_date(date_str: str) -> str:
 def insert_job(conn: sqlite3.Connection, job: dict) -> bool:
     location = job.get("location", "")
     job_id = make_job_id(job["title"], job["company"], location)
-    if job_exists(conn, job_id):
+    if job_exists(conn, job_id):  # fast path: skips clustering and company resolution
         return False
 
     # Auto-tag FAANG
@@ -147,15 +172,20 @@ def insert_job(conn: sqlite3.Connection, job: dict) -> bool:
     # Normalize posted_date (#8)
     posted_date = _normalize_date(job.get("posted_date", ""))
     now = datetime.utcnow().isoformat()
+    score = smart_score(job.get("match_score", 0), posted_date, now, job.get("salary_min_lpa"), job["source"])
+    keys = match_keys(job)
 
-    conn.execute(
+    # Another shard worker may insert the same id between the check and here
+    cur = conn.execute(
         """INSERT INTO jobs (
             id, title, company, location, remote, apply_url, source,
             posted_date, match_score, created_at,
             country, state, city, is_india, is_faang,
             salary_min_lpa, salary_max_lpa, salary_currency, source_type,
-            visa_sponsored, has_equity
-        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+            visa_sponsored, has_equity, smart_score, source_id,
+            url_key, company_key, location_key, title_hash, cluster_id, company_id, title_key
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT(id) DO NOTHING""",
         (
             job_id,
             job["title"],
@@ -178,9 +208,18 @@ def insert_job(conn: sqlite3.Connection, job: dict) -> bool:
             job.get("source_type", "ATS"),
             1 if job.get("visa_sponsored", False) else 0,
             1 if job.get("has_equity", False) else 0,
+            score,
+            source_id(conn, job["source"]),
+            keys["url_key"],
+            keys["company_key"],
+            keys["location_key"],
+            keys["title_hash"],
+            find_cluster(conn, keys),
+            resolve_company(conn, job["company"]),
+            keys["title_key"],
         ),
     )
-    return True
+    return cur.rowcount == 1
 
 
 def insert_jobs_batch(jobs: list[dict]) -> int:
@@ -189,99 +228,503 @@ def insert_jobs_batch(jobs: list[dict]) -> int:
     for job in jobs:
         if insert_job(conn, job):
             count += 1
+    if count:
+        bump_write_generation(conn)
     conn.commit()
     conn.close()
     return count
 
 
-def get_jobs(
-    limit: int = 50,
-    offset: int = 0,
+# Sort modes — kept in step with getJobs() in web/lib/db.ts. Every key is
+# sorted DESC with rowid ASC as the tiebreaker, which the composite indexes
+# already carry, so the same keys drive ORDER BY and keyset cursors. Ordering
+# on id instead would need a temp B-tree per page; cursors carry the rowid
+# generation instead (migration 0019).
+# Keys must be non-NULL for cursors (insert_job always sets posted_date).
+SORT_KEYS = {
+    "": ["created_at", "match_score"],
+    "score": ["match_score", "created_at"],
+    "salary": ["COALESCE(salary_min_lpa, 0)", "match_score"],
+    "date": ["posted_date", "created_at"],
+    "smart": ["smart_score"],
+}
+
+
+def sort_mode(sort_by: str | None = None, smart_view: bool = False) -> str:
+    if smart_view:
+        return "smart"
+    return sort_by if sort_by in SORT_KEYS else ""
+
+
+def job_order_by(sort_by: str | None = None, smart_view: bool = False) -> str:
+    keys = SORT_KEYS[sort_mode(sort_by, smart_view)]
+    return "ORDER BY " + ", ".join(f"{k} DESC" for k in keys) + ", rowid"
+
+
+def encode_cursor(mode: str, values: list[Any], rowid: int, generation: int) -> str:
+    """
+    Opaque keyset cursor: the sort mode, the last row's sort keys, its rowid
+    and the rowid generation the rowid belongs to.
+    """
+    raw = json.dumps([mode, values, rowid, generation], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, mode: str, generation: int) -> tuple[list[Any], int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        cur_mode, values, rowid, cur_generation = json.loads(raw)
+    except (ValueError, TypeError) as e:
+        raise ValueError("Invalid cursor") from e
+    if cur_mode != mode or len(values) != len(SORT_KEYS[mode]):
+        raise ValueError("Cursor does not match the sort order")
+    if cur_generation != generation:
+        # Rowids may have been renumbered since (compact_db): the tiebreaker is meaningless
+        raise ValueError("Cursor is from before the database was compacted; start from the first page")
+    return values, int(rowid)
+
+
+def keyset_filter(mode: str, values: list[Any], rowid: int) -> tuple[str, list[Any]]:
+    """
+    Predicate selecting rows strictly after the cursor, e.g. for two keys:
+      a <= ? AND (a < ? OR (a = ? AND (b < ? OR (b = ? AND rowid > ?))))
+    The leading 'a <= ?' gives the planner an index range on the sort index.
+    """
+    keys = SORT_KEYS[mode]
+    clause = "rowid > ?"
+    params: list[Any] = [rowid]
+    for key, value in reversed(list(zip(keys, values))):
+        clause = f"({key} < ? OR ({key} = ? AND {clause}))"
+        params = [value, value, *params]
+    return f" AND {keys[0]} <= ? AND {clause}", [values[0], *params]
+
+
+_FTS_TOKEN_RE = re.compile(r"[^\W_]+")
+
+
+def fts_query(text: str, columns: str) -> str | None:
+    """
+    Turn free text into an FTS5 prefix query on the given columns, OR'd with
+    the joined spelling against search_joined (migration 0017):
+    "full-stack" -> ({title company} : "full stack"*) OR ({search_joined} : "fullstack"*)
+    so "fullstack", "full stack" and "full-stack" all find "Full-Stack".
+    Returns None if the text has no word characters (caller falls back to LIKE).
+    """
+    tokens = _FTS_TOKEN_RE.findall(text.lower())
+    if not tokens:
+        return None
+    return f'({{{columns}}} : "{" ".join(tokens)}"*) OR ({{search_joined}} : "{"".join(tokens)}"*)'
+
+
+def build_job_filters(
+    min_score: int = 0,
     remote_only: bool = False,
     keyword: str | None = None,
-    min_score: int = 0,
     country: str | None = None,
     india_only: bool = False,
     faang_only: bool = False,
     min_salary: float | None = None,
     max_salary: float | None = None,
     source: str | None = None,
-) -> tuple[list[dict], int]:
-    conn = get_connection()
-    query = "SELECT * FROM jobs WHERE match_score >= ?"
+    today_only: bool = False,
+    max_days_ago: int | None = None,
+    company: str | None = None,
+    visa_only: bool = False,
+    equity_only: bool = False,
+    smart_view: bool = False,
+    collapse_duplicates: bool = False,
+) -> tuple[str, list[Any]]:
+    """Build the WHERE clause shared by job listing queries. Mirrors web getJobs()."""
+    # Unary + keeps the always-present score floor from driving the plan: as
+    # an index term it range-scans idx_jobs_sort_score over the whole table
+    # and shadows the indexed source / flag / company filters below
+    where = "WHERE +match_score >= ?"
     params: list[Any] = [min_score]
 
     if remote_only:
-        query += " AND remote = 1"
+        where += " AND remote = 1"
 
     if keyword:
-        query += " AND (LOWER(title) LIKE ? OR LOWER(company) LIKE ?)"
-        kw = f"%{keyword.lower()}%"
-        params.extend([kw, kw])
+        match = fts_query(keyword, "title company")
+        if match:
+            where += " AND rowid IN (SELECT rowid FROM jobs_fts WHERE jobs_fts MATCH ?)"
+            params.append(match)
+        else:
+            where += " AND (LOWER(title) LIKE ? OR LOWER(company) LIKE ?)"
+            kw = f"%{keyword.lower()}%"
+            params.extend([kw, kw])
+
+    if source:
+        sources = [s.strip() for s in source.split(",") if s.strip()]
+        if sources:
+            # Substring match against the small sources table, then an IN
+            # lookup on the indexed jobs.source_id
+            likes = " OR ".join("name LIKE ?" for _ in sources)
+            where += f" AND source_id IN (SELECT id FROM sources WHERE {likes})"
+            params.extend(f"%{s}%" for s in sources)
 
     if country:
-        query += " AND country = ?"
+        where += " AND country = ?"
         params.append(country.upper())
 
     if india_only:
-        query += " AND is_india = 1"
+        where += " AND is_india = 1"
 
     if faang_only:
-        query += " AND is_faang = 1"
+        where += " AND is_faang = 1"
 
     if min_salary is not None:
-        query += " AND salary_min_lpa >= ?"
+        where += " AND salary_min_lpa >= ?"
         params.append(min_salary)
 
     if max_salary is not None:
-        query += " AND salary_max_lpa <= ?"
+        where += " AND salary_max_lpa <= ?"
         params.append(max_salary)
 
-    if source:
-        query += " AND source LIKE ?"
-        params.append(f"%{source}%")
+    today = epoch_day(datetime.utcnow().date())
+    if today_only:
+        where += " AND posted_day = ?"
+        params.append(today)
+
+    if max_days_ago:
+        where += " AND posted_day >= ?"
+        params.append(today - max_days_ago)
+
+    if company:
+        alias = squash(company)
+        if alias:
+            # Substring match against known company names (companies.py),
+            # then an IN lookup on the indexed jobs.company_id
+            where += " AND company_id IN (SELECT company_id FROM company_aliases WHERE alias LIKE ?)"
+            params.append(f"%{alias}%")
+        else:
+            where += " AND LOWER(company) LIKE ?"
+            params.append(f"%{company.lower()}%")
+
+    if visa_only:
+        where += " AND visa_sponsored = 1"
+
+    if equity_only:
+        where += " AND has_equity = 1"
+
+    # Smart View: high score + fresh + has signal
+    if smart_view:
+        week_ago = today - 7
+        where += " AND +match_score >= 70"  # the freshness window is the selective term
+        where += " AND (posted_day >= ? OR created_day >= ?)"
+        params.extend([week_ago, week_ago])
+        where += " AND (salary_min_lpa > 0 OR remote = 1 OR is_india = 1 OR is_faang = 1)"
+
+    # One row per near-duplicate cluster (its oldest job); see dedup.py
+    if collapse_duplicates:
+        where += " AND (cluster_id IS NULL OR cluster_id = rowid)"
+
+    return where, params
+
+
+_count_cache = GenerationCache(maxsize=512)
+
+# Whole listing results (jobs page + total + cursor) keyed by the final SQL
+# and parameters, so equivalent filter combinations share an entry. The TTL
+# bounds staleness for anything that changes without a write.
+_result_cache = GenerationCache(maxsize=256, ttl=600)
+
+
+def cache_stats() -> dict:
+    """Hit/miss counters for the listing result and count caches."""
+    return {"results": _result_cache.stats(), "counts": _count_cache.stats(), "facets": _facet_cache.stats()}
+
+
+def count_jobs(
+    conn: sqlite3.Connection, where: str, params: list[Any], count_cap: int | None = None
+) -> tuple[int, bool]:
+    """
+    COUNT(*) for a filter, cached by (WHERE, params) until the write generation moves.
+    With count_cap, stops counting after count_cap rows and returns (count_cap, True).
+    """
+    key = (where, json.dumps(params), count_cap)
+    generation = get_write_generation(conn)
+    cached = _count_cache.get(key, generation)
+    if cached is not None:
+        return cached
+
+    if count_cap:
+        n = conn.execute(
+            f"SELECT COUNT(*) FROM (SELECT 1 FROM jobs {where} LIMIT ?)", [*params, count_cap + 1]
+        ).fetchone()[0]
+        result = (count_cap, True) if n > count_cap else (n, False)
+    else:
+        result = (conn.execute(f"SELECT COUNT(*) FROM jobs {where}", params).fetchone()[0], False)
+    _count_cache.put(key, generation, result)
+    return result
+
+
+def _fetch_jobs(
+    limit: int,
+    offset: int,
+    sort_by: str | None,
+    cursor: str | None,
+    count_cap: int | None,
+    filters: dict[str, Any],
+) -> tuple[list[dict], int, bool, str | None]:
+    where, params = build_job_filters(**filters)
+    mode = sort_mode(sort_by, filters.get("smart_view", False))
+    keys = SORT_KEYS[mode]
 
-    count_query = query.replace("SELECT *", "SELECT COUNT(*)")
-    total = conn.execute(count_query, params).fetchone()[0]
+    conn = get_connection()
+    rowid_generation = get_rowid_generation(conn)
+    page_where, page_params = where, list(params)
+    if cursor:
+        try:
+            extra, extra_params = keyset_filter(mode, *decode_cursor(cursor, mode, rowid_generation))
+        except ValueError:
+            conn.close()
+            raise
+        page_where += extra
+        page_params += extra_params
+        offset = 0
+
+    key_cols = "".join(f", {k} AS _k{i}" for i, k in enumerate(keys))
+    sql = (
+        f"SELECT *, rowid AS _rowid{key_cols} FROM jobs {page_where} "
+        f"{job_order_by(sort_by, filters.get('smart_view', False))} LIMIT ? OFFSET ?"
+    )
+    sql_params = [*page_params, limit, offset]
+
+    generation = get_write_generation(conn)
+    cache_key = (sql, json.dumps(sql_params), where, json.dumps(params), count_cap)
+    cached = _result_cache.get(cache_key, generation)
+    if cached is not None:
+        conn.close()
+        jobs, total, estimated, next_cursor = cached
+        return [dict(j) for j in jobs], total, estimated, next_cursor
+
+    total, estimated = count_jobs(conn, where, params, count_cap)
+    rows = conn.execute(sql, sql_params).fetchall()
+    conn.close()
 
-    query += " ORDER BY created_at DESC, match_score DESC LIMIT ? OFFSET ?"
-    params.extend([limit, offset])
+    jobs: list[dict] = []
+    last: tuple[list[Any], int] | None = None
+    for r in rows:
+        job = dict(r)
+        last = ([job.pop(f"_k{i}") for i in range(len(keys))], job.pop("_rowid"))
+        jobs.append(job)
+    next_cursor = encode_cursor(mode, *last, rowid_generation) if last and len(rows) == limit else None
+    _result_cache.put(cache_key, generation, (jobs, total, estimated, next_cursor))
+    return [dict(j) for j in jobs], total, estimated, next_cursor
 
-    rows = conn.execute(query, params).fetchall()
-    conn.close()
-    return [dict(r) for r in rows], total
 
+def get_jobs(
+    limit: int = 50,
+    offset: int = 0,
+    sort_by: str | None = None,
+    cursor: str | None = None,
+    **filters: Any,
+) -> tuple[list[dict], int]:
+    """Return (jobs, total). Filters are the keyword arguments of build_job_filters()."""
+    jobs, total, _, _ = _fetch_jobs(limit, offset, sort_by, cursor, None, filters)
+    return jobs, total
 
-def get_stats() -> dict:
+
+def get_jobs_page(
+    limit: int = 50,
+    cursor: str | None = None,
+    sort_by: str | None = None,
+    count_cap: int | None = None,
+    **filters: Any,
+) -> dict:
+    """
+    Keyset-paginated listing: {"jobs", "total", "total_is_estimate", "next_cursor"}.
+    Pass next_cursor back to fetch the following page; cost does not grow with depth.
+    count_cap bounds the COUNT for very broad filters (total becomes a lower bound).
+    """
+    jobs, total, estimated, next_cursor = _fetch_jobs(limit, 0, sort_by, cursor, count_cap, filters)
+    return {"jobs": jobs, "total": total, "total_is_estimate": estimated, "next_cursor": next_cursor}
+
+
+def get_job_variants(job_id: str) -> list[dict]:
+    """
+    Other listings with the same normalized title and company as job_id
+    (other sources, locations or postings), newest first. One lookup on
+    idx_jobs_title_company_key.
+    """
     conn = get_connection()
-    total = conn.execute("SELECT COUNT(*) FROM jobs").fetchone()[0]
-    today = datetime.utcnow().date().isoformat()
-    today_count = conn.execute(
-        "SELECT COUNT(*) FROM jobs WHERE created_at LIKE ?", (f"{today}%",)
-    ).fetchone()[0]
-    sources = conn.execute(
-        "SELECT source, COUNT(*) as cnt FROM jobs GROUP BY source"
+    rows = conn.execute(
+        """SELECT v.* FROM jobs j
+           JOIN jobs v ON v.title_key = j.title_key AND v.company_key = j.company_key AND v.id != j.id
+           WHERE j.id = ?
+           ORDER BY v.created_at DESC""",
+        (job_id,),
     ).fetchall()
+    conn.close()
+    return [dict(r) for r in rows]
 
-    india_count = 0
-    remote_count = 0
-    with_salary = 0
-    faang_count = 0
-    try:
-        india_count = conn.execute("SELECT COUNT(*) FROM jobs WHERE is_india = 1").fetchone()[0]
-        remote_count = conn.execute("SELECT COUNT(*) FROM jobs WHERE remote = 1").fetchone()[0]
-        with_salary = conn.execute("SELECT COUNT(*) FROM jobs WHERE salary_min_lpa IS NOT NULL AND salary_min_lpa > 0").fetchone()[0]
-        faang_count = conn.execute("SELECT COUNT(*) FROM jobs WHERE is_faang = 1").fetchone()[0]
-    except sqlite3.OperationalError:
-        pass
 
+# Salary facet buckets (LPA upper bounds, exclusive); rows without a salary
+# are not counted. Same as SALARY_BUCKETS in web/lib/db.ts.
+SALARY_BUCKETS = [(10, "0-10"), (20, "10-20"), (40, "20-40"), (None, "40+")]
+
+_SALARY_BUCKET_SQL = "CASE WHEN COALESCE(salary_min_lpa, 0) <= 0 THEN NULL " + " ".join(
+    f"WHEN salary_min_lpa < {upper} THEN '{label}'" if upper is not None else f"ELSE '{label}'"
+    for upper, label in SALARY_BUCKETS
+) + " END"
+
+_facet_cache = GenerationCache(maxsize=256, ttl=600)
+
+
+def get_facets(**filters: Any) -> dict:
+    """
+    Counts per country, source, remote, FAANG, visa, equity and salary bucket
+    for a filter, from a single GROUP BY pass rolled up here.
+    Filters are the keyword arguments of build_job_filters().
+    """
+    where, params = build_job_filters(**filters)
+    conn = get_connection()
+    generation = get_write_generation(conn)
+    key = (where, json.dumps(params))
+    cached = _facet_cache.get(key, generation)
+    if cached is not None:
+        conn.close()
+        return json.loads(cached)
+
+    rows = conn.execute(
+        f"""SELECT country, source, {_SALARY_BUCKET_SQL} AS salary_bucket, COUNT(*),
+                SUM(remote = 1), SUM(is_faang = 1), SUM(visa_sponsored = 1), SUM(has_equity = 1)
+            FROM jobs {where}
+            GROUP BY 1, 2, 3""",
+        params,
+    ).fetchall()
     conn.close()
+
+    facets: dict[str, Any] = {
+        "total": 0,
+        "country": {},
+        "source": {},
+        "salary": {label: 0 for _, label in SALARY_BUCKETS},
+        "remote": 0,
+        "faang": 0,
+        "visa": 0,
+        "equity": 0,
+    }
+    for country, source, bucket, cnt, remote, faang, visa, equity in rows:
+        facets["total"] += cnt
+        facets["country"][country or ""] = facets["country"].get(country or "", 0) + cnt
+        facets["source"][source or ""] = facets["source"].get(source or "", 0) + cnt
+        if bucket:
+            facets["salary"][bucket] += cnt
+        facets["remote"] += remote
+        facets["faang"] += faang
+        facets["visa"] += visa
+        facets["equity"] += equity
+    for name in ("country", "source"):
+        facets[name] = dict(sorted(facets[name].items(), key=lambda kv: kv[1], reverse=True))
+
+    _facet_cache.put(key, generation, json.dumps(facets))
+    return facets
+
+
+# Full recount of every job_stats counter. Same definitions as the triggers
+# in migrations/0005_job_stats.sql (company re-keyed in 0011) — keep them in step.
+_STATS_RECOUNT_SQL = """
+    SELECT 'total', '', COUNT(*) FROM jobs
+    UNION ALL
+    SELECT 'source', COALESCE(source, ''), COUNT(*) FROM jobs GROUP BY 2
+    UNION ALL
+    SELECT 'day', COALESCE(substr(created_at, 1, 10), ''), COUNT(*) FROM jobs GROUP BY 2
+    UNION ALL
+    SELECT 'company', COALESCE(CAST(company_id AS TEXT), ''), COUNT(*) FROM jobs GROUP BY 2
+    UNION ALL
+    SELECT 'flag', 'india', COUNT(*) FROM jobs WHERE is_india = 1
+    UNION ALL
+    SELECT 'flag', 'remote', COUNT(*) FROM jobs WHERE remote = 1
+    UNION ALL
+    SELECT 'flag', 'faang', COUNT(*) FROM jobs WHERE is_faang = 1
+    UNION ALL
+    SELECT 'flag', 'with_salary', COUNT(*) FROM jobs WHERE salary_min_lpa > 0
+    UNION ALL
+    SELECT 'dupes', '', COUNT(*) FROM (
+        SELECT 1 FROM jobs WHERE title_key IS NOT NULL
+        GROUP BY title_key, COALESCE(company_key, '') HAVING COUNT(*) > 1
+    )
+"""
+
+# dup_groups recount (migrations/0012_dup_groups.sql)
+_DUP_GROUPS_RECOUNT_SQL = """
+    SELECT title_key, COALESCE(company_key, ''), COUNT(*) FROM jobs
+    WHERE title_key IS NOT NULL GROUP BY 1, 2
+"""
+
+
+def verify_stats(conn: sqlite3.Connection) -> list[tuple[str, str, int, int]]:
+    """
+    Compare job_stats and dup_groups against a full recount.
+    Returns [(dim, key, stored, actual)] that differ; dup_groups rows are
+    reported as dim 'dup_group' with key 'title_key|company_key'.
+    """
+    stored = {(str(r[0]), str(r[1])): int(r[2]) for r in conn.execute("SELECT dim, key, cnt FROM job_stats")}
+    actual = {(str(r[0]), str(r[1])): int(r[2]) for r in conn.execute(_STATS_RECOUNT_SQL)}
+    for t, c, n in conn.execute("SELECT title_key, company_key, cnt FROM dup_groups"):
+        stored[("dup_group", f"{t}|{c}")] = int(n)
+    for t, c, n in conn.execute(_DUP_GROUPS_RECOUNT_SQL):
+        actual[("dup_group", f"{t}|{c}")] = int(n)
+    drift: list[tuple[str, str, int, int]] = []
+    for dim_key in sorted(stored.keys() | actual.keys()):
+        s = stored.get(dim_key, 0)
+        a = actual.get(dim_key, 0)
+        if s != a:
+            drift.append((dim_key[0], dim_key[1], s, a))
+    return drift
+
+
+def rebuild_stats(conn: sqlite3.Connection) -> None:
+    """Recompute job_stats and dup_groups from scratch. Caller commits."""
+    conn.execute("DELETE FROM job_stats")
+    conn.execute(f"INSERT INTO job_stats (dim, key, cnt) {_STATS_RECOUNT_SQL}")
+    conn.execute("DELETE FROM dup_groups")
+    conn.execute(f"INSERT INTO dup_groups (title_key, company_key, cnt) {_DUP_GROUPS_RECOUNT_SQL}")
+
+
+def prune_stats(conn: sqlite3.Connection) -> None:
+    """Drop counters that deletes have brought to zero (old days, gone companies)."""
+    conn.execute("DELETE FROM job_stats WHERE cnt <= 0 AND dim != 'total'")
+
+
+def read_stats(conn: sqlite3.Connection, today: str) -> dict:
+    """Headline stats from job_stats — a handful of primary-key lookups."""
+    total = 0
+    today_count = 0
+    by_source: dict[str, int] = {}
+    flags: dict[str, int] = {}
+    dupe_groups = 0
+    rows = conn.execute(
+        "SELECT dim, key, cnt FROM job_stats WHERE dim IN ('total', 'source', 'flag', 'dupes') OR (dim = 'day' AND key = ?)",
+        (today,),
+    ).fetchall()
+    for dim, key, cnt in rows:
+        if dim == "total":
+            total = int(cnt)
+        elif dim == "day":
+            today_count = int(cnt)
+        elif dim == "source" and cnt > 0:
+            by_source[str(key)] = int(cnt)
+        elif dim == "flag":
+            flags[str(key)] = int(cnt)
+        elif dim == "dupes":
+            dupe_groups = int(cnt)
     return {
         "total": total,
         "today": today_count,
-        "by_source": {str(r["source"]): int(r["cnt"]) for r in sources},
-        "india": india_count,
-        "remote": remote_count,
-        "with_salary": with_salary,
-        "faang": faang_count,
+        "by_source": by_source,
+        "india": flags.get("india", 0),
+        "remote": flags.get("remote", 0),
+        "with_salary": flags.get("with_salary", 0),
+        "faang": flags.get("faang", 0),
+        "dupe_groups": dupe_groups,
     }
+
+
+def get_stats() -> dict:
+    conn = get_connection()
+    stats = read_stats(conn, datetime.utcnow().date().isoformat())
+    conn.close()
+    return stats
@@ -0,0 +1,224 @@
+"""
+Dedup — near-duplicate clustering across sources.
+
+make_job_id() only merges exact title|company|location matches, so one
+opening scraped from Greenhouse, serp_greenhouse and JSearch can land as
+three rows ("Stripe" / "Stripe, Inc."; "Bangalore" / "Bengaluru, Karnataka,
+India"). Each job gets match keys on insert:
+
+  url_key       canonical apply URL (scheme/host/case, tracking params dropped)
+  company_key   company without case, punctuation or legal suffixes
+  location_key  city with common aliases folded ("bengaluru" -> "bangalore")
+  title_hash    64-bit SimHash over normalized title tokens
+  title_key     the normalized title tokens themselves (exact-duplicate groups, 0012)
+
+A job joins an existing cluster when its url_key matches, or when a job with
+the same company_key and a compatible location has a title_hash within
+MAX_HAMMING bits. Otherwise it starts its own cluster. cluster_id is the
+rowid of the oldest live member (triggers in migration 0010 keep that true
+across deletes), so the "collapsed" view is just cluster_id = rowid.
+
+Usage:
+  python daily_run.py --recluster   # recompute keys and clusters for every job
+"""
+import hashlib
+import re
+import sqlite3
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from location_parser import parse_location
+
+MAX_HAMMING = 3
+
+# Query parameters that only track where the click came from
+_TRACKING_PARAMS = {"source", "src", "ref", "referrer", "gh_src", "lever-source", "lever-origin", "utm_id"}
+
+_COMPANY_SUFFIXES = {
+    "inc", "incorporated", "llc", "ltd", "limited", "corp", "corporation", "co", "plc",
+    "gmbh", "pvt", "private", "pte", "llp", "sa", "ag", "bv", "the",
+}
+
+_CITY_ALIASES = {
+    "bengaluru": "bangalore", "gurugram": "gurgaon", "bombay": "mumbai", "new delhi": "delhi",
+    "calcutta": "kolkata", "madras": "chennai", "cochin": "kochi", "trivandrum": "thiruvananthapuram",
+    "nyc": "new york", "new york city": "new york", "sf": "san francisco",
+}
+
+_TITLE_ALIASES = {
+    "sr": "senior", "jr": "junior", "snr": "senior", "engg": "engineer", "eng": "engineer",
+    "dev": "developer", "mgr": "manager", "swe": "software engineer", "sde": "software engineer",
+    "ii": "2", "iii": "3", "iv": "4", "i": "1", "fullstack": "full stack", "frontend": "front end",
+    "backend": "back end",
+}
+
+_WORD_RE = re.compile(r"[a-z0-9]+")
+_MASK64 = (1 << 64) - 1
+
+
+def canonical_url(url: str) -> str:
+    if not url:
+        return ""
+    parts = urlsplit(url.strip())
+    host = parts.netloc.lower().removeprefix("www.")
+    if host == "job-boards.greenhouse.io":
+        host = "boards.greenhouse.io"
+    path = parts.path.rstrip("/")
+    if host == "jobs.lever.co":
+        path = path.removesuffix("/apply")
+    query = urlencode(sorted(
+        (k, v) for k, v in parse_qsl(parts.query)
+        if not k.lower().startswith("utm_") and k.lower() not in _TRACKING_PARAMS
+    ))
+    return urlunsplit(("https", host, path.lower(), query, ""))
+
+
+def company_key(name: str) -> str:
+    words = _WORD_RE.findall((name or "").lower().replace("&", " and "))
+    while words and words[-1] in _COMPANY_SUFFIXES:
+        words.pop()
+    while words and words[0] == "the":
+        words.pop(0)
+    return " ".join(words)
+
+
+def location_key(location: str) -> str:
+    parsed = parse_location(location or "")
+    city = parsed["city"].lower().strip()
+    city = _CITY_ALIASES.get(city, city)
+    if city:
+        return city
+    return "remote" if parsed["is_remote"] else ""
+
+
+def title_tokens(title: str) -> list[str]:
+    tokens: list[str] = []
+    for word in _WORD_RE.findall((title or "").lower()):
+        tokens.extend(_TITLE_ALIASES.get(word, word).split())
+    return tokens
+
+
+def simhash(tokens: list[str]) -> int:
+    """64-bit SimHash as a signed integer (fits an SQLite INTEGER)."""
+    weights = [0] * 64
+    for token in set(tokens):
+        h = int.from_bytes(hashlib.md5(token.encode()).digest()[:8], "big")
+        for bit in range(64):
+            weights[bit] += 1 if h >> bit & 1 else -1
+    value = sum(1 << bit for bit in range(64) if weights[bit] > 0)
+    return value - (1 << 64) if value >= 1 << 63 else value
+
+
+def hamming(a: int, b: int) -> int:
+    return ((a ^ b) & _MASK64).bit_count()
+
+
+def match_keys(job: dict) -> dict:
+    """Dedup columns for a job about to be inserted."""
+    tokens = title_tokens(job.get("title", ""))
+    return {
+        "url_key": canonical_url(job.get("apply_url", "")),
+        "company_key": company_key(job.get("company", "")),
+        "location_key": location_key(job.get("location", "")),
+        "title_hash": simhash(tokens),
+        "title_key": " ".join(tokens),
+    }
+
+
+def _compatible_locations(loc: str) -> list[str]:
+    # An unknown or remote location can match any variant of the same company
+    return [loc, "", "remote"] if loc not in ("", "remote") else []
+
+
+def find_cluster(conn: sqlite3.Connection, keys: dict) -> int | None:
+    """cluster_id of an existing near-duplicate, or None."""
+    if keys["url_key"]:
+        row = conn.execute(
+            "SELECT cluster_id FROM jobs WHERE url_key = ? AND cluster_id IS NOT NULL LIMIT 1",
+            (keys["url_key"],),
+        ).fetchone()
+        if row:
+            return int(row[0])
+    if not keys["company_key"]:
+        return None
+    locations = _compatible_locations(keys["location_key"])
+    sql = "SELECT cluster_id, title_hash FROM jobs WHERE company_key = ? AND cluster_id IS NOT NULL"
+    params: list = [keys["company_key"]]
+    if locations:
+        sql += " AND location_key IN (?, ?, ?)"
+        params += locations
+    for cluster_id, title_hash in conn.execute(sql, params):
+        if title_hash is not None and hamming(title_hash, keys["title_hash"]) <= MAX_HAMMING:
+            return int(cluster_id)
+    return None
+
+
+def recluster(conn: sqlite3.Connection) -> tuple[int, int]:
+    """
+    Recompute match keys and clusters for every job, oldest first.
+    Returns (jobs, clusters). Caller commits.
+    """
+    rows = conn.execute("SELECT rowid, title, company, location, apply_url FROM jobs ORDER BY rowid").fetchall()
+    by_url: dict[str, int] = {}
+    by_company: dict[str, list[tuple[str, int, int]]] = {}
+    updates = []
+    clusters = 0
+    for rowid, title, company, location, apply_url in rows:
+        keys = match_keys({"title": title, "company": company, "location": location, "apply_url": apply_url})
+        cluster_id = by_url.get(keys["url_key"]) if keys["url_key"] else None
+        if cluster_id is None and keys["company_key"]:
+            locations = _compatible_locations(keys["location_key"])
+            for loc, title_hash, cid in by_company.get(keys["company_key"], []):
+                if (not locations or loc in locations) and hamming(title_hash, keys["title_hash"]) <= MAX_HAMMING:
+                    cluster_id = cid
+                    break
+        if cluster_id is None:
+            cluster_id = rowid
+            clusters += 1
+        if keys["url_key"]:
+            by_url.setdefault(keys["url_key"], cluster_id)
+        by_company.setdefault(keys["company_key"], []).append((keys["location_key"], keys["title_hash"], cluster_id))
+        updates.append((
+            keys["url_key"], keys["company_key"], keys["location_key"], keys["title_hash"], keys["title_key"],
+            cluster_id, rowid,
+        ))
+    conn.executemany(
+        """UPDATE jobs SET url_key = ?, company_key = ?, location_key = ?, title_hash = ?, title_key = ?,
+               cluster_id = ? WHERE rowid = ?""",
+        updates,
+    )
+    return len(rows), clusters
+
+
+def repair_cluster_heads(conn: sqlite3.Connection) -> int:
+    """
+    Point every cluster back at its lowest rowid, in case a VACUUM renumbered
+    rows. A no-op when clusters are consistent. Returns rows changed; caller commits.
+    """
+    return conn.execute(
+        """UPDATE jobs SET cluster_id = h.head
+           FROM (SELECT cluster_id AS old, MIN(rowid) AS head FROM jobs
+                 WHERE cluster_id IS NOT NULL GROUP BY cluster_id HAVING head != old) AS h
+           WHERE jobs.cluster_id = h.old"""
+    ).rowcount
+
+
+if __name__ == "__main__":
+    # Quick check of the normalizers and the SimHash threshold
+    checks = [
+        ("company", company_key, "Stripe", "Stripe, Inc."),
+        ("company", company_key, "The Trade Desk", "Trade Desk"),
+        ("location", location_key, "Bangalore", "Bengaluru, Karnataka, India"),
+        ("url", canonical_url, "https://boards.greenhouse.io/stripe/jobs/123?gh_src=abc&utm_source=x",
+         "https://job-boards.greenhouse.io/stripe/jobs/123/"),
+    ]
+    for kind, fn, a, b in checks:
+        print(f"  {kind:8s} {fn(a) == fn(b)!s:5s} {a!r} vs {b!r} -> {fn(a)!r}")
+    titles = [
+        ("Sr. Software Engineer II", "Senior Software Engineer 2", True),
+        ("Software Engineer, Backend", "Backend Software Engineer", True),
+        ("Senior Software Engineer", "Staff Software Engineer", False),
+    ]
+    for a, b, expected in titles:
+        d = hamming(simhash(title_tokens(a)), simhash(title_tokens(b)))
+        ok = (d <= MAX_HAMMING) == expected
+        print(f"  title    {ok!s:5s} {a!r} vs {b!r} (hamming {d})")
@@ -0,0 +1,233 @@
+"""
+Jobs Export — streams the jobs table into compact files for analytics.
+
+Rows are read in rowid order, CHUNK_ROWS at a time, and appended to one file
+per posted date per run:
+
+  data/export/posted_date=2026-10-18/part-00003.parquet   (pyarrow installed)
+  data/export/posted_date=2026-10-18/part-00003.jsonl.gz  (fallback)
+
+data/export/manifest.json lists every file with its columns and the highest
+exported rowid, so the next run only exports rows inserted since. A column
+added to jobs starts appearing in that run's files; a dropped or retyped
+column stops the export until --full.
+
+jobs has no AUTOINCREMENT, so rowids only grow while the highest row stays.
+The manifest records that row's id: if it was deleted, rows inserted since
+may have reused rowids at or below the high water mark, and those with a
+created_at (set at insert) after the newest exported row are exported too.
+A full VACUUM of jobs.db renumbers rowids — re-export with --full after one.
+
+Usage:
+  python daily_run.py --export          # export new rows since the last export
+  python daily_run.py --export --full   # discard the export and write everything again
+"""
+import gzip
+import json
+import os
+import shutil
+import sqlite3
+import time
+from datetime import datetime
+
+from config import DATA_DIR
+from db import get_connection
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
+EXPORT_DIR = DATA_DIR / "export"
+MANIFEST_FILE = EXPORT_DIR / "manifest.json"
+CHUNK_ROWS = 5000
+
+_ARROW_TYPES = {"INTEGER": "int64", "REAL": "float64"}
+
+
+def read_manifest() -> dict | None:
+    try:
+        with open(MANIFEST_FILE, "r") as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+
+def _write_manifest(manifest: dict) -> None:
+    tmp = MANIFEST_FILE.with_suffix(".json.tmp")
+    with open(tmp, "w") as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp, MANIFEST_FILE)
+
+
+def _columns(conn: sqlite3.Connection) -> list[tuple[str, str]]:
+    """[(name, declared type)] for jobs, including generated columns."""
+    rows = conn.execute("PRAGMA table_xinfo(jobs)").fetchall()
+    return [(str(r[1]), str(r[2]).upper()) for r in rows if r[6] in (0, 2, 3)]
+
+
+class _PartitionWriter:
+    """One open output file per posted-date partition for the current run."""
+
+    def __init__(self, fmt: str, columns: list[tuple[str, str]], run: int):
+        self.fmt = fmt
+        self.run = run
+        self.names = [name for name, _ in columns]
+        self.files: dict[str, dict] = {}
+        if fmt == "parquet":
+            self.schema = pa.schema([(name, _ARROW_TYPES.get(decl, "string")) for name, decl in columns])
+
+    def _open(self, partition: str) -> dict:
+        ext = "parquet" if self.fmt == "parquet" else "jsonl.gz"
+        rel = f"posted_date={partition}/part-{self.run:05d}.{ext}"
+        tmp = EXPORT_DIR / f"{rel}.tmp"
+        tmp.parent.mkdir(parents=True, exist_ok=True)
+        if self.fmt == "parquet":
+            handle = pq.ParquetWriter(str(tmp), self.schema, compression="zstd")
+        else:
+            handle = gzip.open(tmp, "wt", encoding="utf-8")
+        entry = {"path": rel, "tmp": tmp, "handle": handle, "rows": 0}
+        self.files[partition] = entry
+        return entry
+
+    def write(self, partition: str, rows: list[tuple]) -> None:
+        entry = self.files.get(partition) or self._open(partition)
+        if self.fmt == "parquet":
+            columns = list(zip(*rows))
+            arrays = [pa.array(list(col), type=self.schema.field(i).type) for i, col in enumerate(columns)]
+            entry["handle"].write_table(pa.Table.from_arrays(arrays, schema=self.schema))
+        else:
+            for row in rows:
+                entry["handle"].write(json.dumps(dict(zip(self.names, row)), ensure_ascii=False) + "\n")
+        entry["rows"] += len(rows)
+
+    def close(self) -> list[dict]:
+        written: list[dict] = []
+        for entry in self.files.values():
+            entry["handle"].close()
+            os.replace(entry["tmp"], EXPORT_DIR / entry["path"])
+            written.append({"path": entry["path"], "rows": entry["rows"], "run": self.run, "columns": self.names})
+        return written
+
+
+def _schema_change(previous: list[list[str]], columns: list[tuple[str, str]]) -> str | None:
+    """Why rows can't be appended under the new columns, or None. Added columns are fine."""
+    types = dict(columns)
+    dropped = [name for name, _ in previous if name not in types]
+    retyped = [name for name, decl in previous if name in types and decl and types[name] != decl]
+    if dropped or retyped:
+        return "jobs columns " + ", ".join(
+            [f"{n} dropped" for n in dropped] + [f"{n} retyped to {types[n] or 'none'}" for n in retyped]
+        )
+    return None
+
+
+def _export_rows(conn: sqlite3.Connection, writer: _PartitionWriter, after: int,
+                 upto: int | None = None, since: str = "") -> tuple[int, int, str]:
+    """Write rows with rowid > after, or only those <= upto created after since.
+
+    Returns (rows, last rowid, newest created_at).
+    """
+    select = ", ".join(f'"{name}"' for name in writer.names)
+    posted_idx = writer.names.index("posted_date")
+    created_idx = writer.names.index("created_at")
+    where, params = "rowid > ?", [after]
+    if upto is not None:
+        where += " AND rowid <= ? AND created_at > ?"
+        params += [upto, since]
+    exported, newest = 0, ""
+    while True:
+        chunk = conn.execute(
+            f"SELECT rowid, {select} FROM jobs WHERE {where} ORDER BY rowid LIMIT ?",
+            (*params, CHUNK_ROWS),
+        ).fetchall()
+        if not chunk:
+            break
+        params[0] = chunk[-1][0]
+        by_partition: dict[str, list[tuple]] = {}
+        for row in chunk:
+            values = tuple(row)[1:]
+            partition = (values[posted_idx] or "")[:10] or "unknown"
+            by_partition.setdefault(partition, []).append(values)
+            newest = max(newest, values[created_idx] or "")
+        for partition, rows in by_partition.items():
+            writer.write(partition, rows)
+        exported += len(chunk)
+    return exported, params[0], newest
+
+
+def export_jobs(full: bool = False) -> dict:
+    """Export rows added since the last export (or everything). Returns the manifest."""
+    start = time.time()
+    manifest = None if full else read_manifest()
+    if full and EXPORT_DIR.exists():
+        shutil.rmtree(EXPORT_DIR)
+    EXPORT_DIR.mkdir(parents=True, exist_ok=True)
+    for stale in EXPORT_DIR.rglob("*.tmp"):
+        stale.unlink()  # left behind by an interrupted run
+
+    conn = get_connection()
+    columns = _columns(conn)
+    if manifest is None:
+        manifest = {
+            "format": "parquet" if pa is not None else "jsonl.gz",
+            "high_water_rowid": 0,
+            "high_water_id": None,
+            "high_water_created_at": "",
+            "rows": 0,
+            "columns": [],
+            "files": [],
+            "runs": [],
+        }
+    if manifest["format"] == "parquet" and pa is None:
+        raise RuntimeError("Export was started as Parquet but pyarrow is not installed (use --full to restart)")
+    # Manifests written before per-column types were recorded list bare names
+    previous = [c if isinstance(c, list) else [c, ""] for c in manifest["columns"]]
+    change = _schema_change(previous, columns)
+    if change:
+        raise RuntimeError(f"{change} since the last export (use --full to restart)")
+
+    run = len(manifest["runs"]) + 1
+    writer = _PartitionWriter(manifest["format"], columns, run)
+    high_water = manifest["high_water_rowid"]
+    since = manifest.get("high_water_created_at", "")
+
+    conn.execute("BEGIN")  # one read snapshot across all chunks
+    reused = 0
+    row = conn.execute("SELECT id FROM jobs WHERE rowid = ?", (high_water,)).fetchone()
+    if manifest.get("high_water_id") and (row is None or row[0] != manifest["high_water_id"]):
+        reused, _, newest = _export_rows(conn, writer, 0, upto=high_water, since=since)
+        since = max(since, newest)
+    exported, last_rowid, newest = _export_rows(conn, writer, high_water)
+    since = max(since, newest)
+    # Highest surviving row at or below the mark, so a deleted tail lowers it
+    top = conn.execute(
+        "SELECT rowid, id FROM jobs WHERE rowid <= ? ORDER BY rowid DESC LIMIT 1", (last_rowid,)
+    ).fetchone()
+    conn.rollback()
+    conn.close()
+
+    written = writer.close()
+    manifest["files"].extend(written)
+    manifest["columns"] = [[name, decl] for name, decl in columns]
+    manifest["high_water_rowid"], manifest["high_water_id"] = (top[0], top[1]) if top else (0, None)
+    manifest["high_water_created_at"] = since
+    manifest["rows"] += exported + reused
+    manifest["runs"].append({
+        "run": run,
+        "exported_at": datetime.utcnow().isoformat() + "Z",
+        "rows": exported + reused,
+        "from_rowid": high_water + 1 if exported else None,
+        "to_rowid": last_rowid if exported else None,
+        "reused_rowids": reused,
+        "files": len(written),
+    })
+    _write_manifest(manifest)
+
+    print(f"[EXPORT] {exported + reused} new rows -> {len(written)} {manifest['format']} files "
+          f"({manifest['rows']} rows total) in {time.time() - start:.1f}s", flush=True)
+    if reused:
+        print(f"[EXPORT] {reused} of them reused rowids at or below the previous high water mark", flush=True)
+    return manifest
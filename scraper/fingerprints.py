@@ -0,0 +1,161 @@
+"""
+Board Fingerprints — skip the postings a board already served.
+
+Board APIs (Greenhouse, Lever, Ashby) return the whole board on every
+request, and most of it is the same as yesterday. Each posting gets a
+native id and a version (Greenhouse updated_at; a hash of the fields the
+extractor reads for Lever and Ashby); the board's fingerprint is a hash of
+the sorted (id, version) pairs plus RULES, a hash of the scoring config.
+
+  same fingerprint  -> nothing is extracted, scored, enriched or inserted
+  otherwise         -> only added / changed postings are extracted;
+                       removed ones are forgotten
+
+The new state and a board_diffs row are written by the pipeline writer in
+the transaction that commits the board's jobs. Editing the keywords or
+scoring changes RULES, so every posting is re-extracted once; bump
+EXTRACT_VERSION when an extractor changes what it produces.
+"""
+import hashlib
+import json
+import sqlite3
+from datetime import datetime
+
+from config import INCLUDE_KEYWORDS, EXCLUDE_KEYWORDS, SCORING, FAANG_COMPANIES
+
+EXTRACT_VERSION = 2  # 2: location_parser output changed (parser benchmark oracles)
+
+
+def _digest(text: str) -> str:
+    return hashlib.blake2b(text.encode(), digest_size=10).hexdigest()
+
+
+RULES = _digest(json.dumps(
+    [EXTRACT_VERSION, INCLUDE_KEYWORDS, EXCLUDE_KEYWORDS, SCORING, sorted(FAANG_COMPANIES)],
+    sort_keys=True, default=list,
+))
+
+
+def content_version(item: dict, *fields: str) -> str:
+    """Version for APIs without a reliable updated_at: a hash of the given fields."""
+    return _digest(json.dumps([item.get(f) for f in fields], sort_keys=True, default=str))
+
+
+def board_fingerprint(postings: dict[str, str]) -> str:
+    return _digest("\n".join(f"{pid}\x1f{ver}" for pid, ver in sorted(postings.items())))
+
+
+class BoardDiff:
+    """What changed on one board since it was last seen."""
+
+    def __init__(self, board: str, fingerprint: str, postings: dict[str, str], stored: dict[str, str] | None) -> None:
+        self.board = board
+        self.fingerprint = fingerprint
+        self.postings = postings
+        self.job_ids: dict[str, str | None] = {}   # posting id -> job id, for extracted postings
+        self.failed: set[str] = set()               # posting ids whose extract raised
+        if stored is None:                          # fingerprint matched
+            self.added, self.changed, self.removed = [], [], []
+        else:
+            self.added = [p for p in postings if p not in stored]
+            self.changed = [p for p in postings if p in stored and stored[p] != postings[p]]
+            self.removed = [p for p in stored if p not in postings]
+        self.unchanged = len(postings) - len(self.added) - len(self.changed)
+
+    @property
+    def todo(self) -> set[str]:
+        """Posting ids that need extracting."""
+        return {*self.added, *self.changed}
+
+
+class BoardIndex:
+    """Stored fingerprints for one source, read once per run."""
+
+    def __init__(self, conn: sqlite3.Connection, source: str) -> None:
+        self.conn = conn
+        self.source = source
+        self.state = {
+            str(board): (fp, str(rules)) for board, fp, rules in conn.execute(
+                "SELECT board, fingerprint, rules FROM board_state WHERE source = ?", (source,)
+            )
+        }
+
+    def diff(self, board: str, postings: dict[str, str]) -> BoardDiff:
+        fingerprint = board_fingerprint(postings)
+        stored_fp, rules = self.state.get(board, (None, RULES))
+        if stored_fp == fingerprint and rules == RULES:
+            return BoardDiff(board, fingerprint, postings, None)
+        stored = {
+            str(pid): str(ver) for pid, ver in self.conn.execute(
+                "SELECT posting_id, version FROM board_postings WHERE source = ? AND board = ?",
+                (self.source, board),
+            )
+        }
+        diff = BoardDiff(board, fingerprint, postings, stored)
+        if rules != RULES:
+            # Scoring rules changed since the last visit: re-extract everything kept
+            diff.changed = [p for p in postings if p in stored]
+            diff.unchanged = 0
+        return diff
+
+
+def record_boards(conn: sqlite3.Connection, run_id: int | None, source: str, diffs: list[BoardDiff]) -> None:
+    """
+    Store new board state, postings and diffs. Caller commits with the jobs.
+
+    Postings whose extract raised are forgotten and the board's fingerprint
+    cleared, so the next run sees them as added and extracts them again.
+    """
+    now = datetime.utcnow().isoformat()
+    for d in diffs:
+        if d.added or d.changed:
+            conn.executemany(
+                """INSERT OR REPLACE INTO board_postings (source, board, posting_id, version, job_id)
+                   VALUES (?, ?, ?, ?, ?)""",
+                [(source, d.board, p, d.postings[p], d.job_ids.get(p)) for p in d.todo - d.failed],
+            )
+        if d.removed or d.failed:
+            conn.executemany(
+                "DELETE FROM board_postings WHERE source = ? AND board = ? AND posting_id = ?",
+                [(source, d.board, p) for p in [*d.removed, *d.failed]],
+            )
+        changed = bool(d.added or d.changed or d.removed)
+        conn.execute(
+            """INSERT INTO board_state (source, board, fingerprint, rules, postings, checked_at, changed_at)
+               VALUES (?, ?, ?, ?, ?, ?, ?)
+               ON CONFLICT (source, board) DO UPDATE SET
+                   fingerprint = excluded.fingerprint, rules = excluded.rules,
+                   postings = excluded.postings, checked_at = excluded.checked_at,
+                   changed_at = CASE WHEN ? THEN excluded.changed_at ELSE changed_at END""",
+            (source, d.board, None if d.failed else d.fingerprint, RULES, len(d.postings), now, now, changed),
+        )
+        if run_id is not None:
+            conn.execute(
+                """INSERT OR REPLACE INTO board_diffs (run_id, source, board, added, changed, removed, unchanged)
+                   VALUES (?, ?, ?, ?, ?, ?, ?)""",
+                (run_id, source, d.board, len(d.added), len(d.changed), len(d.removed), d.unchanged),
+            )
+
+
+if __name__ == "__main__":
+    # Diff a board against itself after one add, one edit and one removal
+    from schema import migrate
+
+    conn = sqlite3.connect(":memory:")
+    migrate(conn)
+    v1 = {"1": "2026-01-01", "2": "2026-01-01", "3": "2026-01-02"}
+    index = BoardIndex(conn, "greenhouse")
+    first = index.diff("acme", v1)
+    record_boards(conn, None, "greenhouse", [first])
+    print(f"  first visit:  added={len(first.added)} unchanged={first.unchanged}")
+
+    index = BoardIndex(conn, "greenhouse")
+    same = index.diff("acme", dict(v1))
+    print(f"  same board:   todo={len(same.todo)} unchanged={same.unchanged} (fingerprint hit)")
+
+    v2 = {"1": "2026-01-01", "2": "2026-02-01", "4": "2026-02-01"}
+    later = index.diff("acme", v2)
+    record_boards(conn, None, "greenhouse", [later])
+    print(f"  churned:      added={later.added} changed={later.changed} removed={later.removed} "
+          f"unchanged={later.unchanged}")
+    print(f"  stored ids:   {[r[0] for r in conn.execute('SELECT posting_id FROM board_postings ORDER BY 1')]}")
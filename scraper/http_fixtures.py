@@ -0,0 +1,164 @@
+"""
+HTTP Fixtures — record live API responses once, replay them offline.
+
+  HTTP_FIXTURES=record python daily_run.py --scrape   # live run, saving every response
+  HTTP_FIXTURES=replay python daily_run.py --scrape   # same run, no network
+
+pipeline.make_client() installs RecordingTransport or ReplayTransport on
+the shared httpx client; recording still goes through any proxy set in the
+environment. Each response is stored as one gzipped JSON file
+(method, URL, status, headers, body, latency) under
+HTTP_FIXTURES_DIR/<host>/<key>.json.gz, keyed by method + URL with query
+parameters sorted. API credentials (SerpAPI api_key, Adzuna app_id /
+app_key; request headers such as the RapidAPI key) are never stored and
+are not part of the key, so a replay works with any key values.
+
+Replay serves the stored response, sleeping HTTP_REPLAY_LATENCY x the
+recorded latency (0 by default), and raises a TransportError for a request
+that was never recorded. Polite delays and side-effecting finish hooks
+(SerpAPI discovery rewriting companies.json) are skipped while replaying.
+
+Usage:
+  python http_fixtures.py [dir]   # summarise a fixture store
+"""
+import gzip
+import hashlib
+import json
+import time
+from pathlib import Path
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import httpx
+
+# Query parameters that carry credentials (request headers are never stored)
+SECRET_PARAMS = {"api_key", "app_id", "app_key", "key", "token"}
+# Response headers that no longer apply once the body is stored decoded
+_DROP_HEADERS = {"content-encoding", "content-length", "transfer-encoding", "set-cookie", "connection"}
+
+
+def fixture_url(url: httpx.URL | str) -> str:
+    """The URL with credentials removed and query parameters sorted."""
+    parts = urlsplit(str(url))
+    query = sorted((k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True) if k not in SECRET_PARAMS)
+    return urlunsplit((parts.scheme, parts.netloc, parts.path, urlencode(query), ""))
+
+
+class FixtureStore:
+    """A directory of gzipped responses, one file per request key."""
+
+    def __init__(self, root: Path | str) -> None:
+        self.root = Path(root)
+
+    def path(self, method: str, url: httpx.URL | str) -> Path:
+        clean = fixture_url(url)
+        key = hashlib.sha1(f"{method.upper()} {clean}".encode()).hexdigest()[:20]
+        return self.root / (urlsplit(clean).hostname or "_") / f"{key}.json.gz"
+
+    def save(self, request: httpx.Request, response: httpx.Response, latency: float) -> None:
+        body = response.content
+        try:
+            payload = {"body": body.decode("utf-8")}
+        except UnicodeDecodeError:
+            payload = {"body_hex": body.hex()}
+        record = {
+            "method": request.method,
+            "url": fixture_url(request.url),
+            "status": response.status_code,
+            "headers": [[k, v] for k, v in response.headers.items() if k.lower() not in _DROP_HEADERS],
+            "latency": round(latency, 4),
+            **payload,
+        }
+        path = self.path(request.method, request.url)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".tmp")
+        with gzip.open(tmp, "wt", encoding="utf-8") as f:
+            json.dump(record, f)
+        tmp.replace(path)
+
+    def load(self, method: str, url: httpx.URL | str) -> dict | None:
+        path = self.path(method, url)
+        if not path.exists():
+            return None
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            return json.load(f)
+
+
+def _response(request: httpx.Request, status: int, headers, content: bytes) -> httpx.Response:
+    headers = [(k, v) for k, v in headers if k.lower() not in _DROP_HEADERS]
+    return httpx.Response(status, headers=headers, content=content, request=request)
+
+
+class RecordingTransport(httpx.BaseTransport):
+    """Sends requests through a plain live client and stores every response.
+
+    httpx ignores HTTP(S)_PROXY / NO_PROXY for a client given a transport,
+    so the live side is a default client, which still honours them.
+    """
+
+    def __init__(self, store: FixtureStore, live: httpx.Client | None = None) -> None:
+        self.store = store
+        self.live = live or httpx.Client()
+        self.recorded = 0
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        start = time.perf_counter()
+        response = self.live.send(request)  # one hop: the outer client follows redirects
+        latency = time.perf_counter() - start
+        replayed = _response(request, response.status_code, response.headers.multi_items(), response.content)
+        self.store.save(request, replayed, latency)
+        self.recorded += 1
+        return replayed
+
+    def close(self) -> None:
+        self.live.close()
+
+
+class ReplayTransport(httpx.BaseTransport):
+    """Serves stored responses; latency_scale x recorded latency is slept first."""
+
+    def __init__(self, store: FixtureStore, latency_scale: float = 0.0) -> None:
+        self.store = store
+        self.latency_scale = latency_scale
+        self.hits = 0
+        self.misses = 0
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        record = self.store.load(request.method, request.url)
+        if record is None:
+            self.misses += 1
+            raise httpx.TransportError(f"no fixture for {request.method} {fixture_url(request.url)}", request=request)
+        self.hits += 1
+        if self.latency_scale > 0:
+            time.sleep(record["latency"] * self.latency_scale)
+        content = record["body"].encode("utf-8") if "body" in record else bytes.fromhex(record["body_hex"])
+        return _response(request, record["status"], record["headers"], content)
+
+
+def fixture_transport(mode: str, root: Path | str, latency_scale: float = 0.0) -> httpx.BaseTransport | None:
+    """Transport for HTTP_FIXTURES=record|replay, or None for a plain live client."""
+    if mode == "record":
+        return RecordingTransport(FixtureStore(root))
+    if mode == "replay":
+        return ReplayTransport(FixtureStore(root), latency_scale)
+    return None
+
+
+if __name__ == "__main__":
+    import sys
+    from config import HTTP_FIXTURES_DIR
+
+    root = Path(sys.argv[1]) if len(sys.argv) > 1 else HTTP_FIXTURES_DIR
+    hosts: dict[str, list] = {}
+    for path in sorted(root.glob("*/*.json.gz")):
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            rec = json.load(f)
+        size = len(rec.get("body", "")) or len(rec.get("body_hex", "")) // 2
+        h = hosts.setdefault(path.parent.name, [0, 0, 0, 0.0])
+        h[0] += 1
+        h[1] += size
+        h[2] += path.stat().st_size
+        h[3] += rec["latency"]
+    print(f"[FIXTURES] {root}")
+    for host, (n, raw, stored, latency) in sorted(hosts.items()):
+        print(f"  {host:36s} {n:5d} responses {raw / 1e6:8.2f} MB -> {stored / 1e6:7.2f} MB gz "
+              f"{latency:7.1f}s recorded")
@@ -0,0 +1,266 @@
+"""
+Index Advisor — replays recorded job listing queries through EXPLAIN QUERY PLAN.
+
+Flags full table scans, temp B-tree sorts and range scans constrained only
+by the score floor (for the listing and the COUNT of each shape), proposes
+composite / partial indexes matched to each query's ORDER BY and flag
+filters, and measures list and count latency before and after on a scratch
+copy of the database.
+
+Usage:
+  python index_advisor.py                      # analyze a copy of data/jobs.db
+  python index_advisor.py --synthetic 50000    # analyze a generated database
+  python index_advisor.py --write              # also write the proposal as a migration
+"""
+import argparse
+import json
+import random
+import re
+import sqlite3
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from config import DB_PATH
+from db import build_job_filters, insert_job, job_order_by, make_job_id, sort_mode, SORT_KEYS
+from schema import MIGRATIONS_DIR, latest_version, migrate
+
+SHAPES_FILE = Path(__file__).resolve().parent / "query_shapes.json"
+PER_PAGE = 30
+TIMING_RUNS = 7
+# A shape is flagged as regressed only when it is both this much slower and
+# slower by at least REGRESS_MIN_MS, so timer noise on sub-millisecond
+# queries does not trip it
+REGRESS_RATIO = 1.2
+REGRESS_MIN_MS = 0.5
+
+# Equality flags that are selective enough to deserve a partial index
+_PARTIAL_FLAGS = ["is_india", "is_faang", "remote", "visa_sponsored", "has_equity"]
+
+
+def load_shapes() -> list[dict]:
+    with open(SHAPES_FILE, "r") as f:
+        return json.load(f)
+
+
+def shape_queries(shape: dict) -> tuple[str, str, list]:
+    """Return (list_sql, count_sql, params) for a recorded shape."""
+    params = shape.get("params", {})
+    where, args = build_job_filters(**params)
+    order_by = job_order_by(shape.get("sort_by"), params.get("smart_view", False))
+    offset = (shape.get("page", 1) - 1) * PER_PAGE
+    list_sql = f"SELECT * FROM jobs {where} {order_by} LIMIT {PER_PAGE} OFFSET {offset}"
+    count_sql = f"SELECT COUNT(*) FROM jobs {where}"
+    return list_sql, count_sql, args
+
+
+def explain(conn: sqlite3.Connection, sql: str, args: list) -> list[str]:
+    return [str(r[3]) for r in conn.execute(f"EXPLAIN QUERY PLAN {sql}", args).fetchall()]
+
+
+# An index range whose only constraint is the score floor walks (nearly) the
+# whole table and fetches every row, which is slower than a plain scan
+_SCORE_ONLY_RE = re.compile(r"SEARCH jobs USING INDEX \w+ \(match_score>\?\)$")
+
+
+def plan_issues(plan: list[str]) -> list[str]:
+    issues: list[str] = []
+    for step in plan:
+        if re.match(r"SCAN jobs\b", step) and "INDEX" not in step:
+            issues.append("full scan")
+        if _SCORE_ONLY_RE.match(step):
+            issues.append("score-only range")
+        if "USE TEMP B-TREE" in step:
+            issues.append("temp b-tree sort")
+    return issues
+
+
+def plan_indexes(plan: list[str]) -> set[str]:
+    found: set[str] = set()
+    for step in plan:
+        m = re.search(r"INDEX (\w+)", step)
+        if m:
+            found.add(m.group(1))
+    return found
+
+
+def time_query(conn: sqlite3.Connection, sql: str, args: list) -> float:
+    """Median wall time in milliseconds."""
+    samples: list[float] = []
+    for _ in range(TIMING_RUNS):
+        start = time.perf_counter()
+        conn.execute(sql, args).fetchall()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def propose_index(shape: dict) -> tuple[str, str] | None:
+    """Derive (name, DDL) for an index serving this shape's ORDER BY + flags."""
+    params = shape.get("params", {})
+    sort_by = sort_mode(shape.get("sort_by"), params.get("smart_view", False))
+    keys = SORT_KEYS[sort_by]
+    terms = ", ".join(f"{k} DESC" for k in keys)
+    where, _ = build_job_filters(**params)
+    flag = next((f for f in _PARTIAL_FLAGS if f"{f} = 1" in where), None)
+
+    name = f"idx_jobs_sort_{sort_by or 'recent'}"
+    ddl = f"CREATE INDEX IF NOT EXISTS {{name}} ON jobs({terms})"
+    if flag:
+        name += f"_{flag.replace('is_', '')}"
+        ddl += f" WHERE {flag} = 1"
+    return name, ddl.format(name=name)
+
+
+def build_synthetic(path: Path, rows: int) -> None:
+    """
+    Fill an empty database with plausibly-distributed fake jobs. Rows go
+    through insert_job so source_id, company_id, the match keys and every
+    trigger-maintained table are filled as they are for scraped jobs.
+    """
+    conn = sqlite3.connect(str(path))
+    migrate(conn)
+    rng = random.Random(42)
+    now = datetime.utcnow()
+    sources = ["greenhouse"] * 35 + ["lever"] * 20 + ["ashby"] * 10 + ["jsearch"] * 15 + \
+        ["adzuna"] * 8 + ["remoteok"] * 4 + ["serp_greenhouse"] * 4 + ["serp_lever"] * 2 + ["serp"] * 2
+    countries = ["IN"] * 35 + ["US"] * 40 + ["GB"] * 8 + ["DE"] * 4 + [""] * 13
+    cities = {"IN": ["Bengaluru", "Hyderabad", "Pune"], "US": ["San Francisco, CA", "New York, NY"],
+              "GB": ["London"], "DE": ["Berlin"], "": ["Remote"]}
+    titles = ["Software Engineer", "Senior Software Engineer", "Frontend Engineer", "Backend Engineer",
+              "Full-Stack Developer", "SDE-2", "React Developer", "Data Engineer", "SRE", "Staff Engineer"]
+    named = ["Stripe", "Razorpay", "Google", "Atlassian", "Cockroach Labs"]
+    backdated = []
+    for i in range(rows):
+        country = rng.choice(countries)
+        created = now - timedelta(days=rng.uniform(0, 30))
+        posted = created - timedelta(days=rng.uniform(0, 15))
+        has_salary = rng.random() < 0.25
+        sal_min = round(rng.uniform(5, 80), 2) if has_salary else None
+        company = rng.choice(named) if rng.random() < 0.05 else f"Company {rng.randint(1, 1500)}"
+        job = {
+            "title": f"{rng.choice(titles)} (R{i})", "company": company,
+            "location": rng.choice(cities[country]), "remote": rng.random() < 0.3,
+            "apply_url": f"https://example.com/{i}", "source": rng.choice(sources),
+            "posted_date": posted.date().isoformat(),
+            "match_score": rng.choice([40, 50, 55, 65, 70, 75, 85, 90, 100]), "country": country,
+            "is_india": country == "IN", "is_faang": rng.random() < 0.15, "salary_min_lpa": sal_min,
+            "salary_max_lpa": sal_min and sal_min * 1.4, "visa_sponsored": rng.random() < 0.05,
+            "has_equity": rng.random() < 0.1,
+        }
+        if insert_job(conn, job):
+            backdated.append((created.isoformat(), make_job_id(job["title"], company, job["location"])))
+    # insert_job stamps created_at with the current time; spread it over 30 days
+    conn.executemany("UPDATE jobs SET created_at = ? WHERE id = ?", backdated)
+    conn.commit()
+    conn.close()
+
+
+def snapshot(conn: sqlite3.Connection, shapes: list[dict]) -> dict[str, dict]:
+    results: dict[str, dict] = {}
+    for shape in shapes:
+        list_sql, count_sql, args = shape_queries(shape)
+        plan = explain(conn, list_sql, args)
+        count_plan = explain(conn, count_sql, args)
+        results[shape["name"]] = {
+            "issues": plan_issues(plan) + [f"count {i}" for i in plan_issues(count_plan)],
+            "indexes": plan_indexes(plan) | plan_indexes(count_plan),
+            "list_ms": time_query(conn, list_sql, args),
+            "count_ms": time_query(conn, count_sql, args),
+        }
+    return results
+
+
+def _regressed(before_ms: float, after_ms: float) -> bool:
+    return after_ms > before_ms * REGRESS_RATIO and after_ms - before_ms >= REGRESS_MIN_MS
+
+
+def existing_indexes(conn: sqlite3.Connection) -> set[str]:
+    rows = conn.execute(
+        "SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = 'jobs' AND sql IS NOT NULL"
+    ).fetchall()
+    return {str(r[0]) for r in rows}
+
+
+def run_advisor(source_db: Path | None, synthetic: int, write: bool) -> None:
+    shapes = load_shapes()
+    with tempfile.TemporaryDirectory() as tmp:
+        scratch = Path(tmp) / "scratch.db"
+        if synthetic:
+            print(f"[ADVISOR] Generating {synthetic} synthetic jobs...", flush=True)
+            build_synthetic(scratch, synthetic)
+        else:
+            print(f"[ADVISOR] Copying {source_db} to scratch...", flush=True)
+            src = sqlite3.connect(str(source_db))
+            dst = sqlite3.connect(str(scratch))
+            src.backup(dst)
+            src.close()
+            dst.close()
+
+        conn = sqlite3.connect(str(scratch))
+        migrate(conn)
+        conn.execute("ANALYZE")
+        before_indexes = existing_indexes(conn)
+        before = snapshot(conn, shapes)
+
+        # Propose one index per distinct (ORDER BY, partial flag) that has issues
+        proposals: dict[str, str] = {}
+        for shape in shapes:
+            if not before[shape["name"]]["issues"]:
+                continue
+            proposal = propose_index(shape)
+            if proposal and proposal[0] not in before_indexes:
+                proposals[proposal[0]] = proposal[1]
+
+        for ddl in proposals.values():
+            conn.execute(ddl)
+        conn.execute("ANALYZE")
+        after = snapshot(conn, shapes)
+
+        used_after = set().union(*(r["indexes"] for r in after.values()))
+        kept = {name: ddl for name, ddl in proposals.items() if name in used_after}
+        unused = sorted(before_indexes - used_after)
+        conn.close()
+
+    print(f"\n{'shape':24s} {'before':>9s} {'after':>9s} {'count b/a (ms)':>18s}  issues before -> after", flush=True)
+    print(f"{'─'*96}", flush=True)
+    for shape in shapes:
+        b = before[shape["name"]]
+        a = after[shape["name"]]
+        worse = [kind for kind in ("list", "count") if _regressed(b[f"{kind}_ms"], a[f"{kind}_ms"])]
+        regressed = f"  [REGRESSED {'+'.join(worse)}]" if worse else ""
+        print(
+            f"{shape['name']:24s} {b['list_ms']:8.2f}ms {a['list_ms']:8.2f}ms "
+            f"{b['count_ms']:8.2f}/{a['count_ms']:<8.2f}  "
+            f"{', '.join(b['issues']) or 'ok'} -> {', '.join(a['issues']) or 'ok'}{regressed}",
+            flush=True,
+        )
+
+    print(f"\n-- Proposed indexes ({len(kept)} used of {len(proposals)} tried)", flush=True)
+    for ddl in kept.values():
+        print(f"{ddl};", flush=True)
+    if unused:
+        print("\n-- Existing indexes no recorded shape uses (verify against stats queries before dropping)", flush=True)
+        for name in unused:
+            print(f"-- DROP INDEX IF EXISTS {name};", flush=True)
+
+    if write and kept:
+        version = latest_version() + 1
+        path = MIGRATIONS_DIR / f"{version:04d}_advisor_indexes.sql"
+        body = "\n".join(f"{ddl};" for ddl in kept.values())
+        path.write_text(f"-- {version:04d} — generated by index_advisor.py\n\n{body}\n", encoding="utf-8")
+        print(f"\n[ADVISOR] Wrote {path.name}", flush=True)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Replay recorded job queries and propose indexes.")
+    parser.add_argument("--db", type=Path, default=DB_PATH, help="database to analyze (copied first)")
+    parser.add_argument("--synthetic", type=int, default=0, help="analyze N generated jobs instead")
+    parser.add_argument("--write", action="store_true", help="write proposed indexes as a new migration")
+    args = parser.parse_args()
+    run_advisor(args.db, args.synthetic, args.write)
+
+
+if __name__ == "__main__":
+    main()
@@ -3,10 +3,8 @@ JSearch API Integration (via RapidAPI) — broad job discovery across multiple b
 API docs: https://rapidapi.com/letscrape-6bRBa3QguO5/api/jsearch
 """
 import time
-import random
 import re
 import httpx
-from datetime import datetime
 from typing import Optional
 
 from config import (
@@ -14,12 +12,11 @@ from config import (
     INCLUDE_KEYWORDS,
     EXCLUDE_KEYWORDS,
     SCORING,
-    USER_AGENT,
     FAANG_COMPANIES,
     JSEARCH_QUERIES,
     USD_TO_INR,
 )
-from db import init_db, insert_jobs_batch
+from pipeline import Source, PipelineStats, run_pipeline
 from salary_parser import parse_salary
 from location_parser import parse_location
 from perks_detector import detect_perks
@@ -65,26 +62,19 @@ def search_jsearch(
         "x-rapidapi-key": JSEARCH_API_KEY,
     }
 
-    try:
-        resp = client.get(JSEARCH_BASE, params=params, headers=headers, timeout=20)
-        if resp.status_code == 429:
-            print("  [JS] Rate limited — waiting 5s...", flush=True)
-            time.sleep(5)
-            return []
-        if resp.status_code != 200:
-            print(f"  [JS] HTTP {resp.status_code} for: {query}", flush=True)
-            return []
+    # Raised errors are counted by the pipeline and leave the unit open for --resume
+    resp = client.get(JSEARCH_BASE, params=params, headers=headers, timeout=20)
+    if resp.status_code == 429:
+        print("  [JS] Rate limited — waiting 5s...", flush=True)
+        time.sleep(5)
+    if resp.status_code != 200:
+        raise httpx.HTTPStatusError(f"HTTP {resp.status_code} for: {query}", request=resp.request, response=resp)
 
-        data = resp.json()
-        if data.get("status") != "OK":
-            print(f"  [JS] API error: {data.get('status')}", flush=True)
-            return []
+    data = resp.json()
+    if data.get("status") != "OK":
+        raise RuntimeError(f"API error: {data.get('status')}")
 
-        return data.get("data", [])
-
-    except Exception as e:
-        print(f"  [JS] Error: {e}", flush=True)
-        return []
+    return data.get("data", [])
 
 
 def _convert_salary_to_lpa(
@@ -283,69 +273,33 @@ def calc_jsearch_score(title: str, location: str, company: str, is_remote: bool
     return min(score, 100)
 
 
-def run_jsearch_scraper() -> None:
-    """Run JSearch API job search across configured queries."""
-    print(f"\n{'='*60}", flush=True)
-    print(f"[JS] JSearch Job Search - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}", flush=True)
-    print(f"{'='*60}\n", flush=True)
+def _fetch_jsearch(client: httpx.Client, q: dict) -> list[dict]:
+    return search_jsearch(
+        client,
+        query=q["query"],
+        country=q.get("country", "us"),
+        date_posted=q.get("date_posted", "week"),
+        remote_only=q.get("remote_only", False),
+        num_pages=q.get("num_pages", 1),
+    )
 
-    if not JSEARCH_API_KEY:
-        print("  [!] JSearch API key not set. Skipping.", flush=True)
-        return
 
-    init_db()
-    all_jobs: list[dict] = []
+SOURCE = Source(
+    name="jsearch",
+    tag="JS",
+    title="JSearch Job Search",
+    units=lambda: JSEARCH_QUERIES,
+    fetch=_fetch_jsearch,
+    extract=lambda result, q: extract_job_from_jsearch(result),
+    label=lambda q: q.get("label", q["query"][:40]),
+    delay=(1.0, 2.0),  # RapidAPI has rate limits
+    skip_reason=None if JSEARCH_API_KEY else "JSearch API key not set",
+)
 
-    client = httpx.Client(
-        headers={"User-Agent": USER_AGENT},
-        follow_redirects=True,
-    )
 
-    queries = JSEARCH_QUERIES
-    print(f"  Running {len(queries)} JSearch queries...\n", flush=True)
-
-    for i, q in enumerate(queries, 1):
-        query_text = q["query"]
-        country = q.get("country", "us")
-        date_posted = q.get("date_posted", "week")
-        remote_only = q.get("remote_only", False)
-        num_pages = q.get("num_pages", 1)
-        label = q.get("label", query_text[:40])
-
-        print(f"  [{i}/{len(queries)}] {label}...", end=" ", flush=True)
-
-        results = search_jsearch(
-            client,
-            query=query_text,
-            country=country,
-            date_posted=date_posted,
-            remote_only=remote_only,
-            num_pages=num_pages,
-        )
-        jobs_found = 0
-
-        for r in results:
-            job = extract_job_from_jsearch(r)
-            if job:
-                all_jobs.append(job)
-                jobs_found += 1
-
-        print(f"-> {len(results)} results, {jobs_found} jobs", flush=True)
-
-        # Polite delay — RapidAPI has rate limits
-        time.sleep(random.uniform(1.0, 2.0))
-
-    client.close()
-
-    # Insert
-    new_count = insert_jobs_batch(all_jobs)
-
-    print(f"\n{'='*60}", flush=True)
-    print(f"[OK] JSearch Done!", flush=True)
-    print(f"   Total extracted: {len(all_jobs)}", flush=True)
-    print(f"   New jobs added: {new_count}", flush=True)
-    print(f"   Duplicates skipped: {len(all_jobs) - new_count}", flush=True)
-    print(f"{'='*60}\n", flush=True)
+def run_jsearch_scraper() -> PipelineStats:
+    """Run JSearch API job search across configured queries."""
+    return run_pipeline([SOURCE])
 
 
 if __name__ == "__main__":
@@ -1,24 +1,25 @@
 """Location parser — normalizes location strings into structured fields."""
 import re
 
-# Common India cities/states for detection
-_INDIA_CITIES = {
+# Common India cities/states for detection. The lookups below are tuples, not
+# sets: the first match wins, so the order must not depend on the hash seed.
+_INDIA_CITIES = (
     "bangalore", "bengaluru", "mumbai", "bombay", "delhi", "new delhi", "gurgaon", "gurugram",
     "noida", "hyderabad", "pune", "chennai", "kolkata", "calcutta", "ahmedabad", "jaipur",
     "kochi", "cochin", "thiruvananthapuram", "trivandrum", "lucknow", "chandigarh",
     "indore", "bhopal", "nagpur", "coimbatore", "vizag", "visakhapatnam", "mysore",
     "mangalore", "surat", "vadodara", "rajkot", "patna", "ranchi", "bhubaneswar",
     "goa", "panaji", "dehradun", "shimla", "agra", "kanpur", "varanasi",
-}
+)
 
-_INDIA_STATES = {
+_INDIA_STATES = (
     "karnataka", "maharashtra", "tamil nadu", "telangana", "andhra pradesh",
     "kerala", "west bengal", "rajasthan", "gujarat", "uttar pradesh",
     "madhya pradesh", "haryana", "punjab", "bihar", "odisha", "jharkhand",
     "goa", "uttarakhand", "himachal pradesh", "assam",
-}
+)
 
-_US_STATES = {
+_US_STATES = (
     "california", "ca", "new york", "ny", "texas", "tx", "washington", "wa",
     "massachusetts", "ma", "illinois", "il", "colorado", "co", "georgia", "ga",
     "florida", "fl", "virginia", "va", "oregon", "or", "pennsylvania", "pa",
@@ -26,9 +27,9 @@ _US_STATES = {
     "minnesota", "mn", "utah", "ut", "maryland", "md", "new jersey", "nj",
     "connecticut", "ct", "tennessee", "tn", "missouri", "mo", "indiana", "in",
     "wisconsin", "wi", "iowa", "ia", "nevada", "nv",
-}
+)
 
-_US_CITIES = {
+_US_CITIES = (
     "san francisco", "sf", "new york city", "nyc", "los angeles", "la",
     "seattle", "austin", "boston", "chicago", "denver", "atlanta",
     "portland", "san jose", "san diego", "dallas", "houston",
@@ -36,22 +37,22 @@ _US_CITIES = {
     "raleigh", "charlotte", "nashville", "detroit", "pittsburgh",
     "washington dc", "dc", "palo alto", "mountain view", "sunnyvale",
     "cupertino", "menlo park", "redmond", "bellevue",
-}
+)
 
 _REMOTE_TERMS = {"remote", "work from home", "wfh", "anywhere", "distributed", "fully remote", "remote-first"}
 
 _COUNTRY_CITIES = {
-    "NL": {"amsterdam", "rotterdam", "the hague", "eindhoven", "utrecht", "delft", "leiden"},
-    "IE": {"dublin", "cork", "galway", "limerick", "waterford"},
-    "FR": {"paris", "lyon", "marseille", "toulouse", "bordeaux", "nantes", "strasbourg", "nice"},
-    "NZ": {"auckland", "wellington", "christchurch", "hamilton", "dunedin"},
-    "MY": {"kuala lumpur", "penang", "johor bahru", "cyberjaya", "putrajaya", "petaling jaya"},
-    "JP": {"tokyo", "osaka", "kyoto", "yokohama", "nagoya", "fukuoka", "sapporo", "kobe"},
-    "GB": {"london", "manchester", "edinburgh", "birmingham", "bristol", "cambridge", "oxford", "leeds", "glasgow"},
-    "CA": {"toronto", "vancouver", "montreal", "ottawa", "calgary", "edmonton", "waterloo"},
-    "DE": {"berlin", "munich", "hamburg", "frankfurt", "cologne", "stuttgart"},
-    "AU": {"sydney", "melbourne", "brisbane", "perth", "adelaide", "canberra"},
-    "SG": {"singapore"},
+    "NL": ("amsterdam", "rotterdam", "the hague", "eindhoven", "utrecht", "delft", "leiden"),
+    "IE": ("dublin", "cork", "galway", "limerick", "waterford"),
+    "FR": ("paris", "lyon", "marseille", "toulouse", "bordeaux", "nantes", "strasbourg", "nice"),
+    "NZ": ("auckland", "wellington", "christchurch", "hamilton", "dunedin"),
+    "MY": ("kuala lumpur", "penang", "johor bahru", "cyberjaya", "putrajaya", "petaling jaya"),
+    "JP": ("tokyo", "osaka", "kyoto", "yokohama", "nagoya", "fukuoka", "sapporo", "kobe"),
+    "GB": ("london", "manchester", "edinburgh", "birmingham", "bristol", "cambridge", "oxford", "leeds", "glasgow"),
+    "CA": ("toronto", "vancouver", "montreal", "ottawa", "calgary", "edmonton", "waterloo"),
+    "DE": ("berlin", "munich", "hamburg", "frankfurt", "cologne", "stuttgart"),
+    "AU": ("sydney", "melbourne", "brisbane", "perth", "adelaide", "canberra"),
+    "SG": ("singapore",),
 }
 
 _COUNTRY_MAP = {
@@ -0,0 +1,40 @@
+-- 0001 — baseline jobs table.
+-- Mirrors the schema that init_db() used to build by hand: the original
+-- table, the columns later added by the old _migrate() step, and the
+-- single-column indexes. ADD COLUMN statements are skipped by the runner
+-- when the column already exists, so legacy databases adopt cleanly.
+
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    title TEXT NOT NULL,
+    company TEXT NOT NULL,
+    location TEXT DEFAULT '',
+    remote INTEGER DEFAULT 0,
+    apply_url TEXT NOT NULL,
+    source TEXT NOT NULL,
+    posted_date TEXT,
+    match_score INTEGER DEFAULT 0,
+    saved INTEGER DEFAULT 0,
+    created_at TEXT NOT NULL
+);
+
+ALTER TABLE jobs ADD COLUMN country TEXT DEFAULT '';
+ALTER TABLE jobs ADD COLUMN state TEXT DEFAULT '';
+ALTER TABLE jobs ADD COLUMN city TEXT DEFAULT '';
+ALTER TABLE jobs ADD COLUMN is_india INTEGER DEFAULT 0;
+ALTER TABLE jobs ADD COLUMN is_faang INTEGER DEFAULT 0;
+ALTER TABLE jobs ADD COLUMN salary_min_lpa REAL;
+ALTER TABLE jobs ADD COLUMN salary_max_lpa REAL;
+ALTER TABLE jobs ADD COLUMN salary_currency TEXT DEFAULT '';
+ALTER TABLE jobs ADD COLUMN source_type TEXT DEFAULT 'ATS';
+ALTER TABLE jobs ADD COLUMN visa_sponsored INTEGER DEFAULT 0;
+ALTER TABLE jobs ADD COLUMN has_equity INTEGER DEFAULT 0;
+
+CREATE INDEX IF NOT EXISTS idx_jobs_company ON jobs(company);
+CREATE INDEX IF NOT EXISTS idx_jobs_match_score ON jobs(match_score DESC);
+CREATE INDEX IF NOT EXISTS idx_jobs_created_at ON jobs(created_at DESC);
+CREATE INDEX IF NOT EXISTS idx_jobs_remote ON jobs(remote);
+CREATE INDEX IF NOT EXISTS idx_jobs_country ON jobs(country);
+CREATE INDEX IF NOT EXISTS idx_jobs_is_india ON jobs(is_india);
+CREATE INDEX IF NOT EXISTS idx_jobs_is_faang ON jobs(is_faang);
+CREATE INDEX IF NOT EXISTS idx_jobs_salary ON jobs(salary_min_lpa);
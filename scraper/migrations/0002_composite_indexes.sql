@@ -0,0 +1,21 @@
+-- 0002 — composite and partial indexes matched to the listing queries.
+-- Chosen with index_advisor.py against the shapes in query_shapes.json:
+-- every index below serves an ORDER BY that previously needed a temp
+-- B-tree sort. The single-column indexes they supersede are dropped; the
+-- india / faang / remote counts are served by the partial indexes instead
+-- (0.2-0.4 ms on 20k synthetic rows with the advisor's count check).
+
+CREATE INDEX IF NOT EXISTS idx_jobs_sort_recent ON jobs(created_at DESC, match_score DESC);
+CREATE INDEX IF NOT EXISTS idx_jobs_sort_recent_india ON jobs(created_at DESC, match_score DESC) WHERE is_india = 1;
+CREATE INDEX IF NOT EXISTS idx_jobs_sort_recent_faang ON jobs(created_at DESC, match_score DESC) WHERE is_faang = 1;
+CREATE INDEX IF NOT EXISTS idx_jobs_sort_recent_remote ON jobs(created_at DESC, match_score DESC) WHERE remote = 1;
+CREATE INDEX IF NOT EXISTS idx_jobs_sort_score ON jobs(match_score DESC, created_at DESC);
+CREATE INDEX IF NOT EXISTS idx_jobs_sort_score_india ON jobs(match_score DESC, created_at DESC) WHERE is_india = 1;
+CREATE INDEX IF NOT EXISTS idx_jobs_sort_date ON jobs(posted_date DESC, created_at DESC);
+CREATE INDEX IF NOT EXISTS idx_jobs_sort_salary ON jobs(COALESCE(salary_min_lpa, 0) DESC, match_score DESC);
+
+DROP INDEX IF EXISTS idx_jobs_match_score;
+DROP INDEX IF EXISTS idx_jobs_created_at;
+DROP INDEX IF EXISTS idx_jobs_remote;
+DROP INDEX IF EXISTS idx_jobs_is_india;
+DROP INDEX IF EXISTS idx_jobs_is_faang;
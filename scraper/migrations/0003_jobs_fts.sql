@@ -0,0 +1,32 @@
+-- 0003 — FTS5 index over title, company and location.
+-- External-content table keyed by jobs.rowid and kept in sync by triggers.
+-- unicode61 splits on punctuation, so "Full-Stack" indexes as "full" +
+-- "stack" and "SDE-2" as "sde" + "2"; fts_query() builds matching phrase
+-- queries (plus the joined "fullstack" / "sde2" form). Anything that
+-- rewrites rowids (VACUUM) must be followed by a 'rebuild'.
+
+CREATE VIRTUAL TABLE IF NOT EXISTS jobs_fts USING fts5(
+    title, company, location,
+    content='jobs', content_rowid='rowid',
+    tokenize='unicode61 remove_diacritics 2',
+    prefix='2 3'
+);
+
+INSERT INTO jobs_fts(jobs_fts) VALUES('rebuild');
+
+CREATE TRIGGER IF NOT EXISTS jobs_fts_ai AFTER INSERT ON jobs BEGIN
+    INSERT INTO jobs_fts(rowid, title, company, location)
+    VALUES (new.rowid, new.title, new.company, new.location);
+END;
+
+CREATE TRIGGER IF NOT EXISTS jobs_fts_ad AFTER DELETE ON jobs BEGIN
+    INSERT INTO jobs_fts(jobs_fts, rowid, title, company, location)
+    VALUES ('delete', old.rowid, old.title, old.company, old.location);
+END;
+
+CREATE TRIGGER IF NOT EXISTS jobs_fts_au AFTER UPDATE OF title, company, location ON jobs BEGIN
+    INSERT INTO jobs_fts(jobs_fts, rowid, title, company, location)
+    VALUES ('delete', old.rowid, old.title, old.company, old.location);
+    INSERT INTO jobs_fts(rowid, title, company, location)
+    VALUES (new.rowid, new.title, new.company, new.location);
+END;
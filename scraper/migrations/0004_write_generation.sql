@@ -0,0 +1,11 @@
+-- 0004 — global write generation.
+-- Bumped once per write batch by the write paths (insert_jobs_batch,
+-- cleanup, the web save route). Readers compare it against cached
+-- results to know when a cached count is stale.
+
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value INTEGER NOT NULL DEFAULT 0
+);
+
+INSERT OR IGNORE INTO meta (key, value) VALUES ('write_generation', 0);
@@ -0,0 +1,94 @@
+-- 0005 — incrementally maintained statistics.
+-- One row per (dim, key) counter, kept current by triggers on jobs so every
+-- writer (scraper batches, cleanup, the web app) updates it without extra
+-- code. Stats readers then do point/range lookups instead of full-table
+-- aggregates. Dims:
+--   total   ''                    all jobs
+--   source  jobs.source
+--   day     substr(created_at, 1, 10)   ("today" = key of today's date)
+--   company jobs.company
+--   flag    india | remote | faang | with_salary
+-- Counters may reach 0 and linger until prune (cleanup) or rebuild_stats().
+-- `python daily_run.py --verify-stats` compares against a full recount.
+
+CREATE TABLE IF NOT EXISTS job_stats (
+    dim TEXT NOT NULL,
+    key TEXT NOT NULL,
+    cnt INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (dim, key)
+) WITHOUT ROWID;
+
+CREATE INDEX IF NOT EXISTS idx_job_stats_dim_cnt ON job_stats(dim, cnt DESC);
+
+DELETE FROM job_stats;
+
+INSERT INTO job_stats (dim, key, cnt)
+SELECT 'total', '', COUNT(*) FROM jobs
+UNION ALL
+SELECT 'source', COALESCE(source, ''), COUNT(*) FROM jobs GROUP BY 2
+UNION ALL
+SELECT 'day', COALESCE(substr(created_at, 1, 10), ''), COUNT(*) FROM jobs GROUP BY 2
+UNION ALL
+SELECT 'company', COALESCE(company, ''), COUNT(*) FROM jobs GROUP BY 2
+UNION ALL
+SELECT 'flag', 'india', COUNT(*) FROM jobs WHERE is_india = 1
+UNION ALL
+SELECT 'flag', 'remote', COUNT(*) FROM jobs WHERE remote = 1
+UNION ALL
+SELECT 'flag', 'faang', COUNT(*) FROM jobs WHERE is_faang = 1
+UNION ALL
+SELECT 'flag', 'with_salary', COUNT(*) FROM jobs WHERE salary_min_lpa > 0;
+
+CREATE TRIGGER IF NOT EXISTS job_stats_ai AFTER INSERT ON jobs BEGIN
+    INSERT INTO job_stats (dim, key, cnt)
+    SELECT dim, key, 1 FROM (
+        SELECT 'total' AS dim, '' AS key
+        UNION ALL SELECT 'source', COALESCE(new.source, '')
+        UNION ALL SELECT 'day', COALESCE(substr(new.created_at, 1, 10), '')
+        UNION ALL SELECT 'company', COALESCE(new.company, '')
+        UNION ALL SELECT 'flag', 'india' WHERE new.is_india = 1
+        UNION ALL SELECT 'flag', 'remote' WHERE new.remote = 1
+        UNION ALL SELECT 'flag', 'faang' WHERE new.is_faang = 1
+        UNION ALL SELECT 'flag', 'with_salary' WHERE new.salary_min_lpa > 0
+    ) WHERE 1
+    ON CONFLICT (dim, key) DO UPDATE SET cnt = cnt + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS job_stats_ad AFTER DELETE ON jobs BEGIN
+    UPDATE job_stats SET cnt = cnt - 1
+    WHERE (dim, key) IN (
+        SELECT 'total', ''
+        UNION ALL SELECT 'source', COALESCE(old.source, '')
+        UNION ALL SELECT 'day', COALESCE(substr(old.created_at, 1, 10), '')
+        UNION ALL SELECT 'company', COALESCE(old.company, '')
+        UNION ALL SELECT 'flag', 'india' WHERE old.is_india = 1
+        UNION ALL SELECT 'flag', 'remote' WHERE old.remote = 1
+        UNION ALL SELECT 'flag', 'faang' WHERE old.is_faang = 1
+        UNION ALL SELECT 'flag', 'with_salary' WHERE old.salary_min_lpa > 0
+    );
+END;
+
+CREATE TRIGGER IF NOT EXISTS job_stats_au
+AFTER UPDATE OF source, created_at, company, is_india, remote, is_faang, salary_min_lpa ON jobs BEGIN
+    UPDATE job_stats SET cnt = cnt - 1
+    WHERE (dim, key) IN (
+        SELECT 'source', COALESCE(old.source, '')
+        UNION ALL SELECT 'day', COALESCE(substr(old.created_at, 1, 10), '')
+        UNION ALL SELECT 'company', COALESCE(old.company, '')
+        UNION ALL SELECT 'flag', 'india' WHERE old.is_india = 1
+        UNION ALL SELECT 'flag', 'remote' WHERE old.remote = 1
+        UNION ALL SELECT 'flag', 'faang' WHERE old.is_faang = 1
+        UNION ALL SELECT 'flag', 'with_salary' WHERE old.salary_min_lpa > 0
+    );
+    INSERT INTO job_stats (dim, key, cnt)
+    SELECT dim, key, 1 FROM (
+        SELECT 'source' AS dim, COALESCE(new.source, '') AS key
+        UNION ALL SELECT 'day', COALESCE(substr(new.created_at, 1, 10), '')
+        UNION ALL SELECT 'company', COALESCE(new.company, '')
+        UNION ALL SELECT 'flag', 'india' WHERE new.is_india = 1
+        UNION ALL SELECT 'flag', 'remote' WHERE new.remote = 1
+        UNION ALL SELECT 'flag', 'faang' WHERE new.is_faang = 1
+        UNION ALL SELECT 'flag', 'with_salary' WHERE new.salary_min_lpa > 0
+    ) WHERE 1
+    ON CONFLICT (dim, key) DO UPDATE SET cnt = cnt + 1;
+END;
@@ -0,0 +1,12 @@
+-- 0006 — precomputed smart rank.
+-- jobs.smart_score is written by insert_job() and re-scored for freshness
+-- decay by ranking.refresh_smart_scores() (daily_run.py). ranking.py owns
+-- the formula; existing rows are scored by the first refresh, not in SQL.
+
+ALTER TABLE jobs ADD COLUMN smart_score REAL NOT NULL DEFAULT 0;
+
+-- No smart_refreshed_at yet, so the next ranking.refresh_smart_scores()
+-- (daily_run.py) re-scores every row with the one Python formula.
+DELETE FROM meta WHERE key = 'smart_refreshed_at';
+
+CREATE INDEX IF NOT EXISTS idx_jobs_sort_smart ON jobs(smart_score DESC);
@@ -0,0 +1,20 @@
+-- 0007 — source dimension.
+-- One row per source name with an integer id, the feed family
+-- (ats | serp | aggregator | other) and the smart-rank quality points
+-- (ranking.source_quality). jobs.source_id references it so source
+-- filters are IN lookups on an indexed integer; the name column on jobs
+-- stays for display and stats. Names are registered by db.source_id(),
+-- with quality from ranking.source_quality (the only copy of that table);
+-- rows that predate this migration get their source_id from
+-- db.assign_sources() (daily_run.py).
+
+CREATE TABLE IF NOT EXISTS sources (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    family TEXT NOT NULL DEFAULT 'other',
+    quality INTEGER NOT NULL DEFAULT 50
+);
+
+ALTER TABLE jobs ADD COLUMN source_id INTEGER REFERENCES sources(id);
+
+CREATE INDEX IF NOT EXISTS idx_jobs_source_recent ON jobs(source_id, created_at DESC, match_score DESC);
@@ -0,0 +1,16 @@
+-- 0008 — integer day buckets for created_at / posted_date.
+-- Virtual generated columns holding days since 1970-01-01 (UTC), indexed,
+-- so "today", "last N days" and smart-view freshness are integer range
+-- scans instead of ISO-text comparisons or LIKE prefixes. Retention keeps
+-- its to-the-second created_at cutoff (served by idx_jobs_sort_recent).
+-- Computed from the first 10 characters; NULL when the date is unparsable.
+-- Python: db.epoch_day(); TypeScript: epochDay() in web/lib/db.ts.
+
+ALTER TABLE jobs ADD COLUMN created_day INTEGER
+    GENERATED ALWAYS AS (CAST(julianday(substr(created_at, 1, 10)) - 2440587.5 AS INTEGER)) VIRTUAL;
+
+ALTER TABLE jobs ADD COLUMN posted_day INTEGER
+    GENERATED ALWAYS AS (CAST(julianday(substr(posted_date, 1, 10)) - 2440587.5 AS INTEGER)) VIRTUAL;
+
+CREATE INDEX IF NOT EXISTS idx_jobs_created_day ON jobs(created_day);
+CREATE INDEX IF NOT EXISTS idx_jobs_posted_day ON jobs(posted_day);
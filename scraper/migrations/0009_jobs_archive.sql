@@ -0,0 +1,12 @@
+-- 0009 — cold archive for expired jobs.
+-- cleanup_old_jobs(archive=True) copies rows here before deleting them from
+-- jobs, in the same short batch transaction. Created from the jobs column
+-- list as of this migration (generated day columns become plain values);
+-- the copy uses the columns both tables share, so later jobs columns only
+-- need an ALTER here if they should be archived too.
+
+CREATE TABLE IF NOT EXISTS jobs_archive AS SELECT * FROM jobs WHERE 0;
+
+ALTER TABLE jobs_archive ADD COLUMN archived_at TEXT;
+
+CREATE INDEX IF NOT EXISTS idx_jobs_archive_id ON jobs_archive(id);
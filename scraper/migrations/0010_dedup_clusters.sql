@@ -0,0 +1,28 @@
+-- 0010 — near-duplicate clusters across sources.
+-- Match keys computed by dedup.match_keys() on insert, and cluster_id: the
+-- rowid of the oldest live job in the cluster, so the collapsed listing is
+-- "cluster_id = rowid". Existing rows start with NULL keys (shown as their
+-- own cluster) until `python daily_run.py --recluster` fills them in.
+
+ALTER TABLE jobs ADD COLUMN url_key TEXT;
+ALTER TABLE jobs ADD COLUMN company_key TEXT;
+ALTER TABLE jobs ADD COLUMN location_key TEXT;
+ALTER TABLE jobs ADD COLUMN title_hash INTEGER;
+ALTER TABLE jobs ADD COLUMN cluster_id INTEGER;
+
+CREATE INDEX IF NOT EXISTS idx_jobs_url_key ON jobs(url_key);
+CREATE INDEX IF NOT EXISTS idx_jobs_company_location_key ON jobs(company_key, location_key);
+CREATE INDEX IF NOT EXISTS idx_jobs_cluster ON jobs(cluster_id);
+
+-- A job inserted without a match becomes the head of a new cluster
+CREATE TRIGGER IF NOT EXISTS jobs_cluster_ai AFTER INSERT ON jobs
+WHEN new.cluster_id IS NULL AND new.company_key IS NOT NULL BEGIN
+    UPDATE jobs SET cluster_id = new.rowid WHERE rowid = new.rowid;
+END;
+
+-- Deleting a cluster head hands the cluster to its oldest remaining member
+CREATE TRIGGER IF NOT EXISTS jobs_cluster_ad AFTER DELETE ON jobs
+WHEN old.cluster_id = old.rowid BEGIN
+    UPDATE jobs SET cluster_id = (SELECT MIN(rowid) FROM jobs WHERE cluster_id = old.rowid)
+    WHERE cluster_id = old.rowid;
+END;
@@ -0,0 +1,90 @@
+-- 0011 — canonical company dimension.
+-- companies holds one row per employer (key = dedup.company_key() squashed
+-- to [a-z0-9], name for display, slug when it came from a board list);
+-- company_aliases maps every squashed name seen to its company. Resolution
+-- happens in Python (companies.resolve_company) on insert; rows from before
+-- this migration get company_id on the next daily_run.py start.
+-- The company filter becomes
+--   company_id IN (SELECT company_id FROM company_aliases WHERE alias LIKE ?)
+-- and the job_stats 'company' counters are keyed by company_id.
+
+CREATE TABLE IF NOT EXISTS companies (
+    id INTEGER PRIMARY KEY,
+    key TEXT NOT NULL UNIQUE,
+    name TEXT NOT NULL,
+    slug TEXT
+);
+
+CREATE TABLE IF NOT EXISTS company_aliases (
+    alias TEXT PRIMARY KEY,
+    company_id INTEGER NOT NULL REFERENCES companies(id)
+) WITHOUT ROWID;
+
+ALTER TABLE jobs ADD COLUMN company_id INTEGER REFERENCES companies(id);
+
+CREATE INDEX IF NOT EXISTS idx_jobs_company_id ON jobs(company_id);
+
+-- Re-key the per-company stats from the free-text name to company_id.
+-- The triggers are recreated with every change as an UPSERT of +1/-1, so
+-- each counter is a primary-key lookup (the 0005 row-value IN form scanned
+-- job_stats once per deleted or updated job).
+DROP TRIGGER IF EXISTS job_stats_ai;
+DROP TRIGGER IF EXISTS job_stats_ad;
+DROP TRIGGER IF EXISTS job_stats_au;
+
+DELETE FROM job_stats WHERE dim = 'company';
+
+INSERT INTO job_stats (dim, key, cnt)
+SELECT 'company', COALESCE(CAST(company_id AS TEXT), ''), COUNT(*) FROM jobs GROUP BY 2;
+
+CREATE TRIGGER IF NOT EXISTS job_stats_ai AFTER INSERT ON jobs BEGIN
+    INSERT INTO job_stats (dim, key, cnt)
+    SELECT dim, key, 1 FROM (
+        SELECT 'total' AS dim, '' AS key
+        UNION ALL SELECT 'source', COALESCE(new.source, '')
+        UNION ALL SELECT 'day', COALESCE(substr(new.created_at, 1, 10), '')
+        UNION ALL SELECT 'company', COALESCE(CAST(new.company_id AS TEXT), '')
+        UNION ALL SELECT 'flag', 'india' WHERE new.is_india = 1
+        UNION ALL SELECT 'flag', 'remote' WHERE new.remote = 1
+        UNION ALL SELECT 'flag', 'faang' WHERE new.is_faang = 1
+        UNION ALL SELECT 'flag', 'with_salary' WHERE new.salary_min_lpa > 0
+    ) WHERE 1
+    ON CONFLICT (dim, key) DO UPDATE SET cnt = cnt + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS job_stats_ad AFTER DELETE ON jobs BEGIN
+    INSERT INTO job_stats (dim, key, cnt)
+    SELECT dim, key, -1 FROM (
+        SELECT 'total' AS dim, '' AS key
+        UNION ALL SELECT 'source', COALESCE(old.source, '')
+        UNION ALL SELECT 'day', COALESCE(substr(old.created_at, 1, 10), '')
+        UNION ALL SELECT 'company', COALESCE(CAST(old.company_id AS TEXT), '')
+        UNION ALL SELECT 'flag', 'india' WHERE old.is_india = 1
+        UNION ALL SELECT 'flag', 'remote' WHERE old.remote = 1
+        UNION ALL SELECT 'flag', 'faang' WHERE old.is_faang = 1
+        UNION ALL SELECT 'flag', 'with_salary' WHERE old.salary_min_lpa > 0
+    ) WHERE 1
+    ON CONFLICT (dim, key) DO UPDATE SET cnt = cnt - 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS job_stats_au
+AFTER UPDATE OF source, created_at, company_id, is_india, remote, is_faang, salary_min_lpa ON jobs BEGIN
+    INSERT INTO job_stats (dim, key, cnt)
+    SELECT dim, key, delta FROM (
+        SELECT 'source' AS dim, COALESCE(old.source, '') AS key, -1 AS delta
+        UNION ALL SELECT 'day', COALESCE(substr(old.created_at, 1, 10), ''), -1
+        UNION ALL SELECT 'company', COALESCE(CAST(old.company_id AS TEXT), ''), -1
+        UNION ALL SELECT 'flag', 'india', -1 WHERE old.is_india = 1
+        UNION ALL SELECT 'flag', 'remote', -1 WHERE old.remote = 1
+        UNION ALL SELECT 'flag', 'faang', -1 WHERE old.is_faang = 1
+        UNION ALL SELECT 'flag', 'with_salary', -1 WHERE old.salary_min_lpa > 0
+        UNION ALL SELECT 'source', COALESCE(new.source, ''), 1
+        UNION ALL SELECT 'day', COALESCE(substr(new.created_at, 1, 10), ''), 1
+        UNION ALL SELECT 'company', COALESCE(CAST(new.company_id AS TEXT), ''), 1
+        UNION ALL SELECT 'flag', 'india', 1 WHERE new.is_india = 1
+        UNION ALL SELECT 'flag', 'remote', 1 WHERE new.remote = 1
+        UNION ALL SELECT 'flag', 'faang', 1 WHERE new.is_faang = 1
+        UNION ALL SELECT 'flag', 'with_salary', 1 WHERE new.salary_min_lpa > 0
+    ) WHERE 1
+    ON CONFLICT (dim, key) DO UPDATE SET cnt = cnt + excluded.cnt;
+END;
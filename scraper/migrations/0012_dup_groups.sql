@@ -0,0 +1,64 @@
+-- 0012 — incrementally maintained duplicate groups.
+-- title_key is the normalized title (dedup.title_tokens joined by spaces),
+-- set on insert next to company_key. dup_groups counts jobs per
+-- (title_key, company_key), and the job_stats counter ('dupes', '') holds
+-- how many groups have more than one job — the "potential duplicates"
+-- figure, read without a GROUP BY over jobs. Rows without a title_key
+-- (inserted before this migration) are not counted until
+-- `python daily_run.py --recluster` fills the keys in.
+
+ALTER TABLE jobs ADD COLUMN title_key TEXT;
+
+CREATE INDEX IF NOT EXISTS idx_jobs_title_company_key ON jobs(title_key, company_key);
+
+CREATE TABLE IF NOT EXISTS dup_groups (
+    title_key TEXT NOT NULL,
+    company_key TEXT NOT NULL,
+    cnt INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (title_key, company_key)
+) WITHOUT ROWID;
+
+INSERT OR REPLACE INTO job_stats (dim, key, cnt) VALUES ('dupes', '', 0);
+
+CREATE TRIGGER IF NOT EXISTS dup_groups_ai AFTER INSERT ON jobs
+WHEN new.title_key IS NOT NULL BEGIN
+    INSERT INTO dup_groups (title_key, company_key, cnt)
+    VALUES (new.title_key, COALESCE(new.company_key, ''), 1)
+    ON CONFLICT (title_key, company_key) DO UPDATE SET cnt = cnt + 1;
+    INSERT INTO job_stats (dim, key, cnt)
+    SELECT 'dupes', '', 1 FROM dup_groups
+    WHERE title_key = new.title_key AND company_key = COALESCE(new.company_key, '') AND cnt = 2
+    ON CONFLICT (dim, key) DO UPDATE SET cnt = cnt + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS dup_groups_ad AFTER DELETE ON jobs
+WHEN old.title_key IS NOT NULL BEGIN
+    UPDATE job_stats SET cnt = cnt - 1
+    WHERE dim = 'dupes' AND key = '' AND (
+        SELECT cnt FROM dup_groups
+        WHERE title_key = old.title_key AND company_key = COALESCE(old.company_key, '')
+    ) = 2;
+    UPDATE dup_groups SET cnt = cnt - 1
+    WHERE title_key = old.title_key AND company_key = COALESCE(old.company_key, '');
+    DELETE FROM dup_groups
+    WHERE title_key = old.title_key AND company_key = COALESCE(old.company_key, '') AND cnt <= 0;
+END;
+
+CREATE TRIGGER IF NOT EXISTS dup_groups_au AFTER UPDATE OF title_key, company_key ON jobs BEGIN
+    UPDATE job_stats SET cnt = cnt - 1
+    WHERE dim = 'dupes' AND key = '' AND old.title_key IS NOT NULL AND (
+        SELECT cnt FROM dup_groups
+        WHERE title_key = old.title_key AND company_key = COALESCE(old.company_key, '')
+    ) = 2;
+    UPDATE dup_groups SET cnt = cnt - 1
+    WHERE title_key = old.title_key AND company_key = COALESCE(old.company_key, '');
+    DELETE FROM dup_groups
+    WHERE title_key = old.title_key AND company_key = COALESCE(old.company_key, '') AND cnt <= 0;
+    INSERT INTO dup_groups (title_key, company_key, cnt)
+    SELECT new.title_key, COALESCE(new.company_key, ''), 1 WHERE new.title_key IS NOT NULL
+    ON CONFLICT (title_key, company_key) DO UPDATE SET cnt = cnt + 1;
+    INSERT INTO job_stats (dim, key, cnt)
+    SELECT 'dupes', '', 1 FROM dup_groups
+    WHERE title_key = new.title_key AND company_key = COALESCE(new.company_key, '') AND cnt = 2
+    ON CONFLICT (dim, key) DO UPDATE SET cnt = cnt + 1;
+END;
@@ -0,0 +1,24 @@
+-- 0013 — scrape run checkpoints.
+-- One scrape_runs row per pipeline run; status stays 'running' until every
+-- source has finished, so a run killed part-way (a Railway restart, a
+-- crash) is left 'running'. scrape_checkpoints records each finished unit
+-- (a board slug or a query) in the same transaction as that unit's jobs,
+-- and `python daily_run.py --resume` skips them. See checkpoint.py.
+
+CREATE TABLE IF NOT EXISTS scrape_runs (
+    id INTEGER PRIMARY KEY,
+    started_at TEXT NOT NULL,
+    finished_at TEXT,
+    status TEXT NOT NULL DEFAULT 'running',
+    resumes INTEGER NOT NULL DEFAULT 0
+);
+
+CREATE TABLE IF NOT EXISTS scrape_checkpoints (
+    run_id INTEGER NOT NULL REFERENCES scrape_runs(id),
+    source TEXT NOT NULL,
+    unit TEXT NOT NULL,
+    results INTEGER NOT NULL DEFAULT 0,
+    jobs INTEGER NOT NULL DEFAULT 0,
+    done_at TEXT NOT NULL,
+    PRIMARY KEY (run_id, source, unit)
+) WITHOUT ROWID;
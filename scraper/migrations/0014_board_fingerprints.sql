@@ -0,0 +1,51 @@
+-- 0014 — per-board posting fingerprints.
+-- board_postings keeps each board's native posting ids with a version
+-- (Greenhouse updated_at, a content hash for Lever and Ashby) and the job
+-- id the posting produced (NULL when it scored 0). board_state holds the
+-- fingerprint of the whole set, so a board that has not changed is skipped
+-- after one primary-key lookup, and otherwise only added or changed
+-- postings are extracted. board_diffs records added / changed / removed /
+-- unchanged per board per scrape run. See fingerprints.py.
+
+CREATE TABLE IF NOT EXISTS board_state (
+    source TEXT NOT NULL,
+    board TEXT NOT NULL,
+    fingerprint TEXT,
+    rules TEXT NOT NULL,
+    postings INTEGER NOT NULL DEFAULT 0,
+    checked_at TEXT NOT NULL,
+    changed_at TEXT NOT NULL,
+    PRIMARY KEY (source, board)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS board_postings (
+    source TEXT NOT NULL,
+    board TEXT NOT NULL,
+    posting_id TEXT NOT NULL,
+    version TEXT NOT NULL,
+    job_id TEXT,
+    PRIMARY KEY (source, board, posting_id)
+) WITHOUT ROWID;
+
+CREATE INDEX IF NOT EXISTS idx_board_postings_job ON board_postings(job_id);
+
+CREATE TABLE IF NOT EXISTS board_diffs (
+    run_id INTEGER NOT NULL REFERENCES scrape_runs(id),
+    source TEXT NOT NULL,
+    board TEXT NOT NULL,
+    added INTEGER NOT NULL DEFAULT 0,
+    changed INTEGER NOT NULL DEFAULT 0,
+    removed INTEGER NOT NULL DEFAULT 0,
+    unchanged INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (run_id, source, board)
+) WITHOUT ROWID;
+
+-- A job removed by cleanup while its posting is still live must come back
+-- on the next scrape (as it did before fingerprints): forget the posting
+-- and clear its board's fingerprint so the board is diffed again.
+CREATE TRIGGER IF NOT EXISTS board_postings_job_ad AFTER DELETE ON jobs
+WHEN EXISTS (SELECT 1 FROM board_postings WHERE job_id = old.id) BEGIN
+    UPDATE board_state SET fingerprint = NULL
+    WHERE (source, board) = (SELECT source, board FROM board_postings WHERE job_id = old.id);
+    DELETE FROM board_postings WHERE job_id = old.id;
+END;
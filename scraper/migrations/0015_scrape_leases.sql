@@ -0,0 +1,24 @@
+-- 0015 — leases for sharded scrape runs.
+-- A sharded run (`python daily_run.py --workers N`) splits every source's
+-- units into batches, one scrape_leases row each. Worker processes claim a
+-- pending batch, or one whose lease expired because its worker stopped
+-- heartbeating, and mark it done when its units are written. Units already
+-- checkpointed for the run (scrape_checkpoints) are skipped on a re-claim.
+-- Times are ISO-8601 UTC text like the rest of the schema. See shards.py.
+
+CREATE TABLE IF NOT EXISTS scrape_leases (
+    run_id INTEGER NOT NULL REFERENCES scrape_runs(id),
+    seq INTEGER NOT NULL,
+    source TEXT NOT NULL,
+    units TEXT NOT NULL,
+    state TEXT NOT NULL DEFAULT 'pending',
+    worker TEXT,
+    expires_at TEXT,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    jobs INTEGER NOT NULL DEFAULT 0,
+    new_jobs INTEGER NOT NULL DEFAULT 0,
+    seconds REAL NOT NULL DEFAULT 0,
+    PRIMARY KEY (run_id, seq)
+) WITHOUT ROWID;
+
+CREATE INDEX IF NOT EXISTS idx_scrape_leases_state ON scrape_leases(run_id, state, expires_at);
@@ -0,0 +1,9 @@
+-- 0016 — per-unit timing for the budgeted scheduler.
+-- scrape_checkpoints already holds results and jobs for every unit of the
+-- last KEEP_RUNS runs; seconds adds how long the unit took (fetch through
+-- extract). `python daily_run.py --budget-seconds N` ranks units by
+-- jobs per second from this history. See scheduler.py.
+
+ALTER TABLE scrape_checkpoints ADD COLUMN seconds REAL NOT NULL DEFAULT 0;
+
+CREATE INDEX IF NOT EXISTS idx_scrape_checkpoints_unit ON scrape_checkpoints(source, unit);
@@ -0,0 +1,42 @@
+-- 0017 — joined spellings in the FTS index.
+-- unicode61 splits "Full-Stack" into "full" + "stack" and "SDE-2" into
+-- "sde" + "2", so a search for "fullstack" or "sde2" found nothing where
+-- the old LIKE search matched. search_joined is title + company, lowercased,
+-- with the in-word separators - . / _ ' removed ("full-stack developer" ->
+-- "fullstack developer"); fts_query() matches the joined form of the search
+-- text against it next to the usual phrase on title / company.
+
+ALTER TABLE jobs ADD COLUMN search_joined TEXT
+    GENERATED ALWAYS AS (lower(replace(replace(replace(replace(replace(
+        title || ' ' || company, '-', ''), '.', ''), '/', ''), '_', ''), '''', ''))) VIRTUAL;
+
+DROP TRIGGER IF EXISTS jobs_fts_ai;
+DROP TRIGGER IF EXISTS jobs_fts_ad;
+DROP TRIGGER IF EXISTS jobs_fts_au;
+DROP TABLE IF EXISTS jobs_fts;
+
+CREATE VIRTUAL TABLE IF NOT EXISTS jobs_fts USING fts5(
+    title, company, location, search_joined,
+    content='jobs', content_rowid='rowid',
+    tokenize='unicode61 remove_diacritics 2',
+    prefix='2 3'
+);
+
+INSERT INTO jobs_fts(jobs_fts) VALUES('rebuild');
+
+CREATE TRIGGER IF NOT EXISTS jobs_fts_ai AFTER INSERT ON jobs BEGIN
+    INSERT INTO jobs_fts(rowid, title, company, location, search_joined)
+    VALUES (new.rowid, new.title, new.company, new.location, new.search_joined);
+END;
+
+CREATE TRIGGER IF NOT EXISTS jobs_fts_ad AFTER DELETE ON jobs BEGIN
+    INSERT INTO jobs_fts(jobs_fts, rowid, title, company, location, search_joined)
+    VALUES ('delete', old.rowid, old.title, old.company, old.location, old.search_joined);
+END;
+
+CREATE TRIGGER IF NOT EXISTS jobs_fts_au AFTER UPDATE OF title, company, location ON jobs BEGIN
+    INSERT INTO jobs_fts(jobs_fts, rowid, title, company, location, search_joined)
+    VALUES ('delete', old.rowid, old.title, old.company, old.location, old.search_joined);
+    INSERT INTO jobs_fts(rowid, title, company, location, search_joined)
+    VALUES (new.rowid, new.title, new.company, new.location, new.search_joined);
+END;
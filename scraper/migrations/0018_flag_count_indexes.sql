@@ -0,0 +1,8 @@
+-- 0018 — partial indexes for the visa and equity filters.
+-- index_advisor.py now checks each shape's COUNT as well as its listing:
+-- visa_only and equity_only counts were full table scans (3.1 ms on 20k
+-- synthetic rows) and drop to 0.1 ms with these; their listings also stop
+-- walking the recency index past every non-matching row.
+
+CREATE INDEX IF NOT EXISTS idx_jobs_sort_recent_visa_sponsored ON jobs(created_at DESC, match_score DESC) WHERE visa_sponsored = 1;
+CREATE INDEX IF NOT EXISTS idx_jobs_sort_recent_has_equity ON jobs(created_at DESC, match_score DESC) WHERE has_equity = 1;
@@ -0,0 +1,8 @@
+-- 0019 — rowid generation.
+-- Keyset cursors carry the last row's rowid as the tiebreaker, and a full
+-- VACUUM may renumber rowids. compact_db() bumps this after its VACUUM so
+-- cursors issued before it are rejected instead of skipping or repeating
+-- rows. (Web snapshots are new files: their cursors carry the snapshot
+-- version instead.)
+
+INSERT OR IGNORE INTO meta (key, value) VALUES ('rowid_generation', 0);
@@ -0,0 +1,448 @@
+"""
+Scrape Pipeline — streams jobs from every source into the database.
+
+  units -> fetch -> extract (score + enrich) -> dedup -> write
+
+A Source lists the units it works through (boards or queries), a fetch
+function returning the raw results for one unit, and an extract function
+turning one raw result into a scored, enriched job dict (or None). The
+stages are chained generators, so a unit is fetched only when the writer
+asks for more jobs, and the writer holds at most PIPELINE_BATCH_SIZE jobs.
+Each batch is committed (with one write-generation bump) as soon as it
+fills or PIPELINE_FLUSH_SECONDS pass, so jobs reach the database during
+the run and a crash loses at most one batch.
+
+Units are checkpointed as they finish, in the transaction that commits
+their last jobs (checkpoint.py); run_pipeline(resume=True) skips the units
+an interrupted run already finished.
+
+Board sources also give each raw posting a (native id, version) key; the
+board is diffed against its stored fingerprint (fingerprints.py) and only
+added or changed postings reach the extract stage.
+
+Scoring and enrichment stay inside each source's extract function rather
+than being stages of their own: every source scores from its own raw
+fields, drops score-0 results before enriching them, and enriches from
+source-specific data (Ashby compensation, Adzuna salary ranges), so there
+is no source-independent job to hand from one stage to the next. The
+"extract" counters here therefore cover parse + score + enrich; per-stage
+timings for score and enrich come from benchmarks/run.py.
+
+All sources share one httpx.Client, which records or replays responses
+when HTTP_FIXTURES is set (http_fixtures.py). Per-stage counts and timings
+are kept in PipelineStats and printed when the run ends.
+"""
+import random
+import time
+import traceback
+from datetime import datetime
+from typing import Any, Callable, Iterator
+
+import httpx
+
+from config import (
+    USER_AGENT, PIPELINE_BATCH_SIZE, PIPELINE_FLUSH_SECONDS,
+    HTTP_FIXTURES, HTTP_FIXTURES_DIR, HTTP_REPLAY_LATENCY,
+)
+from db import get_connection, init_db, insert_job, bump_write_generation, make_job_id, ids_committed, ids_rolled_back
+from companies import warm_resolver
+from checkpoint import unit_key, start_run, interrupted_run, resume_run, done_units, record_units, finish_run
+from fingerprints import BoardDiff, BoardIndex, record_boards
+from http_fixtures import fixture_transport
+
+STAGES = ("fetch", "extract", "dedup", "write")
+
+
+class Source:
+    """One job source as the pipeline sees it."""
+
+    def __init__(
+        self,
+        name: str,
+        tag: str,
+        title: str,
+        units: Callable[[], list],
+        fetch: Callable[[httpx.Client, Any], list[dict]],
+        extract: Callable[[dict, Any], dict | None],
+        label: Callable[[Any], str] = str,
+        delay: tuple[float, float] = (0.0, 0.0),
+        skip_reason: str | None = None,
+        finish: Callable[[], None] | None = None,
+        posting_key: Callable[[dict], tuple[str, str]] | None = None,
+    ) -> None:
+        self.name = name                # "greenhouse", "serp", ...
+        self.tag = tag                  # log prefix, e.g. "GH"
+        self.title = title              # banner text
+        self.units = units              # boards / queries for this run
+        self.fetch = fetch              # (client, unit) -> raw results
+        self.extract = extract          # (raw result, unit) -> job or None
+        self.label = label              # unit -> progress label
+        self.delay = delay              # polite pause between units (seconds)
+        self.skip_reason = skip_reason  # e.g. a missing API key
+        self.finish = finish            # called after the last unit
+        self.posting_key = posting_key  # raw posting -> (native id, version), for board diffs
+
+
+class StopSource(Exception):
+    """Raised by a fetch to abandon the rest of its source (not a per-unit error)."""
+
+
+class UnitDone:
+    """Marker that follows a unit's last job down the pipeline."""
+
+    __slots__ = ("source", "unit", "results", "jobs", "seconds", "board")
+
+    def __init__(self, source: str, unit: str, results: int, jobs: int, seconds: float,
+                 board: BoardDiff | None = None) -> None:
+        self.source = source
+        self.unit = unit
+        self.results = results
+        self.jobs = jobs
+        self.seconds = seconds
+        self.board = board
+
+
+class StageStats:
+    def __init__(self) -> None:
+        self.items_in = 0
+        self.items_out = 0
+        self.errors = 0
+        self.seconds = 0.0
+
+
+class PipelineStats:
+    """Counters per stage for the whole run, and per source."""
+
+    def __init__(self) -> None:
+        self.stages = {name: StageStats() for name in STAGES}
+        self.sources: dict[str, dict] = {}
+        self.batches = 0
+        self.sleep_seconds = 0.0
+        self.run_id: int | None = None
+        self.resumed = False
+        self.deadline: float | None = None  # time.monotonic() after which no unit starts
+        self.budget_skipped: dict[str, int] = {}  # units left out by the budget planner
+        self.started = time.monotonic()
+
+    def source(self, name: str) -> dict:
+        return self.sources.setdefault(
+            name, {"units": 0, "skipped": 0, "deferred": 0, "results": 0, "unchanged": 0, "extracted": 0,
+                   "new": 0, "errors": 0, "extract_errors": 0, "seconds": 0.0}
+        )
+
+    @property
+    def new_jobs(self) -> int:
+        return self.stages["write"].items_out
+
+    def skipped_units(self) -> dict[str, int]:
+        """Units not scraped this run because of the time budget, per source."""
+        out = dict(self.budget_skipped)
+        for name, s in self.sources.items():
+            if s["deferred"]:
+                out[name] = out.get(name, 0) + s["deferred"]
+        return out
+
+    @property
+    def out_of_time(self) -> bool:
+        return self.deadline is not None and time.monotonic() >= self.deadline
+
+    def report(self) -> None:
+        elapsed = time.monotonic() - self.started
+        print(f"\n[PIPELINE] {elapsed:.1f}s total, {self.batches} batches, "
+              f"{self.sleep_seconds:.1f}s polite delays", flush=True)
+        for name in STAGES:
+            st = self.stages[name]
+            print(f"  {name:8s} in={st.items_in:<7} out={st.items_out:<7} "
+                  f"errors={st.errors:<4} {st.seconds:6.1f}s{'  (incl. score + enrich)' if name == 'extract' else ''}",
+                  flush=True)
+        deferred = {name: s["deferred"] for name, s in self.sources.items() if s["deferred"]}
+        if deferred:
+            print(f"  [BUDGET] Out of time, deferred units: "
+                  f"{', '.join(f'{name} {n}' for name, n in deferred.items())}", flush=True)
+
+
+def make_client() -> httpx.Client:
+    """The HTTP client shared by every source in a run (recording or replaying per HTTP_FIXTURES)."""
+    transport = fixture_transport(HTTP_FIXTURES, HTTP_FIXTURES_DIR, HTTP_REPLAY_LATENCY)
+    if transport is not None:
+        print(f"[HTTP] {HTTP_FIXTURES} fixtures in {HTTP_FIXTURES_DIR}", flush=True)
+    return httpx.Client(headers={"User-Agent": USER_AGENT}, follow_redirects=True, transport=transport)
+
+
+def _fetch_and_extract(
+    client: httpx.Client, source: Source, skip: set[str], boards: BoardIndex | None, stats: PipelineStats
+) -> Iterator[dict | UnitDone]:
+    """
+    fetch + extract stages for one source: yields jobs unit by unit, then a
+    UnitDone. With a BoardIndex, postings unchanged since the last run are
+    not extracted. Stops starting units once the run's deadline has passed.
+    """
+    fetch, extract = stats.stages["fetch"], stats.stages["extract"]
+    per_source = stats.source(source.name)
+    units = source.units()
+    if skip:
+        print(f"  Resuming: {sum(unit_key(u) in skip for u in units)} of {len(units)} units already done", flush=True)
+    for i, unit in enumerate(units, 1):
+        key = unit_key(unit)
+        if key in skip:
+            per_source["skipped"] += 1
+            continue
+        if stats.out_of_time:
+            per_source["deferred"] = sum(unit_key(u) not in skip for u in units[i - 1:])
+            print(f"  [BUDGET] Out of time: {per_source['deferred']} units left for the next run", flush=True)
+            return
+        print(f"  [{i}/{len(units)}] {source.label(unit)}...", end=" ", flush=True)
+        started = time.monotonic()
+        t = time.perf_counter()
+        fetch.items_in += 1
+        per_source["units"] += 1
+        try:
+            results = source.fetch(client, unit)
+        except StopSource:
+            raise
+        except Exception as e:
+            # No UnitDone: the unit stays unchecked, so --resume or a re-claimed lease retries it
+            fetch.errors += 1
+            per_source["errors"] += 1
+            fetch.seconds += time.perf_counter() - t
+            print(f"-> error: {e}", flush=True)
+            _pause(source, i, len(units), stats)
+            continue
+        fetch.seconds += time.perf_counter() - t
+        fetch.items_out += len(results)
+        per_source["results"] += len(results)
+
+        # An empty board is usually a failed fetch: keep the stored state
+        board = None
+        keys: list[str] = []
+        if boards is not None and results:
+            versions = [source.posting_key(raw) for raw in results]
+            keys = [pid for pid, _ in versions]
+            board = boards.diff(key, dict(versions))
+            todo = board.todo
+            per_source["unchanged"] += board.unchanged
+            results = [raw for raw, pid in zip(results, keys) if pid in todo]
+            keys = [pid for pid in keys if pid in todo]
+
+        found = failed = 0
+        for n, raw in enumerate(results):
+            t = time.perf_counter()
+            extract.items_in += 1
+            try:
+                job = source.extract(raw, unit)
+            except Exception as e:
+                extract.errors += 1
+                per_source["extract_errors"] += 1
+                failed += 1
+                if board is not None:
+                    board.failed.add(keys[n])  # left out of board_postings: retried next run
+                # A parser bug fails every posting alike: one traceback per source is enough
+                if per_source["extract_errors"] == 1:
+                    print(f"\n  extract error: {e!r}\n{traceback.format_exc()}", end="", flush=True)
+                job = None
+            extract.seconds += time.perf_counter() - t
+            if job is None:
+                continue
+            if board is not None:
+                board.job_ids[keys[n]] = make_job_id(job["title"], job["company"], job.get("location", ""))
+            extract.items_out += 1
+            found += 1
+            yield job
+        per_source["extracted"] += found
+        errors = f", {failed} extract errors" if failed else ""
+        if board is None:
+            print(f"-> {len(results)} results, {found} jobs{errors}", flush=True)
+        elif board.todo:
+            print(f"-> {len(board.postings)} postings (+{len(board.added)} ~{len(board.changed)} "
+                  f"-{len(board.removed)}), {found} jobs{errors}", flush=True)
+        else:
+            print(f"-> {len(board.postings)} postings, unchanged", flush=True)
+        yield UnitDone(source.name, key, len(board.postings) if board else len(results), found,
+                       time.monotonic() - started, board)
+        _pause(source, i, len(units), stats)
+
+
+def _pause(source: Source, i: int, total: int, stats: PipelineStats) -> None:
+    """Polite delay after unit i of total (none after the last, none while replaying)."""
+    if i < total and source.delay[1] > 0 and HTTP_FIXTURES != "replay":
+        pause = random.uniform(*source.delay)
+        time.sleep(pause)
+        stats.sleep_seconds += pause
+
+
+def _dedup(jobs: Iterator[dict | UnitDone], seen: set[str], stats: PipelineStats) -> Iterator[dict | UnitDone]:
+    """Drop jobs already seen earlier in this run (same id as insert_job)."""
+    st = stats.stages["dedup"]
+    for job in jobs:
+        if isinstance(job, UnitDone):
+            yield job
+            continue
+        st.items_in += 1
+        job_id = make_job_id(job["title"], job["company"], job.get("location", ""))
+        if job_id in seen:
+            continue
+        seen.add(job_id)
+        st.items_out += 1
+        yield job
+
+
+class Writer:
+    """
+    Bounded buffer in front of the database; one transaction per batch.
+    Finished units ride along and are checkpointed with the batch.
+    """
+
+    def __init__(self, stats: PipelineStats) -> None:
+        self.conn = get_connection()
+        warm_resolver(self.conn)  # before any batch transaction: slugs registered, caches loaded
+        self.stats = stats
+        self.batch: list[dict] = []
+        self.done: list[UnitDone] = []
+        self.last_flush = time.monotonic()
+
+    def add(self, item: dict | UnitDone) -> None:
+        if isinstance(item, UnitDone):
+            self.done.append(item)
+        else:
+            self.batch.append(item)
+        if len(self.batch) >= PIPELINE_BATCH_SIZE or time.monotonic() - self.last_flush >= PIPELINE_FLUSH_SECONDS:
+            self.flush()
+
+    def flush(self) -> int:
+        if not self.batch and not self.done:
+            return 0
+        st = self.stats.stages["write"]
+        t = time.perf_counter()
+        new = 0
+        try:
+            for job in self.batch:
+                if insert_job(self.conn, job):
+                    new += 1
+            if new:
+                bump_write_generation(self.conn)
+            for d in self.done:
+                if d.board is not None:
+                    record_boards(self.conn, self.stats.run_id, d.source, [d.board])
+            if self.done and self.stats.run_id is not None:
+                record_units(self.conn, self.stats.run_id,
+                             [(d.source, d.unit, d.results, d.jobs, d.seconds) for d in self.done])
+            self.conn.commit()
+            ids_committed()
+        except Exception:
+            # The buffer is kept: the caller retries it or discards it
+            self.conn.rollback()
+            ids_rolled_back()
+            st.errors += 1
+            raise
+        finally:
+            st.seconds += time.perf_counter() - t
+            self.last_flush = time.monotonic()
+        st.items_in += len(self.batch)
+        st.items_out += new
+        self.stats.batches += 1
+        self.batch = []
+        self.done = []
+        return new
+
+    def discard(self) -> int:
+        """Drop a batch that cannot be committed. Its units stay unchecked, so they run again."""
+        dropped = len(self.batch)
+        self.batch = []
+        self.done = []
+        return dropped
+
+    def close(self) -> None:
+        self.conn.close()
+
+
+def run_source(
+    client: httpx.Client, source: Source, writer: Writer, skip: set[str], seen: set[str], stats: PipelineStats
+) -> bool:
+    """Run one source to the end. False if it stopped on an error."""
+    print(f"\n{'='*60}", flush=True)
+    print(f"[{source.tag}] {source.title} - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}", flush=True)
+    print(f"{'='*60}\n", flush=True)
+    if source.skip_reason:
+        print(f"  [!] {source.skip_reason}. Skipping.", flush=True)
+        return True
+
+    per_source = stats.source(source.name)
+    start = time.monotonic()
+    new_before = stats.new_jobs
+    boards = BoardIndex(writer.conn, source.name) if source.posting_key else None
+    ok = True
+    try:
+        for item in _dedup(_fetch_and_extract(client, source, skip, boards, stats), seen, stats):
+            writer.add(item)
+        writer.flush()
+        if source.finish and HTTP_FIXTURES == "replay":
+            print(f"  [HTTP] Replaying: {source.name} finish hook skipped", flush=True)
+        elif source.finish:
+            source.finish()
+    except Exception as e:
+        ok = False
+        per_source["errors"] += 1
+        print(f"\n[{source.tag}] {source.title} error: {e}", flush=True)
+        try:
+            writer.flush()  # keep what the source produced before the error
+        except Exception as e:
+            print(f"[{source.tag}] {writer.discard()} jobs not written: {e}", flush=True)
+    per_source["new"] += stats.new_jobs - new_before
+    per_source["seconds"] += time.monotonic() - start
+
+    print(f"\n{'='*60}", flush=True)
+    print(f"[OK] {source.title} Done!", flush=True)
+    print(f"   Total extracted: {per_source['extracted']}", flush=True)
+    if boards is not None:
+        print(f"   Unchanged postings skipped: {per_source['unchanged']}", flush=True)
+    print(f"   New jobs added: {per_source['new']}", flush=True)
+    if per_source["extract_errors"]:
+        print(f"   Extract errors: {per_source['extract_errors']} (first traceback above)", flush=True)
+    print(f"   Duplicates skipped: {per_source['extracted'] - per_source['new']}", flush=True)
+    print(f"{'='*60}\n", flush=True)
+    return ok
+
+
+def run_pipeline(
+    sources: list[Source], client: httpx.Client | None = None, resume: bool = False, deadline: float | None = None
+) -> PipelineStats:
+    """
+    Run sources in order through one client and one writer. Returns the stats.
+    With resume, continues the latest interrupted run instead of starting one.
+    With a deadline (time.monotonic()), units not started by then are deferred.
+    """
+    init_db()
+    stats = PipelineStats()
+    stats.deadline = deadline
+    own_client = client is None
+    client = client or make_client()
+    writer = Writer(stats)
+    seen: set[str] = set()
+    try:
+        run_id = interrupted_run(writer.conn) if resume else None
+        done: dict[str, set[str]] = {}
+        if run_id is not None:
+            resume_run(writer.conn, run_id)
+            done = done_units(writer.conn, run_id)
+            stats.resumed = True
+            print(f"[RESUME] Continuing run {run_id} "
+                  f"({sum(len(u) for u in done.values())} units already done)", flush=True)
+        else:
+            if resume:
+                print("[RESUME] No interrupted run found; starting a new one", flush=True)
+            run_id = start_run(writer.conn)
+        stats.run_id = run_id
+
+        for source in sources:
+            skip = done.get(source.name, set())
+            if stats.out_of_time and not source.skip_reason:
+                stats.source(source.name)["deferred"] = sum(unit_key(u) not in skip for u in source.units())
+                continue
+            run_source(client, source, writer, skip, seen, stats)
+        finish_run(writer.conn, run_id)
+    finally:
+        writer.close()
+        if own_client:
+            client.close()
+    stats.report()
+    return stats
@@ -0,0 +1,123 @@
+"""
+Smart Rank — the weighted score behind smart view and sort_by=smart.
+
+smart_score = match(40%) + freshness(25%) + salary_signal(15%) + source_quality(20%)
+
+The score is computed here when a job is written and stored in
+jobs.smart_score (indexed), so the smart sort is an index scan instead of a
+per-row expression. Freshness decays with time, so refresh_smart_scores()
+re-scores the rows whose freshness bucket can have moved; daily_run.py calls
+it once per run.
+"""
+import sqlite3
+import time
+from datetime import datetime
+
+# (max age in days, freshness points) — first bucket the age fits wins
+FRESHNESS_BUCKETS = [(0, 100), (1, 80), (3, 50), (7, 20)]
+FRESHNESS_FLOOR = 5
+
+# Checked in order against the lower-cased source name (substring match)
+SOURCE_QUALITY = [("jsearch", 100), ("greenhouse", 95), ("lever", 90), ("serp", 40), ("adzuna", 30)]
+SOURCE_QUALITY_DEFAULT = 50
+
+# Rows older than this always score FRESHNESS_FLOOR, so a refresh only needs
+# to revisit rows younger than this at the time of the previous refresh.
+_REFRESH_WINDOW_DAYS = FRESHNESS_BUCKETS[-1][0] + 1
+
+
+def _age_days(posted_date: str | None, created_at: str | None, now: datetime) -> float | None:
+    # Same as COALESCE(posted_date, created_at): an empty posted_date wins
+    stamp = posted_date if posted_date is not None else created_at
+    if not stamp:
+        return None
+    try:
+        dt = datetime.fromisoformat(stamp.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if dt.tzinfo is not None:
+        dt = dt.replace(tzinfo=None) - dt.utcoffset()
+    return (now - dt).total_seconds() / 86400
+
+
+def freshness_points(posted_date: str | None, created_at: str | None, now: datetime | None = None) -> int:
+    age = _age_days(posted_date, created_at, now or datetime.utcnow())
+    if age is None:
+        return FRESHNESS_FLOOR
+    for max_age, points in FRESHNESS_BUCKETS:
+        if age <= max_age:
+            return points
+    return FRESHNESS_FLOOR
+
+
+def source_quality(source: str | None) -> int:
+    lower = (source or "").lower()
+    for needle, points in SOURCE_QUALITY:
+        if needle in lower:
+            return points
+    return SOURCE_QUALITY_DEFAULT
+
+
+def smart_score(
+    match_score: float | None,
+    posted_date: str | None,
+    created_at: str | None,
+    salary_min_lpa: float | None,
+    source: str | None,
+    now: datetime | None = None,
+) -> float:
+    salary = salary_min_lpa or 0
+    salary_signal = min(salary, 100) if salary > 0 else 0
+    return round(
+        (match_score or 0) * 0.4
+        + freshness_points(posted_date, created_at, now) * 0.25
+        + salary_signal * 0.15
+        + source_quality(source) * 0.2,
+        4,
+    )
+
+
+def refresh_smart_scores(conn: sqlite3.Connection, full: bool = False) -> int:
+    """Re-score rows whose freshness may have decayed since the last refresh.
+
+    Returns the number of rows whose score changed. Caller commits.
+    """
+    now = datetime.utcnow()
+    row = conn.execute("SELECT value FROM meta WHERE key = 'smart_refreshed_at'").fetchone()
+    last = int(row[0]) if row and not full else 0
+    where, params = "", []
+    if last:
+        since = datetime.utcfromtimestamp(last - _REFRESH_WINDOW_DAYS * 86400).isoformat()
+        where = "WHERE COALESCE(posted_date, created_at) >= ?"
+        params = [since[:10]]
+
+    rows = conn.execute(
+        f"SELECT rowid, match_score, posted_date, created_at, salary_min_lpa, source, smart_score FROM jobs {where}",
+        params,
+    ).fetchall()
+    updates = []
+    for rowid, match, posted, created, salary, source, current in rows:
+        score = smart_score(match, posted, created, salary, source, now)
+        if score != current:
+            updates.append((score, rowid))
+    conn.executemany("UPDATE jobs SET smart_score = ? WHERE rowid = ?", updates)
+    conn.execute(
+        "INSERT INTO meta (key, value) VALUES ('smart_refreshed_at', ?) "
+        "ON CONFLICT (key) DO UPDATE SET value = excluded.value",
+        (int(time.time()),),
+    )
+    return len(updates)
+
+
+if __name__ == "__main__":
+    # Scores for a few representative jobs (tests: scraper/tests/test_ranking.py)
+    now = datetime(2026, 3, 10, 15, 30)
+    cases = [
+        (90, "2026-03-10", "2026-03-10T09:00:00", 25.0, "greenhouse"),
+        (70, "2026-03-09", "2026-03-10T09:00:00", None, "serp_greenhouse"),
+        (100, "2026-03-04", "2026-03-09T01:00:00", 250.0, "jsearch"),
+        (40, "2026-02-01", "2026-03-01T00:00:00", 12.5, "adzuna"),
+        (65, None, "2026-03-07T18:00:00", None, "remoteok"),
+    ]
+    for match, posted, created, salary, source in cases:
+        print(f"  {match:3d} {str(posted):12s} {source:16s} -> {smart_score(match, posted, created, salary, source, now):7.3f}")
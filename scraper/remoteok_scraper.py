@@ -3,11 +3,8 @@ Remote OK API Integration — fetches remote-only jobs.
 API: https://remoteok.com/api (free, no auth required)
 Returns JSON array of remote job listings.
 """
-import time
-import random
 import re
 import httpx
-from datetime import datetime
 from typing import Optional
 
 from config import (
@@ -17,7 +14,7 @@ from config import (
     USER_AGENT,
     FAANG_COMPANIES,
 )
-from db import init_db, insert_jobs_batch
+from pipeline import Source, PipelineStats, run_pipeline
 from salary_parser import parse_salary
 from location_parser import parse_location
 from perks_detector import detect_perks
@@ -26,28 +23,23 @@ REMOTEOK_API_URL = "https://remoteok.com/api"
 
 
 def fetch_remoteok_jobs(client: httpx.Client) -> list[dict]:
-    """Fetch all jobs from Remote OK API."""
-    try:
-        resp = client.get(
-            REMOTEOK_API_URL,
-            timeout=30,
-            headers={
-                "User-Agent": USER_AGENT,
-                "Accept": "application/json",
-            },
-        )
-        if resp.status_code != 200:
-            print(f"  [ROK] HTTP {resp.status_code}", flush=True)
-            return []
-
-        data = resp.json()
-        # First element is metadata/legal notice, skip it
-        if isinstance(data, list) and len(data) > 1:
-            return data[1:]
-        return []
-    except Exception as e:
-        print(f"  [ROK] Error fetching: {e}", flush=True)
-        return []
+    """Fetch all jobs from Remote OK API. Raises on a transport error or non-200."""
+    resp = client.get(
+        REMOTEOK_API_URL,
+        timeout=30,
+        headers={
+            "User-Agent": USER_AGENT,
+            "Accept": "application/json",
+        },
+    )
+    if resp.status_code != 200:
+        raise httpx.HTTPStatusError(f"HTTP {resp.status_code}", request=resp.request, response=resp)
+
+    data = resp.json()
+    # First element is metadata/legal notice, skip it
+    if isinstance(data, list) and len(data) > 1:
+        return data[1:]
+    return []
 
 
 def extract_job_from_remoteok(result: dict) -> Optional[dict]:
@@ -207,40 +199,19 @@ def calc_remoteok_score(title: str, location: str, company: str) -> int:
     return min(score, 100)
 
 
-def run_remoteok_scraper() -> None:
-    """Run Remote OK API job fetch."""
-    print(f"\n{'='*60}", flush=True)
-    print(f"[ROK] Remote OK Job Fetch - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}", flush=True)
-    print(f"{'='*60}\n", flush=True)
-
-    init_db()
-    all_jobs: list[dict] = []
-
-    client = httpx.Client(
-        headers={"User-Agent": USER_AGENT},
-        follow_redirects=True,
-    )
-
-    print("  Fetching Remote OK API...", end=" ", flush=True)
-    results = fetch_remoteok_jobs(client)
-    print(f"-> {len(results)} listings", flush=True)
-
-    for r in results:
-        job = extract_job_from_remoteok(r)
-        if job:
-            all_jobs.append(job)
-
-    client.close()
+SOURCE = Source(
+    name="remoteok",
+    tag="ROK",
+    title="Remote OK Job Fetch",
+    units=lambda: ["Remote OK API"],  # one feed, one request
+    fetch=lambda client, unit: fetch_remoteok_jobs(client),
+    extract=lambda result, unit: extract_job_from_remoteok(result),
+)
 
-    # Insert
-    new_count = insert_jobs_batch(all_jobs)
 
-    print(f"\n{'='*60}", flush=True)
-    print(f"[OK] Remote OK Done!", flush=True)
-    print(f"   Total extracted: {len(all_jobs)}", flush=True)
-    print(f"   New jobs added: {new_count}", flush=True)
-    print(f"   Duplicates skipped: {len(all_jobs) - new_count}", flush=True)
-    print(f"{'='*60}\n", flush=True)
+def run_remoteok_scraper() -> PipelineStats:
+    """Run Remote OK API job fetch."""
+    return run_pipeline([SOURCE])
 
 
 if __name__ == "__main__":
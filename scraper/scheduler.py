@@ -0,0 +1,134 @@
+"""
+Run Scheduler — fits a scrape into a time budget, most valuable work first.
+
+Every finished unit leaves a checkpoint with the jobs it produced and the
+seconds it took (kept for the last KEEP_RUNS runs). plan_budget() turns
+that history into an expected yield per second for each unit:
+
+  rate = average jobs / (average seconds + the source's mean polite delay)
+
+A run in which a board was skipped as unchanged (fingerprints.py) says
+nothing about its yield, so it counts towards the unit's seconds but not its
+jobs. Units never seen before, or only seen unchanged, get their source's
+averages (or PRIOR_JOBS / PRIOR_SECONDS when the source has no history). Units are taken greedily by
+rate until their expected time fills the budget; the rest are skipped and
+reported. Each source then runs its chosen units best first, sources in
+order of their chosen units' yield, and the pipeline deadline stops the
+run cleanly if reality is slower than the estimate.
+
+Usage:
+  python daily_run.py --budget-seconds 1800
+"""
+import copy
+import sqlite3
+from statistics import mean
+
+from checkpoint import unit_key
+from pipeline import Source
+
+PRIOR_JOBS = 1.0      # expected jobs for a unit of a source with no history
+PRIOR_SECONDS = 2.0   # expected fetch + extract seconds for the same
+
+
+class UnitEstimate:
+    def __init__(self, source: Source, unit, jobs: float, seconds: float, seen: bool) -> None:
+        self.source = source
+        self.unit = unit
+        self.jobs = jobs
+        self.seconds = seconds + sum(source.delay) / 2
+        self.seen = seen
+
+    @property
+    def rate(self) -> float:
+        return self.jobs / self.seconds if self.seconds > 0 else self.jobs
+
+
+def _history(conn: sqlite3.Connection, source: str) -> dict[str, tuple[float | None, float]]:
+    """{unit key: (average jobs, average seconds)} over the kept runs; jobs is None with no sample."""
+    return {
+        str(unit): (None if jobs is None else float(jobs), float(seconds)) for unit, jobs, seconds in conn.execute(
+            """SELECT c.unit, AVG(CASE WHEN d.run_id IS NULL OR d.added + d.changed > 0 THEN c.jobs END),
+                      AVG(c.seconds)
+               FROM scrape_checkpoints c
+               LEFT JOIN board_diffs d ON d.run_id = c.run_id AND d.source = c.source AND d.board = c.unit
+               WHERE c.source = ? GROUP BY c.unit""",
+            (source,),
+        )
+    }
+
+
+def estimate(conn: sqlite3.Connection, sources: list[Source]) -> list[UnitEstimate]:
+    """One estimate per unit of every source that can run, in configured order."""
+    out = []
+    for source in sources:
+        if source.skip_reason:
+            continue
+        history = _history(conn, source.name)
+        sampled = [j for j, _ in history.values() if j is not None]
+        prior_jobs = mean(sampled) if sampled else PRIOR_JOBS
+        prior_seconds = mean(s for _, s in history.values()) if history else PRIOR_SECONDS
+        for unit in source.units():
+            jobs, seconds = history.get(unit_key(unit), (None, prior_seconds))
+            out.append(UnitEstimate(source, unit, prior_jobs if jobs is None else jobs, seconds,
+                                    unit_key(unit) in history))
+    return out
+
+
+def plan_budget(conn: sqlite3.Connection, sources: list[Source], budget: float) -> tuple[list[Source], dict]:
+    """
+    Sources narrowed to the units that fit the budget, best first, and a
+    summary: {"planned", "skipped": {source: units}, "expected_jobs",
+    "expected_seconds"}.
+    """
+    units = estimate(conn, sources)
+    ranked = sorted(units, key=lambda u: u.rate, reverse=True)  # stable: ties keep config order
+    chosen: dict[str, list[UnitEstimate]] = {}
+    skipped: dict[str, int] = {}
+    used = 0.0
+    for u in ranked:
+        if used + u.seconds <= budget:
+            chosen.setdefault(u.source.name, []).append(u)
+            used += u.seconds
+        else:
+            skipped[u.source.name] = skipped.get(u.source.name, 0) + 1
+
+    def density(picked: list[UnitEstimate]) -> float:
+        return sum(u.jobs for u in picked) / max(sum(u.seconds for u in picked), 1e-9)
+
+    planned = []
+    for name, picked in sorted(chosen.items(), key=lambda kv: density(kv[1]), reverse=True):
+        shard = copy.copy(picked[0].source)
+        shard.units = lambda picked=picked: [u.unit for u in picked]
+        planned.append(shard)
+    summary = {
+        "planned": sum(len(p) for p in chosen.values()),
+        "skipped": skipped,
+        "expected_jobs": round(sum(u.jobs for p in chosen.values() for u in p)),
+        "expected_seconds": round(used),
+    }
+    return planned, summary
+
+
+def print_plan(budget: float, summary: dict) -> None:
+    total = summary["planned"] + sum(summary["skipped"].values())
+    print(f"[BUDGET] {budget:.0f}s: {summary['planned']} of {total} units planned "
+          f"(~{summary['expected_jobs']} jobs in ~{summary['expected_seconds']}s)", flush=True)
+    if summary["skipped"]:
+        print(f"[BUDGET] Skipped as lowest yield: "
+              f"{', '.join(f'{name} {n}' for name, n in summary['skipped'].items())}", flush=True)
+
+
+if __name__ == "__main__":
+    # Show the plan for a budget against the current history, without scraping
+    import sys
+    from db import get_connection, init_db
+    from scraper import all_sources
+
+    init_db()
+    conn = get_connection()
+    seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 600
+    planned, info = plan_budget(conn, all_sources(), seconds)
+    print_plan(seconds, info)
+    for s in planned:
+        units = s.units()
+        print(f"  {s.name:12s} {len(units):4d} units, first: {[s.label(u) for u in units[:3]]}")
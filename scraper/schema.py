@@ -0,0 +1,100 @@
+"""
+Schema migrations — versioned SQL files shared by the scraper and the web app.
+
+Each file in migrations/ is named NNNN_description.sql and is applied once,
+in order, inside a single transaction that also bumps PRAGMA user_version.
+web/lib/schema.ts runs the same files with the same rules, so these files
+are the only place the schema is defined.
+
+Statement rules (kept identical in schema.ts):
+  - statements end with ';' at the end of a line
+  - CREATE TRIGGER bodies end with a line reading 'END;'
+  - ALTER TABLE ... ADD COLUMN is skipped if the column already exists
+"""
+import re
+import sqlite3
+from pathlib import Path
+
+MIGRATIONS_DIR = Path(__file__).resolve().parent / "migrations"
+
+_FILE_RE = re.compile(r"^(\d{4})_[\w-]+\.sql$")
+_ADD_COLUMN_RE = re.compile(r"^\s*ALTER\s+TABLE\s+\S+\s+ADD\s+COLUMN\b", re.I)
+_TRIGGER_RE = re.compile(r"^\s*CREATE\s+TRIGGER\b", re.I)
+
+_migrations: list[tuple[int, str, str]] | None = None
+
+
+def load_migrations() -> list[tuple[int, str, str]]:
+    """Return [(version, name, sql), ...] sorted by version (cached)."""
+    global _migrations
+    if _migrations is None:
+        found: list[tuple[int, str, str]] = []
+        for path in sorted(MIGRATIONS_DIR.glob("*.sql")):
+            m = _FILE_RE.match(path.name)
+            if not m:
+                continue
+            found.append((int(m.group(1)), path.stem, path.read_text(encoding="utf-8")))
+        versions = [v for v, _, _ in found]
+        if versions != list(range(1, len(found) + 1)):
+            raise RuntimeError(f"Migration versions must be contiguous from 1, got {versions}")
+        _migrations = found
+    return _migrations
+
+
+def latest_version() -> int:
+    return len(load_migrations())
+
+
+def split_statements(sql: str) -> list[str]:
+    """Split a migration file into individual statements."""
+    statements: list[str] = []
+    buf: list[str] = []
+    for line in sql.splitlines():
+        stripped = line.strip()
+        if not buf and (not stripped or stripped.startswith("--")):
+            continue
+        buf.append(line)
+        if not stripped.endswith(";"):
+            continue
+        if _TRIGGER_RE.match(buf[0]) and stripped.upper() != "END;":
+            continue
+        statements.append("\n".join(buf))
+        buf = []
+    if buf:
+        statements.append("\n".join(buf))
+    return statements
+
+
+def get_version(conn: sqlite3.Connection) -> int:
+    return int(conn.execute("PRAGMA user_version").fetchone()[0])
+
+
+def migrate(conn: sqlite3.Connection) -> int:
+    """Apply pending migrations. Returns the number applied."""
+    target = latest_version()
+    if get_version(conn) >= target:
+        return 0
+
+    applied = 0
+    for version, name, sql in load_migrations():
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            # Re-check under the write lock: another process may have migrated
+            if get_version(conn) >= version:
+                conn.rollback()
+                continue
+            for stmt in split_statements(sql):
+                try:
+                    conn.execute(stmt)
+                except sqlite3.OperationalError as e:
+                    if _ADD_COLUMN_RE.match(stmt) and "duplicate column name" in str(e):
+                        continue
+                    raise
+            conn.execute(f"PRAGMA user_version = {version}")
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        print(f"  [DB] Applied migration {name}", flush=True)
+        applied += 1
+    return applied
@@ -1,10 +1,10 @@
 """
 Job Scraper — Greenhouse + Lever boards + SerpAPI + Adzuna.
 Runs once daily. Scrapes curated company list + Google dork queries + Adzuna API.
+run_scraper() streams every source through pipeline.run_pipeline().
 """
 import json
 import time
-import random
 import httpx
 from datetime import datetime
 
@@ -16,10 +16,10 @@ from config import (
     REQUEST_DELAY_MIN,
     REQUEST_DELAY_MAX,
     REQUEST_TIMEOUT,
-    USER_AGENT,
     FAANG_COMPANIES,
 )
-from db import init_db, insert_jobs_batch
+from pipeline import Source, PipelineStats, run_pipeline
+from fingerprints import content_version
 from salary_parser import parse_salary
 from location_parser import parse_location
 from perks_detector import detect_perks
@@ -79,10 +79,6 @@ def is_remote(title: str, location: str = "") -> bool:
     return any(t in combined for t in ["remote", "work from home", "wfh", "anywhere", "distributed"])
 
 
-def polite_delay() -> None:
-    time.sleep(random.uniform(REQUEST_DELAY_MIN, REQUEST_DELAY_MAX))
-
-
 def enrich_job(job: dict) -> dict:
     """Add location + salary + perks parsing to a job dict."""
     loc = parse_location(job.get("location", ""))
@@ -108,165 +104,138 @@ def enrich_job(job: dict) -> dict:
     return job
 
 
-def scrape_greenhouse(client: httpx.Client, company: str) -> list[dict]:
+def fetch_greenhouse_board(client: httpx.Client, company: str) -> list[dict]:
+    """Postings on one board. Raises on a transport error or non-200 (the pipeline counts it)."""
     url = f"https://boards-api.greenhouse.io/v1/boards/{company}/jobs"
-    jobs: list[dict] = []
-    try:
-        resp = client.get(url, timeout=REQUEST_TIMEOUT)
-        if resp.status_code != 200:
-            return jobs
-
-        data = resp.json()
-        for item in data.get("jobs", []):
-            title = item.get("title", "")
-            location = ""
-            loc_field = item.get("location")
-            if isinstance(loc_field, dict):
-                location = loc_field.get("name", "")
-
-            company_name = company.replace("-", " ").title()
-            score = calc_match_score(title, location, company_name)
-            if score == 0:
-                continue
-
-            job = {
-                "title": title,
-                "company": company_name,
-                "location": location,
-                "remote": is_remote(title, location),
-                "apply_url": item.get("absolute_url", f"https://boards.greenhouse.io/{company}/jobs/{item.get('id', '')}"),
-                "source": "greenhouse",
-                "posted_date": item.get("updated_at", "")[:10] if item.get("updated_at") else "",
-                "match_score": score,
-            }
-            jobs.append(enrich_job(job))
-    except Exception as e:
-        print(f"  [GH] {company}: Error - {e}", flush=True)
-
-    return jobs
-
-
-def scrape_lever(client: httpx.Client, company: str) -> list[dict]:
+    resp = client.get(url, timeout=REQUEST_TIMEOUT)
+    if resp.status_code != 200:
+        raise httpx.HTTPStatusError(f"HTTP {resp.status_code}", request=resp.request, response=resp)
+    return resp.json().get("jobs", [])
+
+
+def extract_greenhouse_job(item: dict, company: str) -> dict | None:
+    title = item.get("title", "")
+    location = ""
+    loc_field = item.get("location")
+    if isinstance(loc_field, dict):
+        location = loc_field.get("name", "")
+
+    company_name = company.replace("-", " ").title()
+    score = calc_match_score(title, location, company_name)
+    if score == 0:
+        return None
+
+    job = {
+        "title": title,
+        "company": company_name,
+        "location": location,
+        "remote": is_remote(title, location),
+        "apply_url": item.get("absolute_url", f"https://boards.greenhouse.io/{company}/jobs/{item.get('id', '')}"),
+        "source": "greenhouse",
+        "posted_date": item.get("updated_at", "")[:10] if item.get("updated_at") else "",
+        "match_score": score,
+    }
+    return enrich_job(job)
+
+
+def greenhouse_posting_key(item: dict) -> tuple[str, str]:
+    return str(item.get("id", "")), item.get("updated_at") or content_version(item, "title", "location", "absolute_url")
+
+
+def fetch_lever_board(client: httpx.Client, company: str) -> list[dict]:
+    """Postings on one board. Raises on a transport error or non-200 (the pipeline counts it)."""
     url = f"https://api.lever.co/v0/postings/{company}"
-    jobs: list[dict] = []
-    try:
-        resp = client.get(url, timeout=REQUEST_TIMEOUT)
-        if resp.status_code != 200:
-            return jobs
-
-        data = resp.json()
-        if not isinstance(data, list):
-            return jobs
-
-        for item in data:
-            title = item.get("text", "")
-            location = ""
-            cats = item.get("categories")
-            if isinstance(cats, dict):
-                location = cats.get("location", "")
-
-            company_name = company.replace("-", " ").title()
-            score = calc_match_score(title, location, company_name)
-            if score == 0:
-                continue
-
-            job = {
-                "title": title,
-                "company": company_name,
-                "location": location,
-                "remote": is_remote(title, location),
-                "apply_url": item.get("hostedUrl", f"https://jobs.lever.co/{company}/{item.get('id', '')}"),
-                "source": "lever",
-                "posted_date": "",
-                "match_score": score,
-            }
-            jobs.append(enrich_job(job))
-    except Exception as e:
-        print(f"  [LV] {company}: Error - {e}", flush=True)
-
-    return jobs
-
-
-def run_scraper() -> None:
-    print(f"\n{'='*60}", flush=True)
-    print(f"[*] Job Scraper - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}", flush=True)
-    print(f"{'='*60}\n", flush=True)
+    resp = client.get(url, timeout=REQUEST_TIMEOUT)
+    if resp.status_code != 200:
+        raise httpx.HTTPStatusError(f"HTTP {resp.status_code}", request=resp.request, response=resp)
+    data = resp.json()
+    return data if isinstance(data, list) else []
+
+
+def extract_lever_job(item: dict, company: str) -> dict | None:
+    title = item.get("text", "")
+    location = ""
+    cats = item.get("categories")
+    if isinstance(cats, dict):
+        location = cats.get("location", "")
+
+    company_name = company.replace("-", " ").title()
+    score = calc_match_score(title, location, company_name)
+    if score == 0:
+        return None
+
+    job = {
+        "title": title,
+        "company": company_name,
+        "location": location,
+        "remote": is_remote(title, location),
+        "apply_url": item.get("hostedUrl", f"https://jobs.lever.co/{company}/{item.get('id', '')}"),
+        "source": "lever",
+        "posted_date": "",
+        "match_score": score,
+    }
+    return enrich_job(job)
+
+
+def lever_posting_key(item: dict) -> tuple[str, str]:
+    # Lever postings carry no updated timestamp; hash what extract reads
+    return str(item.get("id", "")), content_version(item, "text", "categories", "hostedUrl")
+
+
+GREENHOUSE_SOURCE = Source(
+    name="greenhouse",
+    tag="GH",
+    title="Greenhouse Boards",
+    units=lambda: load_companies().get("greenhouse", []),
+    fetch=fetch_greenhouse_board,
+    extract=extract_greenhouse_job,
+    delay=(REQUEST_DELAY_MIN, REQUEST_DELAY_MAX),
+    posting_key=greenhouse_posting_key,
+)
 
-    init_db()
-    companies = load_companies()
-    all_jobs: list[dict] = []
-
-    headers = {"User-Agent": USER_AGENT}
-    client = httpx.Client(headers=headers, follow_redirects=True)
-
-    # Greenhouse
-    gh_companies = companies.get("greenhouse", [])
-    print(f"[GH] Scraping {len(gh_companies)} Greenhouse boards...\n", flush=True)
-    for i, company in enumerate(gh_companies, 1):
-        print(f"  [{i}/{len(gh_companies)}] {company}...", end=" ", flush=True)
-        jobs = scrape_greenhouse(client, company)
-        print(f"-> {len(jobs)} matches", flush=True)
-        all_jobs.extend(jobs)
-        polite_delay()
-
-    # Lever
-    lv_companies = companies.get("lever", [])
-    print(f"\n[LV] Scraping {len(lv_companies)} Lever boards...\n", flush=True)
-    for i, company in enumerate(lv_companies, 1):
-        print(f"  [{i}/{len(lv_companies)}] {company}...", end=" ", flush=True)
-        jobs = scrape_lever(client, company)
-        print(f"-> {len(jobs)} matches", flush=True)
-        all_jobs.extend(jobs)
-        polite_delay()
-
-    client.close()
-
-    # Insert into DB
-    new_count = insert_jobs_batch(all_jobs)
+LEVER_SOURCE = Source(
+    name="lever",
+    tag="LV",
+    title="Lever Boards",
+    units=lambda: load_companies().get("lever", []),
+    fetch=fetch_lever_board,
+    extract=extract_lever_job,
+    delay=(REQUEST_DELAY_MIN, REQUEST_DELAY_MAX),
+    posting_key=lever_posting_key,
+)
 
+
+def all_sources() -> list[Source]:
+    """Every source, in run order. SerpAPI runs after the boards so the slugs
+    it discovers are picked up by the next run."""
+    from serp_scraper import SOURCE as serp
+    from adzuna_scraper import SOURCE as adzuna
+    from jsearch_scraper import SOURCE as jsearch
+    from remoteok_scraper import SOURCE as remoteok
+    from ashby_scraper import SOURCE as ashby
+    return [GREENHOUSE_SOURCE, LEVER_SOURCE, serp, adzuna, jsearch, remoteok, ashby]
+
+
+def run_scraper(resume: bool = False, budget_seconds: float | None = None) -> PipelineStats:
+    """Run every source. With budget_seconds, only the highest-yield units that fit (scheduler.py)."""
     print(f"\n{'='*60}", flush=True)
-    print(f"[OK] ATS Scraper Done!", flush=True)
-    print(f"   Total matched: {len(all_jobs)}", flush=True)
-    print(f"   New jobs added: {new_count}", flush=True)
-    print(f"   Duplicates skipped: {len(all_jobs) - new_count}", flush=True)
+    print(f"[*] Job Scraper - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}", flush=True)
     print(f"{'='*60}\n", flush=True)
+    if budget_seconds is None:
+        return run_pipeline(all_sources(), resume=resume)
 
-    # SerpAPI
-    try:
-        from serp_scraper import run_serp_scraper
-        run_serp_scraper()
-    except Exception as e:
-        print(f"[SERP] SerpAPI scraper error: {e}", flush=True)
-
-    # Adzuna
-    try:
-        from adzuna_scraper import run_adzuna_scraper
-        run_adzuna_scraper()
-    except Exception as e:
-        print(f"[ADZUNA] Adzuna scraper error: {e}", flush=True)
-
-    # JSearch (RapidAPI)
-    try:
-        from jsearch_scraper import run_jsearch_scraper
-        run_jsearch_scraper()
-    except Exception as e:
-        print(f"[JSEARCH] JSearch scraper error: {e}", flush=True)
-
-    # Remote OK (free, no API key)
-    try:
-        from remoteok_scraper import run_remoteok_scraper
-        run_remoteok_scraper()
-    except Exception as e:
-        print(f"[REMOTEOK] Remote OK scraper error: {e}", flush=True)
-
-    # Ashby (free, no API key)
-    try:
-        from ashby_scraper import run_ashby_scraper
-        run_ashby_scraper()
-    except Exception as e:
-        print(f"[ASHBY] Ashby scraper error: {e}", flush=True)
+    from db import get_connection, init_db
+    from scheduler import plan_budget, print_plan
+    deadline = time.monotonic() + budget_seconds
+    init_db()
+    conn = get_connection()
+    sources, plan = plan_budget(conn, all_sources(), budget_seconds)
+    conn.close()
+    print_plan(budget_seconds, plan)
+    stats = run_pipeline(sources, resume=resume, deadline=deadline)
+    stats.budget_skipped = plan["skipped"]
+    return stats
 
 
 if __name__ == "__main__":
     run_scraper()
-
@@ -4,8 +4,6 @@ Uses targeted queries against ATS domains for high-quality results.
 Auto-discovers new company slugs and expands companies.json permanently.
 """
 import json
-import time
-import random
 import re
 import httpx
 from datetime import datetime, timedelta
@@ -20,11 +18,10 @@ from config import (
     INCLUDE_KEYWORDS,
     EXCLUDE_KEYWORDS,
     SCORING,
-    USER_AGENT,
     COMPANIES_FILE,
     FAANG_COMPANIES,
 )
-from db import init_db, insert_jobs_batch
+from pipeline import Source, PipelineStats, run_pipeline
 from salary_parser import parse_salary
 from location_parser import parse_location
 from perks_detector import detect_perks
@@ -53,24 +50,18 @@ def search_serpapi(
         "tbs": freshness,
     }
 
-    try:
-        resp = client.get(SERPAPI_URL, params=params, timeout=20)
-        if resp.status_code != 200:
-            print(f"  [SERP] HTTP {resp.status_code} for: {query[:60]}", flush=True)
-            return []
-
-        data = resp.json()
+    # Raised errors are counted by the pipeline; messages leave out the URL (it carries the key)
+    resp = client.get(SERPAPI_URL, params=params, timeout=20)
+    if resp.status_code != 200:
+        raise httpx.HTTPStatusError(f"HTTP {resp.status_code} for: {query[:60]}", request=resp.request, response=resp)
 
-        if "error" in data:
-            print(f"  [SERP] API Error: {data['error']}", flush=True)
-            return []
+    data = resp.json()
 
-        results = data.get("organic_results", [])
-        return results
+    if "error" in data:
+        raise RuntimeError(f"API error: {data['error']}")
 
-    except Exception as e:
-        print(f"  [SERP] Error: {e}", flush=True)
-        return []
+    results = data.get("organic_results", [])
+    return results
 
 
 # ─── Auto-discovery: extract company slugs from URLs ──────────
@@ -353,76 +344,48 @@ def calc_serp_score(
     return min(score, 100)
 
 
-def run_serp_scraper() -> None:
-    """Run SerpAPI-based job discovery + auto-expand companies.json."""
-    print(f"\n{'='*60}", flush=True)
-    print(f"[SERP] SerpAPI Job Discovery - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}", flush=True)
-    print(f"{'='*60}\n", flush=True)
-
-    if not SERPAPI_KEY:
-        print("  [!] SERPAPI_KEY not set. Skipping SerpAPI scraping.", flush=True)
-        return
-
-    init_db()
-    all_jobs: list[dict] = []
-    discovered_companies: dict[str, set[str]] = {"greenhouse": set(), "lever": set()}
-    queries = build_queries()
-
-    client = httpx.Client(
-        headers={"User-Agent": USER_AGENT},
-        follow_redirects=True,
-    )
-
-    print(f"  Running {len(queries)} search queries...\n", flush=True)
+# Company slugs seen in results of "discover" queries during this run
+_discovered: dict[str, set[str]] = {"greenhouse": set(), "lever": set()}
 
-    for i, q in enumerate(queries, 1):
-        query_str = q["query"]
-        freshness = q.get("freshness", "qdr:w")
-        label = q.get("label", query_str[:50])
-        should_discover = q.get("discover", False)
 
-        print(f"  [{i}/{len(queries)}] {label}...", end=" ", flush=True)
+def _extract_and_discover(result: dict, query_meta: dict) -> Optional[dict]:
+    # Auto-discover new company slugs
+    if query_meta.get("discover", False):
+        slug_info = extract_slug_from_url(result.get("link", ""))
+        if slug_info:
+            platform, slug = slug_info
+            _discovered[platform].add(slug)
+    return extract_job_from_result(result, query_meta)
 
-        results = search_serpapi(client, query_str, freshness=freshness)
-        jobs_found = 0
-
-        for r in results:
-            job = extract_job_from_result(r, q)
-            if job:
-                all_jobs.append(job)
-                jobs_found += 1
-
-            # Auto-discover new company slugs
-            if should_discover:
-                link = r.get("link", "")
-                slug_info = extract_slug_from_url(link)
-                if slug_info:
-                    platform, slug = slug_info
-                    discovered_companies[platform].add(slug)
-
-        print(f"-> {len(results)} results, {jobs_found} jobs", flush=True)
-
-        # Polite delay between SerpAPI calls
-        time.sleep(random.uniform(1.0, 2.0))
-
-    client.close()
 
+def _expand_discovered() -> None:
     # Auto-expand companies.json with discovered slugs
-    if any(discovered_companies.values()):
+    if any(_discovered.values()):
         print(f"\n[DISCOVER] Checking for new company slugs...", flush=True)
-        new_added = expand_companies_json(discovered_companies)
+        new_added = expand_companies_json(_discovered)
         if new_added == 0:
             print("  No new companies discovered (all already known).", flush=True)
+    for slugs in _discovered.values():
+        slugs.clear()
+
+
+SOURCE = Source(
+    name="serp",
+    tag="SERP",
+    title="SerpAPI Job Discovery",
+    units=build_queries,
+    fetch=lambda client, q: search_serpapi(client, q["query"], freshness=q.get("freshness", "qdr:w")),
+    extract=_extract_and_discover,
+    label=lambda q: q.get("label", q["query"][:50]),
+    delay=(1.0, 2.0),  # polite delay between SerpAPI calls
+    skip_reason=None if SERPAPI_KEY else "SERPAPI_KEY not set",
+    finish=_expand_discovered,
+)
 
-    # Insert jobs
-    new_count = insert_jobs_batch(all_jobs)
 
-    print(f"\n{'='*60}", flush=True)
-    print(f"[OK] SerpAPI Done!", flush=True)
-    print(f"   Total extracted: {len(all_jobs)}", flush=True)
-    print(f"   New jobs added: {new_count}", flush=True)
-    print(f"   Duplicates skipped: {len(all_jobs) - new_count}", flush=True)
-    print(f"{'='*60}\n", flush=True)
+def run_serp_scraper() -> PipelineStats:
+    """Run SerpAPI-based job discovery + auto-expand companies.json."""
+    return run_pipeline([SOURCE])
 
 
 if __name__ == "__main__":
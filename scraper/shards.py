@@ -0,0 +1,298 @@
+"""
+Sharded Scraping — several worker processes share one scrape run.
+
+plan_run() starts a scrape run and splits every source's units into
+batches of SHARD_BATCH_SIZE, one scrape_leases row each. A worker claims
+the next open batch in a BEGIN IMMEDIATE transaction, runs it through the
+normal pipeline (its own Writer, so jobs and unit checkpoints commit
+together), renews the lease before every unit and marks the batch done.
+
+A worker that dies stops renewing; once its lease is LEASE_SECONDS old any
+other worker claims the batch and skips the units already checkpointed.
+Workers that find nothing to claim wait for outstanding leases, so the
+last one standing finishes the run. Fetches are network-bound and overlap
+across workers; SQLite serialises the writes, each held for one batch.
+
+Usage:
+  python daily_run.py --workers 4   # plan a run, start 4 local workers, wait
+  python shards.py                  # join the open run as one more worker
+
+Extra workers can run on other hosts that mount the same volume, provided
+its filesystem supports POSIX locks (SQLite's requirement).
+"""
+import copy
+import json
+import os
+import socket
+import sqlite3
+import subprocess
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import httpx
+
+from config import SHARD_BATCH_SIZE, LEASE_SECONDS, HTTP_FIXTURES
+from db import get_connection, init_db
+from checkpoint import unit_key, start_run, done_units, finish_run
+from pipeline import Source, PipelineStats, StopSource, Writer, run_source, make_client
+
+MAX_ATTEMPTS = 3  # a batch whose worker died this many times is marked failed
+
+
+class LeaseLost(StopSource):
+    """Another worker reclaimed the batch (this one stalled past its lease)."""
+
+
+def _utc(seconds: float = 0.0) -> str:
+    return (datetime.utcnow() + timedelta(seconds=seconds)).isoformat()
+
+
+class Lease:
+    """One claimed batch of units."""
+
+    def __init__(self, conn: sqlite3.Connection, run_id: int, seq: int, source: str,
+                 units: list[str], worker: str) -> None:
+        self.conn = conn
+        self.run_id = run_id
+        self.seq = seq
+        self.source = source
+        self.units = units
+        self.worker = worker
+        self.lost = False
+
+    def renew(self) -> None:
+        cur = self.conn.execute(
+            """UPDATE scrape_leases SET expires_at = ?
+               WHERE run_id = ? AND seq = ? AND worker = ? AND state = 'leased'""",
+            (_utc(LEASE_SECONDS), self.run_id, self.seq, self.worker),
+        )
+        self.conn.commit()
+        if cur.rowcount == 0:
+            self.lost = True
+            raise LeaseLost(f"batch {self.seq} was reclaimed")
+
+    def complete(self, jobs: int, new_jobs: int, seconds: float) -> None:
+        self.conn.execute(
+            """UPDATE scrape_leases SET state = 'done', expires_at = NULL, jobs = ?, new_jobs = ?, seconds = ?
+               WHERE run_id = ? AND seq = ? AND worker = ?""",
+            (jobs, new_jobs, seconds, self.run_id, self.seq, self.worker),
+        )
+        self.conn.commit()
+
+    def release(self) -> None:
+        """Expire the lease now so any worker can claim the batch again (attempts still count)."""
+        self.conn.execute(
+            "UPDATE scrape_leases SET expires_at = ? WHERE run_id = ? AND seq = ? AND worker = ? AND state = 'leased'",
+            (_utc(), self.run_id, self.seq, self.worker),
+        )
+        self.conn.commit()
+
+
+def plan_run(conn: sqlite3.Connection, sources: list[Source], batch_size: int = SHARD_BATCH_SIZE) -> int:
+    """Start a run and write one pending lease per batch of units. Returns the run id."""
+    run_id = start_run(conn)
+    rows = []
+    for source in sources:
+        if source.skip_reason:
+            print(f"[SHARD] {source.name}: {source.skip_reason}. Skipping.", flush=True)
+            continue
+        keys = [unit_key(u) for u in source.units()]
+        for i in range(0, len(keys), batch_size):
+            rows.append((run_id, len(rows), source.name, json.dumps(keys[i:i + batch_size])))
+    conn.executemany("INSERT INTO scrape_leases (run_id, seq, source, units) VALUES (?, ?, ?, ?)", rows)
+    conn.commit()
+    print(f"[SHARD] Run {run_id}: {len(rows)} batches of up to {batch_size} units", flush=True)
+    return run_id
+
+
+def open_run(conn: sqlite3.Connection) -> int | None:
+    """Latest sharded run that still has batches to do."""
+    row = conn.execute(
+        """SELECT l.run_id FROM scrape_leases l JOIN scrape_runs r ON r.id = l.run_id
+           WHERE r.status = 'running' AND l.state IN ('pending', 'leased') ORDER BY l.run_id DESC LIMIT 1"""
+    ).fetchone()
+    return int(row[0]) if row else None
+
+
+def claim(conn: sqlite3.Connection, run_id: int, worker: str) -> Lease | None:
+    """Lease the first pending or expired batch, or None if there is none right now."""
+    now = _utc()
+    conn.execute("BEGIN IMMEDIATE")
+    conn.execute(
+        """UPDATE scrape_leases SET state = 'failed'
+           WHERE run_id = ? AND state = 'leased' AND expires_at < ? AND attempts >= ?""",
+        (run_id, now, MAX_ATTEMPTS),
+    )
+    row = conn.execute(
+        """SELECT seq, source, units FROM scrape_leases
+           WHERE run_id = ? AND (state = 'pending' OR (state = 'leased' AND expires_at < ?))
+           ORDER BY seq LIMIT 1""",
+        (run_id, now),
+    ).fetchone()
+    if row is None:
+        conn.commit()
+        return None
+    conn.execute(
+        """UPDATE scrape_leases SET state = 'leased', worker = ?, expires_at = ?, attempts = attempts + 1
+           WHERE run_id = ? AND seq = ?""",
+        (worker, _utc(LEASE_SECONDS), run_id, row[0]),
+    )
+    conn.commit()
+    return Lease(conn, run_id, int(row[0]), str(row[1]), json.loads(row[2]), worker)
+
+
+def _outstanding(conn: sqlite3.Connection, run_id: int) -> int:
+    """Batches still pending or leased."""
+    return conn.execute(
+        "SELECT COUNT(*) FROM scrape_leases WHERE run_id = ? AND state IN ('pending', 'leased')", (run_id,)
+    ).fetchone()[0]
+
+
+def _leased_source(source: Source, lease: Lease, units: list) -> Source:
+    """The source narrowed to the lease's units, renewing the lease before each fetch."""
+    shard = copy.copy(source)
+
+    def fetch(client: httpx.Client, unit):
+        lease.renew()
+        return source.fetch(client, unit)
+
+    shard.title = f"{source.title} (batch {lease.seq}, {lease.worker})"
+    shard.units = lambda: units
+    shard.fetch = fetch
+    shard.finish = None  # run once per worker, see run_worker
+    return shard
+
+
+def run_worker(run_id: int, sources: list[Source] | None = None, worker: str | None = None,
+               client: httpx.Client | None = None) -> PipelineStats:
+    """Claim and run batches of a sharded run until none are left. Returns this worker's stats."""
+    if sources is None:
+        from scraper import all_sources
+        sources = all_sources()
+    init_db()
+    by_name = {s.name: s for s in sources}
+    worker = worker or f"{socket.gethostname()}:{os.getpid()}"
+    stats = PipelineStats()
+    stats.run_id = run_id
+    own_client = client is None
+    client = client or make_client()
+    conn = get_connection()
+    writer = Writer(stats)
+    seen: set[str] = set()
+    ran: dict[str, Source] = {}
+    try:
+        while True:
+            lease = claim(conn, run_id, worker)
+            if lease is None:
+                if not _outstanding(conn, run_id):
+                    break
+                time.sleep(1.0)  # others still hold leases; one may expire
+                continue
+
+            source = by_name.get(lease.source)
+            if source is None:
+                print(f"[SHARD] {worker}: unknown source {lease.source}, batch {lease.seq} dropped", flush=True)
+                lease.complete(0, 0, 0.0)
+                continue
+            current = {unit_key(u): u for u in source.units()}
+            units = [current[k] for k in lease.units if k in current]
+            skip = done_units(writer.conn, run_id).get(source.name, set())
+
+            start = time.monotonic()
+            per_source = stats.source(source.name)
+            extracted, new, errors = per_source["extracted"], stats.new_jobs, per_source["errors"]
+            ok = run_source(client, _leased_source(source, lease, units), writer, skip, seen, stats)
+            ok = ok and per_source["errors"] == errors  # a failed fetch leaves its unit unchecked
+            if lease.lost:
+                print(f"[SHARD] {worker}: lost batch {lease.seq}; another worker finishes it", flush=True)
+                continue
+            if not ok:
+                # Units it checkpointed are skipped by whichever worker claims it next
+                print(f"[SHARD] {worker}: batch {lease.seq} failed; released for another attempt", flush=True)
+                lease.release()
+                continue
+            lease.complete(per_source["extracted"] - extracted, stats.new_jobs - new,
+                           time.monotonic() - start)
+            ran[source.name] = source
+
+        # Finish hooks (e.g. SerpAPI slug discovery -> companies.json) under
+        # the database write lock, so workers don't interleave file writes
+        for source in ran.values():
+            if source.finish and HTTP_FIXTURES != "replay":
+                conn.execute("BEGIN IMMEDIATE")
+                try:
+                    source.finish()
+                finally:
+                    conn.commit()
+        finish_run(conn, run_id)
+    finally:
+        writer.close()
+        conn.close()
+        if own_client:
+            client.close()
+    stats.report()
+    return stats
+
+
+def report(conn: sqlite3.Connection, run_id: int, elapsed: float) -> tuple[int, int]:
+    """Print per-worker totals and how much batch work overlapped. Returns (jobs, new jobs)."""
+    rows = conn.execute(
+        """SELECT worker, COUNT(*), SUM(jobs), SUM(new_jobs), SUM(seconds), SUM(attempts - 1)
+           FROM scrape_leases WHERE run_id = ? AND state = 'done' GROUP BY worker ORDER BY worker""",
+        (run_id,),
+    ).fetchall()
+    busy = sum(r[4] for r in rows)
+    failed = conn.execute(
+        "SELECT COUNT(*) FROM scrape_leases WHERE run_id = ? AND state = 'failed'", (run_id,)
+    ).fetchone()[0]
+    if failed:
+        print(f"[SHARD] {failed} batches failed {MAX_ATTEMPTS} times and were given up", flush=True)
+    print(f"\n[SHARD] Run {run_id}: {len(rows)} workers, {elapsed:.1f}s wall, {busy:.1f}s of batch work "
+          f"(parallelism {busy / elapsed if elapsed else 0:.2f}x)", flush=True)
+    for worker, batches, jobs, new, seconds, retries in rows:
+        print(f"  {worker:28s} batches={batches:<4} jobs={jobs:<6} new={new:<6} "
+              f"{seconds:7.1f}s reclaimed={retries}", flush=True)
+    return sum(r[2] for r in rows), sum(r[3] for r in rows)
+
+
+def run_sharded(workers: int) -> PipelineStats:
+    """
+    Plan a run, start `workers` local worker processes and wait for them.
+    Batches a crashed worker left behind are finished in this process.
+    """
+    from scraper import all_sources
+    init_db()
+    conn = get_connection()
+    run_id = plan_run(conn, all_sources())
+    start = time.monotonic()
+    host = socket.gethostname()
+    procs = [
+        subprocess.Popen([sys.executable, str(Path(__file__).resolve()), str(run_id), f"{host}:w{i}"])
+        for i in range(workers)
+    ]
+    failed = sum(p.wait() != 0 for p in procs)
+    if failed or _outstanding(conn, run_id):
+        print(f"[SHARD] {failed} worker(s) failed; finishing their batches here", flush=True)
+        run_worker(run_id, worker=f"{host}:main")
+    jobs, new = report(conn, run_id, time.monotonic() - start)
+    conn.close()
+
+    stats = PipelineStats()
+    stats.run_id = run_id
+    stats.stages["extract"].items_out = jobs
+    stats.stages["write"].items_out = new
+    return stats
+
+
+if __name__ == "__main__":
+    # python shards.py [run_id] [worker name] — join a sharded run as a worker
+    init_db()
+    c = get_connection()
+    rid = int(sys.argv[1]) if len(sys.argv) > 1 else open_run(c)
+    c.close()
+    if rid is None:
+        print("[SHARD] No sharded run with open batches", flush=True)
+        sys.exit(0)
+    run_worker(rid, worker=sys.argv[2] if len(sys.argv) > 2 else None)
@@ -0,0 +1,104 @@
+"""
+Read Snapshot Publisher — hands the web tier a compacted, read-only copy of jobs.db.
+
+The scraper writes to data/jobs.db; the web app reads only the snapshot named
+in data/snapshot.json, so page loads never wait on scraper writes or WAL
+checkpoints. Each publish:
+  1. VACUUM INTO a new file (a consistent, defragmented copy)
+  2. rebuilds the FTS index, re-points dedup cluster heads (VACUUM may
+     renumber rowids) and runs ANALYZE
+  3. renames the file into data/snapshots/ and atomically replaces
+     snapshot.json with its version — readers switch on their next check
+The previous snapshot is kept for readers still on it; older ones are removed.
+
+Usage:
+  python snapshot.py      # publish a snapshot now (daily_run.py does this after each run)
+"""
+import json
+import os
+import sqlite3
+import time
+from datetime import datetime
+
+from config import DB_PATH, DATA_DIR
+from db import get_write_generation
+from dedup import repair_cluster_heads
+from schema import get_version, migrate
+
+SNAPSHOT_DIR = DATA_DIR / "snapshots"
+SNAPSHOT_FILE = DATA_DIR / "snapshot.json"
+
+
+def read_manifest() -> dict | None:
+    try:
+        with open(SNAPSHOT_FILE, "r") as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+
+def _write_manifest(manifest: dict) -> None:
+    tmp = SNAPSHOT_FILE.with_suffix(".json.tmp")
+    with open(tmp, "w") as f:
+        json.dump(manifest, f, indent=2)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, SNAPSHOT_FILE)
+
+
+def _prune(keep: set[str]) -> None:
+    for path in SNAPSHOT_DIR.glob("jobs-*.db*"):
+        if path.name in keep:
+            continue
+        try:
+            path.unlink()
+        except OSError:
+            pass  # still open by a reader (Windows); next publish retries
+
+
+def publish_snapshot() -> dict:
+    """Build and publish a new read snapshot. Returns the new manifest."""
+    start = time.time()
+    SNAPSHOT_DIR.mkdir(parents=True, exist_ok=True)
+    current = read_manifest() or {}
+    version = int(current.get("version", 0)) + 1
+    name = f"jobs-{version:06d}.db"
+    tmp = SNAPSHOT_DIR / f"{name}.tmp"
+    tmp.unlink(missing_ok=True)
+
+    src = sqlite3.connect(str(DB_PATH), timeout=30)
+    migrate(src)
+    src.execute("VACUUM INTO ?", (str(tmp),))
+    src.close()
+
+    conn = sqlite3.connect(str(tmp))
+    conn.execute("INSERT INTO jobs_fts(jobs_fts) VALUES('rebuild')")
+    conn.execute("INSERT INTO jobs_fts(jobs_fts) VALUES('optimize')")
+    repair_cluster_heads(conn)
+    conn.execute("ANALYZE")
+    conn.commit()
+    conn.execute("PRAGMA journal_mode = DELETE")
+    row = conn.execute("SELECT cnt FROM job_stats WHERE dim = 'total'").fetchone()
+    manifest = {
+        "version": version,
+        "file": name,
+        "schema_version": get_version(conn),
+        "write_generation": get_write_generation(conn),
+        "jobs": int(row[0]) if row else 0,
+        "published_at": datetime.utcnow().isoformat() + "Z",
+    }
+    conn.close()
+
+    os.replace(tmp, SNAPSHOT_DIR / name)
+    _write_manifest(manifest)
+
+    _prune({name, current.get("file", "")})
+
+    size_mb = (SNAPSHOT_DIR / name).stat().st_size / 1e6
+    print(f"[SNAPSHOT] Published v{version} ({manifest['jobs']} jobs, {size_mb:.1f} MB) "
+          f"in {time.time() - start:.1f}s", flush=True)
+    return manifest
+
+
+if __name__ == "__main__":
+    publish_snapshot()
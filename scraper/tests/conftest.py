@@ -0,0 +1,36 @@
+"""Shared test setup: scraper modules importable, data directory in a temp dir."""
+import os
+import sqlite3
+import sys
+import tempfile
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("RAILWAY_VOLUME_MOUNT_PATH", tempfile.mkdtemp(prefix="jobhorizon-test-"))
+
+import companies  # noqa: E402
+import db as jobs_db  # noqa: E402
+from schema import migrate  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def fresh_id_caches():
+    """Id caches are per process and assume one database; each test has its own."""
+    jobs_db._source_ids.clear()
+    jobs_db._pending_sources.clear()
+    companies._alias_ids.clear()
+    companies._key_ids.clear()
+    companies.drop_pending()
+    companies._loaded = False
+
+
+@pytest.fixture
+def conn():
+    """An in-memory database with every migration applied."""
+    db = sqlite3.connect(":memory:")
+    db.row_factory = sqlite3.Row
+    migrate(db)
+    yield db
+    db.close()
@@ -0,0 +1,38 @@
+"""Keyset cursors page without gaps and are refused once rowids may have moved."""
+import pytest
+
+from db import get_connection, get_jobs_page, init_db, insert_job
+
+
+@pytest.fixture
+def listing():
+    init_db()
+    conn = get_connection()
+    conn.execute("DELETE FROM jobs")
+    for i in range(7):
+        insert_job(conn, {"title": f"Engineer {i}", "company": "Acme", "location": "Pune",
+                          "apply_url": f"https://example.com/{i}", "source": "lever", "match_score": 80})
+    conn.execute("UPDATE jobs SET created_at = '2026-01-01T00:00:00'")  # all tied: rowid decides
+    conn.commit()
+    yield conn
+    conn.close()
+
+
+def test_pages_cover_every_job_once(listing):
+    seen, cursor = [], None
+    while True:
+        page = get_jobs_page(limit=3, cursor=cursor)
+        seen += [j["id"] for j in page["jobs"]]
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+    assert sorted(seen) == sorted(r[0] for r in listing.execute("SELECT id FROM jobs"))
+
+
+def test_cursor_refused_after_compaction(listing):
+    cursor = get_jobs_page(limit=3)["next_cursor"]
+    listing.execute("UPDATE meta SET value = value + 1 WHERE key = 'rowid_generation'")  # as compact_db does
+    listing.execute("UPDATE meta SET value = value + 1 WHERE key = 'write_generation'")
+    listing.commit()
+    with pytest.raises(ValueError, match="compacted"):
+        get_jobs_page(limit=3, cursor=cursor)
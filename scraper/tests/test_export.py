@@ -0,0 +1,61 @@
+"""Incremental export: added columns, dropped columns and reused rowids."""
+import sqlite3
+
+import pytest
+
+import export
+from db import insert_job
+from schema import migrate
+
+
+@pytest.fixture
+def db_file(tmp_path, monkeypatch):
+    path = tmp_path / "jobs.db"
+    conn = sqlite3.connect(path)
+    migrate(conn)
+    conn.close()
+    monkeypatch.setattr(export, "EXPORT_DIR", tmp_path / "export")
+    monkeypatch.setattr(export, "MANIFEST_FILE", tmp_path / "export" / "manifest.json")
+    monkeypatch.setattr(export, "pa", None)
+    monkeypatch.setattr(export, "get_connection", lambda: sqlite3.connect(path))
+    conn = sqlite3.connect(path)
+    yield conn
+    conn.close()
+
+
+def add(conn, i: int) -> None:
+    insert_job(conn, {"title": f"Engineer {i}", "company": "Acme", "location": "Pune",
+                      "apply_url": f"https://example.com/{i}", "source": "lever"})
+    conn.commit()
+
+
+def test_added_column_goes_to_new_files(db_file):
+    add(db_file, 1)
+    export.export_jobs()
+    db_file.execute("ALTER TABLE jobs ADD COLUMN note TEXT")
+    add(db_file, 2)
+    manifest = export.export_jobs()
+    assert manifest["rows"] == 2
+    assert "note" not in manifest["files"][0]["columns"]
+    assert manifest["files"][-1]["columns"][-1] == "note"
+
+
+def test_dropped_column_refuses(db_file):
+    db_file.execute("ALTER TABLE jobs ADD COLUMN note TEXT")
+    add(db_file, 1)
+    export.export_jobs()
+    db_file.execute("ALTER TABLE jobs DROP COLUMN note")
+    with pytest.raises(RuntimeError, match="note dropped"):
+        export.export_jobs()
+
+
+def test_reused_rowid_is_exported(db_file):
+    add(db_file, 1)
+    add(db_file, 2)
+    export.export_jobs()
+    db_file.execute("DELETE FROM jobs WHERE rowid = 2")
+    add(db_file, 3)   # takes rowid 2 again
+    assert db_file.execute("SELECT rowid FROM jobs WHERE title = 'Engineer 3'").fetchone()[0] == 2
+    manifest = export.export_jobs()
+    assert manifest["runs"][-1]["reused_rowids"] == 1
+    assert export.export_jobs()["runs"][-1]["rows"] == 0
@@ -0,0 +1,11 @@
+"""Listing filters: the score floor must not drive COUNT plans."""
+import pytest
+
+from db import build_job_filters
+
+
+@pytest.mark.parametrize("filters", [{"source": "lever"}, {"faang_only": True}, {"smart_view": True}, {}])
+def test_score_floor_is_not_an_index_term(conn, filters):
+    where, params = build_job_filters(**filters)
+    plan = " ".join(r[3] for r in conn.execute(f"EXPLAIN QUERY PLAN SELECT COUNT(*) FROM jobs {where}", params))
+    assert "match_score>?" not in plan
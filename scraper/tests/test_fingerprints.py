@@ -0,0 +1,29 @@
+"""Board fingerprints: postings whose extract failed are retried next run."""
+from fingerprints import BoardIndex, record_boards
+
+POSTINGS = {"1": "v1", "2": "v1", "3": "v1"}
+
+
+def test_failed_extract_is_retried(conn):
+    diff = BoardIndex(conn, "greenhouse").diff("acme", POSTINGS)
+    assert diff.todo == {"1", "2", "3"}
+    diff.failed.add("2")
+    record_boards(conn, None, "greenhouse", [diff])
+    conn.commit()
+
+    again = BoardIndex(conn, "greenhouse").diff("acme", POSTINGS)
+    assert again.todo == {"2"}
+    record_boards(conn, None, "greenhouse", [again])
+    conn.commit()
+    assert BoardIndex(conn, "greenhouse").diff("acme", POSTINGS).todo == set()
+
+
+def test_failed_after_rules_change_is_retried(conn):
+    first = BoardIndex(conn, "greenhouse").diff("acme", POSTINGS)
+    record_boards(conn, None, "greenhouse", [first])
+    conn.execute("UPDATE board_state SET rules = 'old'")
+    redo = BoardIndex(conn, "greenhouse").diff("acme", POSTINGS)
+    assert redo.todo == {"1", "2", "3"}
+    redo.failed.add("3")
+    record_boards(conn, None, "greenhouse", [redo])
+    assert BoardIndex(conn, "greenhouse").diff("acme", POSTINGS).todo == {"3"}
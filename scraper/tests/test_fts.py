@@ -0,0 +1,45 @@
+"""Keyword search recall: FTS must find what the old LIKE search found."""
+import pytest
+
+from db import build_job_filters, insert_job
+
+TITLES = ["Full-Stack Developer", "SDE-2", "Senior Software Engineer", "React.js Engineer", "Full Stack Engineer"]
+
+
+@pytest.fixture
+def jobs(conn):
+    for i, title in enumerate(TITLES):
+        insert_job(conn, {"title": title, "company": f"Acme {i}", "location": "Bengaluru",
+                          "apply_url": f"https://example.com/{i}", "source": "greenhouse"})
+    conn.commit()
+    return conn
+
+
+def search(conn, keyword: str) -> set[str]:
+    where, params = build_job_filters(keyword=keyword)
+    return {r["title"] for r in conn.execute(f"SELECT title FROM jobs {where}", params)}
+
+
+def like(conn, keyword: str) -> set[str]:
+    kw = f"%{keyword.lower()}%"
+    return {r["title"] for r in conn.execute("SELECT title FROM jobs WHERE LOWER(title) LIKE ?", (kw,))}
+
+
+@pytest.mark.parametrize("keyword", ["fullstack", "full-stack", "Full-Stack", "full stack", "fullst"])
+def test_full_stack_spellings(jobs, keyword):
+    assert "Full-Stack Developer" in search(jobs, keyword)
+
+
+@pytest.mark.parametrize("keyword", ["sde2", "sde-2", "SDE 2", "SDE-2"])
+def test_sde_2_spellings(jobs, keyword):
+    assert search(jobs, keyword) == {"SDE-2"}
+
+
+@pytest.mark.parametrize("keyword", ["fullstack", "full-stack", "sde2", "sde-2", "reactjs", "react.js", "engineer"])
+def test_recall_at_least_like(jobs, keyword):
+    assert like(jobs, keyword) <= search(jobs, keyword)
+
+
+def test_fts_follows_deletes(jobs):
+    jobs.execute("DELETE FROM jobs WHERE title = 'SDE-2'")
+    assert search(jobs, "sde2") == set()
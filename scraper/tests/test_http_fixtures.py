@@ -0,0 +1,25 @@
+"""Record/replay round trip, and no finish-hook side effects while replaying."""
+import httpx
+
+import pipeline
+from http_fixtures import FixtureStore, RecordingTransport, ReplayTransport
+from pipeline import PipelineStats, Source, Writer, run_source
+
+
+def test_record_then_replay(tmp_path):
+    live = httpx.Client(transport=httpx.MockTransport(lambda request: httpx.Response(200, text="hello")))
+    with httpx.Client(transport=RecordingTransport(FixtureStore(tmp_path), live)) as client:
+        assert client.get("https://example.com/a?api_key=secret&b=1").text == "hello"
+    with httpx.Client(transport=ReplayTransport(FixtureStore(tmp_path))) as client:
+        assert client.get("https://example.com/a?b=1&api_key=other").text == "hello"
+
+
+def test_replay_skips_finish_hook(conn, monkeypatch):
+    monkeypatch.setattr(pipeline, "HTTP_FIXTURES", "replay")
+    calls = []
+    source = Source("fake", "FK", "Fake", lambda: [], lambda client, unit: [], lambda raw, unit: None,
+                    finish=lambda: calls.append(1))
+    monkeypatch.setattr(pipeline, "get_connection", lambda: conn)
+    writer = Writer(PipelineStats())
+    assert run_source(None, source, writer, set(), set(), writer.stats)
+    assert calls == []
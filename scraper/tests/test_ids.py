@@ -0,0 +1,81 @@
+"""Id caches (sources, companies) never hand out ids from a rolled-back transaction."""
+import pytest
+
+import companies
+import db as jobs_db
+import pipeline
+from companies import resolve_company
+from db import insert_job, source_id
+
+
+def _job(i: int, source: str = "greenhouse", company: str = "Acme") -> dict:
+    return {"title": f"Engineer {i}", "company": company, "location": "Bengaluru",
+            "apply_url": f"https://example.com/{i}", "source": source}
+
+
+def test_source_id_after_rollback(conn):
+    insert_job(conn, _job(1, source="newboard"))
+    conn.rollback()
+    insert_job(conn, _job(2, source="newboard"))
+    conn.commit()
+    sid = conn.execute("SELECT source_id FROM jobs").fetchone()[0]
+    assert conn.execute("SELECT name FROM sources WHERE id = ?", (sid,)).fetchone()[0] == "newboard"
+
+
+def test_source_id_cached_once_committed(conn):
+    sid = source_id(conn, "lever")
+    conn.commit()
+    assert source_id(conn, "lever") == sid
+    conn.execute("DELETE FROM sources")
+    conn.commit()
+    assert source_id(conn, "lever") == sid   # served from the cache now
+
+
+def test_company_id_after_rollback(conn):
+    insert_job(conn, _job(1, company="Brand New Co"))
+    conn.rollback()
+    insert_job(conn, _job(2, company="Brand New Co"))
+    conn.commit()
+    cid = conn.execute("SELECT company_id FROM jobs").fetchone()[0]
+    assert conn.execute("SELECT name FROM companies WHERE id = ?", (cid,)).fetchone()[0] == "Brand New Co"
+    assert conn.execute("SELECT company_id FROM company_aliases WHERE alias = 'brandnewco'").fetchone()[0] == cid
+
+
+def test_existing_alias_wins(conn):
+    # Another writer stored the alias for a different company first
+    a = resolve_company(conn, "Alpha Corp")
+    conn.commit()
+    companies._alias_ids.clear()
+    conn.execute("INSERT INTO companies (key, name) VALUES ('betacorp', 'Beta Corp')")
+    conn.execute("INSERT INTO company_aliases (alias, company_id) VALUES ('betacorpltd', ?)", (a,))
+    conn.commit()
+    assert resolve_company(conn, "Beta Corp Ltd") == a
+    assert companies._alias_ids.get("betacorpltd", a) == a
+
+
+@pytest.fixture
+def writer(conn, monkeypatch):
+    monkeypatch.setattr(pipeline, "get_connection", lambda: conn)
+    return pipeline.Writer(pipeline.PipelineStats())
+
+
+def test_writer_warms_resolver(writer):
+    # Loaded before the first batch transaction, board slugs included
+    assert companies._loaded
+    slug = companies.squash(companies.board_slugs()[0])
+    assert slug in companies._alias_ids
+
+
+def test_committed_batch_ids_are_cached(writer):
+    writer.add(_job(1, source="newboard", company="Brand New Co"))
+    writer.flush()
+    assert "brandnewco" in companies._alias_ids
+    assert "newboard" in jobs_db._source_ids
+
+
+def test_rolled_back_ids_stay_pending_only(conn):
+    insert_job(conn, _job(1, source="newboard", company="Brand New Co"))
+    assert "brandnewco" not in companies._alias_ids
+    conn.rollback()
+    jobs_db.ids_rolled_back()
+    assert not companies._pending_aliases and not jobs_db._pending_sources
@@ -0,0 +1,15 @@
+"""Index advisor plan checks."""
+from index_advisor import plan_issues
+
+
+def test_score_only_range_is_flagged():
+    assert plan_issues(["SEARCH jobs USING INDEX idx_jobs_sort_score (match_score>?)"]) == ["score-only range"]
+
+
+def test_covering_or_constrained_ranges_are_ok():
+    assert plan_issues(["SEARCH jobs USING COVERING INDEX idx_jobs_sort_score (match_score>?)"]) == []
+    assert plan_issues(["SEARCH jobs USING INDEX idx_jobs_country (country=?)"]) == []
+
+
+def test_full_scan_and_sort():
+    assert plan_issues(["SCAN jobs", "USE TEMP B-TREE FOR ORDER BY"]) == ["full scan", "temp b-tree sort"]
@@ -0,0 +1,66 @@
+"""Writer batches survive failed commits; concurrent inserts of one id don't raise."""
+import pytest
+
+import db as jobs_db
+import pipeline
+from db import insert_job
+from pipeline import PipelineStats, Source, Writer, run_source
+
+JOB = {"title": "Engineer", "company": "Acme", "location": "Pune",
+       "apply_url": "https://example.com/1", "source": "lever"}
+
+
+@pytest.fixture
+def writer(conn, monkeypatch):
+    monkeypatch.setattr(pipeline, "get_connection", lambda: conn)
+    return Writer(PipelineStats())
+
+
+def test_insert_race_is_not_an_error(conn, monkeypatch):
+    # Another worker inserted the id after this one's existence check
+    monkeypatch.setattr(jobs_db, "job_exists", lambda conn, job_id: False)
+    assert insert_job(conn, JOB)
+    assert not insert_job(conn, JOB)
+    assert conn.execute("SELECT COUNT(*) FROM jobs").fetchone()[0] == 1
+
+
+def test_failed_flush_keeps_batch(writer, monkeypatch):
+    writer.add(dict(JOB))
+
+    def locked(conn):
+        raise RuntimeError("database is locked")
+
+    monkeypatch.setattr(pipeline, "bump_write_generation", locked)
+    with pytest.raises(RuntimeError):
+        writer.flush()
+    assert len(writer.batch) == 1
+    monkeypatch.undo()
+    assert writer.flush() == 1
+    assert writer.batch == []
+
+
+def test_failing_source_reports_error(writer):
+    def finish():
+        raise RuntimeError("boom")
+
+    source = Source("fake", "FK", "Fake", lambda: ["a"], lambda client, unit: [dict(JOB)],
+                    lambda raw, unit: raw, finish=finish)
+    assert not run_source(None, source, writer, set(), set(), writer.stats)
+    assert writer.conn.execute("SELECT COUNT(*) FROM jobs").fetchone()[0] == 1
+
+
+def test_failed_fetch_leaves_unit_open(monkeypatch):
+    monkeypatch.setattr(pipeline, "HTTP_FIXTURES", "replay")  # no polite delays
+
+    def fetch(client, unit):
+        if unit == "down":
+            raise RuntimeError("HTTP 503")
+        return [dict(JOB, title=f"Engineer {unit}")]
+
+    source = Source("fake", "FK", "Fake", lambda: ["up", "down"], fetch, lambda raw, unit: raw)
+    stats = PipelineStats()
+    items = list(pipeline._fetch_and_extract(None, source, set(), None, stats))
+    done = [i.unit for i in items if isinstance(i, pipeline.UnitDone)]
+    assert done == ["up"]
+    assert stats.stages["fetch"].errors == 1
+    assert stats.source("fake")["errors"] == 1
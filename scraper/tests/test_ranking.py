@@ -0,0 +1,99 @@
+"""Smart rank: score bounds, freshness decay, source weighting and the backfill."""
+from datetime import datetime, timedelta
+
+import pytest
+
+from db import assign_sources, insert_job, source_id
+from ranking import (
+    FRESHNESS_BUCKETS, FRESHNESS_FLOOR, SOURCE_QUALITY, SOURCE_QUALITY_DEFAULT,
+    freshness_points, refresh_smart_scores, smart_score, source_quality,
+)
+
+NOW = datetime(2026, 3, 10, 15, 30)
+
+
+def _days_ago(days: float) -> str:
+    return (NOW - timedelta(days=days)).isoformat()
+
+
+def test_score_upper_bound():
+    assert smart_score(100, _days_ago(0), None, 500.0, "jsearch", NOW) == 100
+
+
+def test_score_lower_bound():
+    low = smart_score(0, "2020-01-01", None, None, "adzuna", NOW)
+    assert low == FRESHNESS_FLOOR * 0.25 + 30 * 0.2
+    assert low > 0
+
+
+@pytest.mark.parametrize("match", [None, 0, 35, 100])
+@pytest.mark.parametrize("salary", [None, -1.0, 0, 12.5, 1000.0])
+@pytest.mark.parametrize("source", [None, "", "greenhouse", "serp_lever", "somewhere"])
+def test_score_within_bounds(match, salary, source):
+    assert 0 <= smart_score(match, _days_ago(2), None, salary, source, NOW) <= 100
+
+
+def test_freshness_buckets():
+    assert freshness_points(_days_ago(0), None, NOW) == 100
+    assert freshness_points(_days_ago(0.5), None, NOW) == 80
+    assert freshness_points(_days_ago(2), None, NOW) == 50
+    assert freshness_points(_days_ago(6), None, NOW) == 20
+    assert freshness_points(_days_ago(8), None, NOW) == FRESHNESS_FLOOR
+
+
+def test_freshness_never_increases_with_age():
+    ages = [i / 4 for i in range(0, 60)]
+    points = [freshness_points(_days_ago(a), None, NOW) for a in ages]
+    assert points == sorted(points, reverse=True)
+    assert points[-1] == FRESHNESS_FLOOR
+    assert FRESHNESS_BUCKETS[0][1] == points[0]
+
+
+def test_freshness_falls_back_to_created_at():
+    assert freshness_points(None, _days_ago(0.5), NOW) == 80
+    assert freshness_points("not a date", _days_ago(0), NOW) == FRESHNESS_FLOOR
+    assert freshness_points(None, None, NOW) == FRESHNESS_FLOOR
+
+
+def test_recency_decay_lowers_score():
+    fresh = smart_score(80, _days_ago(0), None, None, "lever", NOW)
+    week = smart_score(80, _days_ago(6), None, None, "lever", NOW)
+    old = smart_score(80, _days_ago(30), None, None, "lever", NOW)
+    assert fresh > week > old
+    assert fresh - old == pytest.approx((100 - FRESHNESS_FLOOR) * 0.25)
+
+
+@pytest.mark.parametrize("name,points", [
+    ("jsearch", 100), ("greenhouse", 95), ("serp_greenhouse", 95), ("Lever", 90),
+    ("serp", 40), ("serp_workable", 40), ("adzuna", 30), ("remoteok", SOURCE_QUALITY_DEFAULT),
+    ("", SOURCE_QUALITY_DEFAULT), (None, SOURCE_QUALITY_DEFAULT),
+])
+def test_source_quality(name, points):
+    assert source_quality(name) == points
+
+
+def test_source_weighting_orders_equal_jobs():
+    scores = [smart_score(70, _days_ago(1), None, None, name, NOW) for name, _ in SOURCE_QUALITY]
+    assert scores == sorted(scores, reverse=True)
+    assert scores[0] - scores[-1] == pytest.approx((SOURCE_QUALITY[0][1] - SOURCE_QUALITY[-1][1]) * 0.2)
+
+
+def test_sources_table_uses_ranking_quality(conn):
+    for name in ["greenhouse", "serp_lever", "adzuna", "brand_new_feed"]:
+        sid = source_id(conn, name)
+        quality = conn.execute("SELECT quality FROM sources WHERE id = ?", (sid,)).fetchone()[0]
+        assert quality == source_quality(name)
+
+
+def test_refresh_backfills_unscored_rows(conn):
+    insert_job(conn, {"title": "Backend Engineer", "company": "Acme", "location": "Pune",
+                      "apply_url": "https://example.com/1", "source": "lever", "match_score": 80})
+    # A row as it looked right after migration 0006: unscored, no source_id
+    conn.execute("UPDATE jobs SET smart_score = 0, source_id = NULL")
+    conn.execute("DELETE FROM meta WHERE key = 'smart_refreshed_at'")
+
+    assert assign_sources(conn) == 1
+    assert refresh_smart_scores(conn) == 1
+    row = conn.execute("SELECT smart_score, posted_date, created_at, source_id FROM jobs").fetchone()
+    assert row["smart_score"] == smart_score(80, row["posted_date"], row["created_at"], None, "lever")
+    assert row["source_id"] == source_id(conn, "lever")
@@ -0,0 +1,29 @@
+"""Retention deletes by created_at to the second and keeps saved jobs."""
+from datetime import datetime, timedelta
+
+import daily_run
+from db import get_connection, init_db, insert_job
+
+
+def _job(i: int) -> dict:
+    return {"title": f"Engineer {i}", "company": "Acme", "location": "Pune",
+            "apply_url": f"https://example.com/{i}", "source": "lever"}
+
+
+def test_cutoff_is_a_timestamp():
+    init_db()
+    conn = get_connection()
+    conn.execute("DELETE FROM jobs")
+    now = datetime.utcnow()
+    # Minutes either side of the cutoff: a whole-day compare keeps or drops both alike
+    ages = {"old": timedelta(days=30, minutes=5), "young": timedelta(days=30) - timedelta(minutes=5),
+            "saved": timedelta(days=40)}
+    for i, (label, age) in enumerate(ages.items()):
+        insert_job(conn, _job(i))
+        conn.execute("UPDATE jobs SET created_at = ?, saved = ?, title = ? WHERE title = ?",
+                     ((now - age).isoformat(), int(label == "saved"), label, f"Engineer {i}"))
+    conn.commit()
+
+    assert daily_run.cleanup_old_jobs(max_age_days=30, archive=False) == 1
+    assert sorted(r[0] for r in conn.execute("SELECT title FROM jobs")) == ["saved", "young"]
+    conn.close()
@@ -0,0 +1,34 @@
+"""Budget scheduler rates: boards skipped as unchanged are not zero-yield samples."""
+from pipeline import Source
+from scheduler import PRIOR_JOBS, estimate
+
+
+def _source() -> Source:
+    return Source("greenhouse", "GH", "Greenhouse", lambda: ["busy", "quiet", "new"],
+                  lambda client, unit: [], lambda raw, unit: None)
+
+
+def _run(conn, run_id: int, unit: str, jobs: int, seconds: float, unchanged: bool) -> None:
+    conn.execute("INSERT OR IGNORE INTO scrape_runs (id, started_at) VALUES (?, '2026-10-01')", (run_id,))
+    conn.execute("INSERT INTO scrape_checkpoints (run_id, source, unit, results, jobs, seconds, done_at) "
+                 "VALUES (?, 'greenhouse', ?, 10, ?, ?, '2026-10-01')", (run_id, unit, jobs, seconds))
+    conn.execute("INSERT INTO board_diffs (run_id, source, board, added, unchanged) VALUES (?, 'greenhouse', ?, ?, ?)",
+                 (run_id, unit, 0 if unchanged else 10, 10 if unchanged else 0))
+
+
+def test_unchanged_runs_are_not_rate_samples(conn):
+    _run(conn, 1, "busy", 8, 1.0, False)
+    _run(conn, 2, "busy", 0, 1.0, True)
+    _run(conn, 1, "quiet", 4, 2.0, False)
+    _run(conn, 2, "quiet", 0, 0.5, True)
+    by_unit = {u.unit: u for u in estimate(conn, [_source()])}
+    assert by_unit["busy"].jobs == 8
+    assert by_unit["quiet"].jobs == 4
+    assert by_unit["quiet"].seconds == 1.25   # unchanged runs still count towards time
+
+
+def test_only_unchanged_history_uses_the_prior(conn):
+    _run(conn, 1, "quiet", 0, 1.0, True)
+    by_unit = {u.unit: u for u in estimate(conn, [_source()])}
+    assert by_unit["quiet"].jobs == PRIOR_JOBS
+    assert by_unit["quiet"].rate > 0
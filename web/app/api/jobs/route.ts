@@ -1,5 +1,5 @@
 import { NextRequest, NextResponse } from "next/server";
-import { getJobs, getStats } from "@/lib/db";
+import { getJobs, getStats, CursorError, APPROX_COUNT_CAP } from "@/lib/db";
 import fs from "fs";
 import path from "path";
 
@@ -50,6 +50,10 @@ export async function GET(request: NextRequest) {
             : undefined;
         const visa_only = searchParams.get("visa") === "true";
         const equity_only = searchParams.get("equity") === "true";
+        const collapse = searchParams.get("collapse") === "true";
+        const cursor = searchParams.get("cursor") || undefined;
+        const count_cap = searchParams.get("approx_count") === "true" ? APPROX_COUNT_CAP : undefined;
+        const facets = searchParams.get("facets") === "true";
 
         const result = getJobs({
             page,
@@ -70,10 +74,17 @@ export async function GET(request: NextRequest) {
             max_salary,
             visa_only,
             equity_only,
+            collapse,
+            cursor,
+            count_cap,
+            facets,
         });
 
         return NextResponse.json(result);
     } catch (error: unknown) {
+        if (error instanceof CursorError) {
+            return NextResponse.json({ error: error.message }, { status: 400 });
+        }
         const message = error instanceof Error ? error.message : "Failed to fetch jobs";
         console.error("API Error:", error);
         return NextResponse.json({ error: message }, { status: 500 });
@@ -2,6 +2,7 @@ import { NextRequest, NextResponse } from "next/server";
 import Database from "better-sqlite3";
 import path from "path";
 import fs from "fs";
+import { ensureSchema } from "@/lib/schema";
 
 const DATA_DIR = process.env.RAILWAY_VOLUME_MOUNT_PATH
     ? path.resolve(process.env.RAILWAY_VOLUME_MOUNT_PATH)
@@ -10,7 +11,14 @@ const DB_PATH = path.join(DATA_DIR, "jobs.db");
 
 function getWriteDb() {
     fs.mkdirSync(DATA_DIR, { recursive: true });
-    return new Database(DB_PATH);
+    const db = new Database(DB_PATH);
+    ensureSchema(db);
+    return db;
+}
+
+// Invalidate cached counts/results in readers (see migration 0004)
+function bumpWriteGeneration(db: Database.Database) {
+    db.prepare("UPDATE meta SET value = value + 1 WHERE key = 'write_generation'").run();
 }
 
 export async function POST(request: NextRequest) {
@@ -26,13 +34,16 @@ export async function POST(request: NextRequest) {
 
         if (action === "save") {
             db.prepare("UPDATE jobs SET saved = 1 WHERE id = ?").run(job_id);
+            bumpWriteGeneration(db);
         } else if (action === "unsave") {
             db.prepare("UPDATE jobs SET saved = 0 WHERE id = ?").run(job_id);
+            bumpWriteGeneration(db);
         } else if (action === "toggle") {
             const row = db.prepare("SELECT saved FROM jobs WHERE id = ?").get(job_id) as { saved: number } | undefined;
             if (row) {
                 const newVal = row.saved === 1 ? 0 : 1;
                 db.prepare("UPDATE jobs SET saved = ? WHERE id = ?").run(newVal, job_id);
+                bumpWriteGeneration(db);
                 db.close();
                 return NextResponse.json({ saved: newVal === 1 });
             } else {
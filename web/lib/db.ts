@@ -1,6 +1,7 @@
 import Database from "better-sqlite3";
 import path from "path";
 import fs from "fs";
+import { ensureSchema, latestVersion } from "./schema";
 
 // Railway volume or local data dir
 const DATA_DIR = process.env.RAILWAY_VOLUME_MOUNT_PATH
@@ -8,49 +9,88 @@ const DATA_DIR = process.env.RAILWAY_VOLUME_MOUNT_PATH
   : path.resolve(process.cwd(), "..", "data");
 const DB_PATH = path.join(DATA_DIR, "jobs.db");
 
+// Read snapshot published by scraper/snapshot.py at the end of each run.
+// Reads go to the snapshot so they never contend with scraper writes; the
+// live jobs.db is only used until the first snapshot exists (or when the
+// snapshot predates this build's migrations).
+const SNAPSHOT_FILE = path.join(DATA_DIR, "snapshot.json");
+const SNAPSHOT_DIR = path.join(DATA_DIR, "snapshots");
+const SNAPSHOT_CHECK_MS = 5000;
+
+interface SnapshotManifest {
+  version: number;
+  file: string;
+  schema_version: number;
+}
+
 let db: Database.Database | null = null;
+let dbVersion: number | null = null; // snapshot version, null = live jobs.db
+let lastSnapshotCheck = 0;
+
+function readSnapshotManifest(): SnapshotManifest | null {
+  try {
+    return JSON.parse(fs.readFileSync(SNAPSHOT_FILE, "utf-8")) as SnapshotManifest;
+  } catch {
+    return null;
+  }
+}
+
+function openSnapshot(snap: SnapshotManifest): Database.Database | null {
+  if (snap.schema_version < latestVersion()) return null;
+  try {
+    return new Database(path.join(SNAPSHOT_DIR, snap.file), { readonly: true, fileMustExist: true });
+  } catch {
+    return null;
+  }
+}
 
 function getDb(): Database.Database {
-  if (!db) {
+  const now = Date.now();
+  if (db && now - lastSnapshotCheck < SNAPSHOT_CHECK_MS) return db;
+  lastSnapshotCheck = now;
+
+  const snap = readSnapshotManifest();
+  if (snap && snap.version === dbVersion && db) return db;
+
+  const next = snap ? openSnapshot(snap) : null;
+  if (snap && next) {
+    db?.close();
+    db = next;
+    dbVersion = snap.version;
+    countCache.clear();
+  } else if (!db || dbVersion !== null) {
     // Ensure data directory exists
     fs.mkdirSync(DATA_DIR, { recursive: true });
 
-    // If DB doesn't exist yet, create it with the jobs table
-    if (!fs.existsSync(DB_PATH)) {
-      const initDb = new Database(DB_PATH);
-      initDb.exec(`CREATE TABLE IF NOT EXISTS jobs (
-        id TEXT PRIMARY KEY,
-        title TEXT NOT NULL,
-        company TEXT NOT NULL,
-        location TEXT DEFAULT '',
-        remote INTEGER DEFAULT 0,
-        apply_url TEXT NOT NULL,
-        source TEXT NOT NULL,
-        posted_date TEXT,
-        match_score INTEGER DEFAULT 0,
-        saved INTEGER DEFAULT 0,
-        created_at TEXT NOT NULL,
-        country TEXT DEFAULT '',
-        state TEXT DEFAULT '',
-        city TEXT DEFAULT '',
-        is_india INTEGER DEFAULT 0,
-        is_faang INTEGER DEFAULT 0,
-        salary_min_lpa REAL,
-        salary_max_lpa REAL,
-        salary_currency TEXT DEFAULT '',
-        source_type TEXT DEFAULT 'ATS',
-        visa_sponsored INTEGER DEFAULT 0,
-        has_equity INTEGER DEFAULT 0
-      )`);
-      initDb.close();
-    }
-
+    db?.close();
     db = new Database(DB_PATH);
     db.pragma("journal_mode = WAL");
+    ensureSchema(db);
+    dbVersion = null;
+    countCache.clear();
   }
   return db;
 }
 
+// Saves are written to the live jobs.db (app/api/save) and only reach a
+// snapshot at the next publish, so rows read from a snapshot take `saved`
+// from the live database. One primary-key lookup per page of results.
+let liveDb: Database.Database | null = null;
+
+function overlaySaved(jobs: Job[]): void {
+  if (dbVersion === null || jobs.length === 0) return;
+  try {
+    if (!liveDb) liveDb = new Database(DB_PATH, { readonly: true, fileMustExist: true });
+    const rows = liveDb
+      .prepare(`SELECT id, saved FROM jobs WHERE id IN (${jobs.map(() => "?").join(",")})`)
+      .all(...jobs.map(j => j.id)) as { id: string; saved: number }[];
+    const saved = new Map(rows.map(r => [r.id, r.saved]));
+    for (const job of jobs) job.saved = saved.get(job.id) ?? job.saved;
+  } catch {
+    // Live database unavailable: the snapshot's value stands
+  }
+}
+
 export interface Job {
   id: string;
   title: string;
@@ -74,13 +114,30 @@ export interface Job {
   source_type: string;
   visa_sponsored: number;
   has_equity: number;
+  smart_score: number;
+  cluster_id: number | null;
+  company_id: number | null;
 }
 
 export interface JobsResponse {
   jobs: Job[];
   total: number;
+  total_is_estimate: boolean;
   page: number;
   per_page: number;
+  next_cursor: string | null;
+  facets?: Facets;
+}
+
+export interface Facets {
+  total: number;
+  country: Record<string, number>;
+  source: Record<string, number>;
+  salary: Record<string, number>;
+  remote: number;
+  faang: number;
+  visa: number;
+  equity: number;
 }
 
 export interface StatsResponse {
@@ -94,6 +151,201 @@ export interface StatsResponse {
   with_salary: number;
 }
 
+// Cap used for approximate totals on very broad filters ("1000+ jobs")
+export const APPROX_COUNT_CAP = 1000;
+
+// COUNT(*) per filter signature, valid until the write generation moves
+// (bumped by every write batch — see migration 0004).
+const COUNT_CACHE_MAX = 512;
+const countCache = new Map<string, { generation: number; total: number; estimated: boolean }>();
+
+function writeGeneration(db: Database.Database): number {
+  const row = db.prepare("SELECT value FROM meta WHERE key = 'write_generation'").get() as { value: number } | undefined;
+  return row ? row.value : 0;
+}
+
+function countJobs(
+  db: Database.Database,
+  where: string,
+  params: (string | number)[],
+  countCap?: number
+): { total: number; estimated: boolean } {
+  const key = JSON.stringify([where, params, countCap ?? null]);
+  const generation = writeGeneration(db);
+  const cached = countCache.get(key);
+  if (cached && cached.generation === generation) {
+    // Refresh LRU position
+    countCache.delete(key);
+    countCache.set(key, cached);
+    return cached;
+  }
+
+  let result: { generation: number; total: number; estimated: boolean };
+  if (countCap) {
+    const n = (db
+      .prepare(`SELECT COUNT(*) as cnt FROM (SELECT 1 FROM jobs ${where} LIMIT ?)`)
+      .get(...params, countCap + 1) as { cnt: number }).cnt;
+    result = n > countCap
+      ? { generation, total: countCap, estimated: true }
+      : { generation, total: n, estimated: false };
+  } else {
+    const n = (db.prepare(`SELECT COUNT(*) as cnt FROM jobs ${where}`).get(...params) as { cnt: number }).cnt;
+    result = { generation, total: n, estimated: false };
+  }
+
+  countCache.delete(key);
+  countCache.set(key, result);
+  while (countCache.size > COUNT_CACHE_MAX) {
+    const oldest = countCache.keys().next().value as string;
+    countCache.delete(oldest);
+  }
+  return result;
+}
+
+// Days since 1970-01-01 (UTC) — the unit of jobs.created_day / posted_day
+// (migration 0008, same as epoch_day() in scraper/db.py)
+function epochDay(d: Date): number {
+  return Math.floor(d.getTime() / 86400000);
+}
+
+// Sort keys per mode — same as SORT_KEYS in scraper/db.py. Each key sorts DESC
+// with rowid ASC as the tiebreaker (carried by the composite indexes), so the
+// same keys drive ORDER BY and keyset cursors. Ordering on id instead would
+// need a temp B-tree per page; cursors carry cursorGeneration() instead.
+const SORT_KEYS: Record<string, string[]> = {
+  recent: ["created_at", "match_score"],
+  score: ["match_score", "created_at"],
+  salary: ["COALESCE(salary_min_lpa, 0)", "match_score"],
+  date: ["posted_date", "created_at"],
+  // Precomputed by scraper/ranking.py (migration 0006)
+  smart: ["smart_score"],
+};
+
+function sortMode(sortBy?: string, smartView?: boolean): string {
+  if (smartView) return "smart";
+  return sortBy && sortBy in SORT_KEYS ? sortBy : "recent";
+}
+
+function orderByFor(mode: string): string {
+  return "ORDER BY " + SORT_KEYS[mode].map((k) => `${k} DESC`).join(", ") + ", rowid";
+}
+
+export class CursorError extends Error {}
+
+// Which rowids a cursor's tiebreaker refers to: each snapshot is a new file
+// (VACUUM INTO, which may renumber rowids), and compact_db() bumps
+// rowid_generation (migration 0019) after vacuuming the live jobs.db
+function cursorGeneration(db: Database.Database): string {
+  const row = db.prepare("SELECT value FROM meta WHERE key = 'rowid_generation'").get() as { value: number } | undefined;
+  return `${dbVersion ?? "live"}.${row ? row.value : 0}`;
+}
+
+// Opaque keyset cursor: sort mode, the last row's sort keys, its rowid and
+// the cursor generation that rowid belongs to
+function encodeCursor(mode: string, values: unknown[], rowid: number, generation: string): string {
+  return Buffer.from(JSON.stringify([mode, values, rowid, generation])).toString("base64url");
+}
+
+function decodeCursor(cursor: string, mode: string, generation: string): [unknown[], number] {
+  let decoded: unknown;
+  try {
+    decoded = JSON.parse(Buffer.from(cursor, "base64url").toString("utf-8"));
+  } catch {
+    throw new CursorError("Invalid cursor");
+  }
+  if (!Array.isArray(decoded) || decoded.length !== 4 || !Array.isArray(decoded[1])) {
+    throw new CursorError("Invalid cursor");
+  }
+  const [curMode, values, rowid, curGeneration] = decoded as [string, unknown[], number, string];
+  if (curMode !== mode || values.length !== SORT_KEYS[mode].length) {
+    throw new CursorError("Cursor does not match the sort order");
+  }
+  if (curGeneration !== generation) {
+    throw new CursorError("Cursor is from an earlier snapshot; start again from the first page");
+  }
+  return [values, Number(rowid)];
+}
+
+// Rows strictly after the cursor, e.g. for two keys:
+//   a <= ? AND (a < ? OR (a = ? AND (b < ? OR (b = ? AND rowid > ?))))
+// The leading "a <= ?" gives the planner an index range on the sort index.
+function keysetFilter(mode: string, values: unknown[], rowid: number): { clause: string; params: (string | number)[] } {
+  const keys = SORT_KEYS[mode];
+  let clause = "rowid > ?";
+  let params = [rowid] as (string | number)[];
+  for (let i = keys.length - 1; i >= 0; i--) {
+    const v = values[i] as string | number;
+    clause = `(${keys[i]} < ? OR (${keys[i]} = ? AND ${clause}))`;
+    params = [v, v, ...params];
+  }
+  return { clause: ` AND ${keys[0]} <= ? AND ${clause}`, params: [values[0] as string | number, ...params] };
+}
+
+// FTS5 prefix query, same as fts_query() in scraper/db.py, OR'd with the
+// joined spelling against search_joined (migration 0017):
+// "full-stack" -> ({title company} : "full stack"*) OR ({search_joined} : "fullstack"*)
+// Returns null if the text has no word characters (caller falls back to LIKE).
+const FTS_TOKEN_RE = new RegExp("[\\p{L}\\p{N}]+", "gu");
+
+export function ftsQuery(text: string, columns: string): string | null {
+  const tokens = text.toLowerCase().match(FTS_TOKEN_RE);
+  if (!tokens) return null;
+  return `({${columns}} : "${tokens.join(" ")}"*) OR ({search_joined} : "${tokens.join("")}"*)`;
+}
+
+// Salary facet buckets (LPA upper bounds, exclusive) — same as
+// SALARY_BUCKETS in scraper/db.py. Rows without a salary are not counted.
+const SALARY_BUCKETS: [number | null, string][] = [[10, "0-10"], [20, "10-20"], [40, "20-40"], [null, "40+"]];
+
+const SALARY_BUCKET_SQL =
+  "CASE WHEN COALESCE(salary_min_lpa, 0) <= 0 THEN NULL " +
+  SALARY_BUCKETS.map(([upper, label]) =>
+    upper !== null ? `WHEN salary_min_lpa < ${upper} THEN '${label}'` : `ELSE '${label}'`
+  ).join(" ") +
+  " END";
+
+// All facet counts for a filter from one GROUP BY pass, rolled up here
+// (same as get_facets() in scraper/db.py).
+function computeFacets(db: Database.Database, where: string, params: (string | number)[]): Facets {
+  const rows = db
+    .prepare(
+      `SELECT country, source, ${SALARY_BUCKET_SQL} AS salary_bucket, COUNT(*) AS cnt,
+              SUM(remote = 1) AS remote, SUM(is_faang = 1) AS faang,
+              SUM(visa_sponsored = 1) AS visa, SUM(has_equity = 1) AS equity
+       FROM jobs ${where}
+       GROUP BY 1, 2, 3`
+    )
+    .all(...params) as {
+      country: string | null; source: string | null; salary_bucket: string | null;
+      cnt: number; remote: number; faang: number; visa: number; equity: number;
+    }[];
+
+  const facets: Facets = {
+    total: 0,
+    country: {},
+    source: {},
+    salary: Object.fromEntries(SALARY_BUCKETS.map(([, label]) => [label, 0])),
+    remote: 0,
+    faang: 0,
+    visa: 0,
+    equity: 0,
+  };
+  for (const r of rows) {
+    facets.total += r.cnt;
+    facets.country[r.country || ""] = (facets.country[r.country || ""] || 0) + r.cnt;
+    facets.source[r.source || ""] = (facets.source[r.source || ""] || 0) + r.cnt;
+    if (r.salary_bucket) facets.salary[r.salary_bucket] += r.cnt;
+    facets.remote += r.remote;
+    facets.faang += r.faang;
+    facets.visa += r.visa;
+    facets.equity += r.equity;
+  }
+  const byCount = (o: Record<string, number>) => Object.fromEntries(Object.entries(o).sort((a, b) => b[1] - a[1]));
+  facets.country = byCount(facets.country);
+  facets.source = byCount(facets.source);
+  return facets;
+}
+
 export function getJobs(params: {
   page?: number;
   per_page?: number;
@@ -113,6 +365,10 @@ export function getJobs(params: {
   max_salary?: number;
   visa_only?: boolean;
   equity_only?: boolean;
+  collapse?: boolean;
+  cursor?: string;
+  count_cap?: number;
+  facets?: boolean;
 }): JobsResponse {
   const db = getDb();
   const page = params.page || 1;
@@ -120,7 +376,9 @@ export function getJobs(params: {
   const offset = (page - 1) * perPage;
   const minScore = params.min_score || 0;
 
-  let where = "WHERE match_score >= ?";
+  // Unary + keeps the score floor from driving the plan (see scraper/db.py
+  // build_job_filters); the indexed filters below pick the index instead
+  let where = "WHERE +match_score >= ?";
   const queryParams: (string | number)[] = [minScore];
 
   if (params.remote_only) {
@@ -128,19 +386,24 @@ export function getJobs(params: {
   }
 
   if (params.keyword) {
-    where += " AND (LOWER(title) LIKE ? OR LOWER(company) LIKE ?)";
-    const kw = `%${params.keyword.toLowerCase()}%`;
-    queryParams.push(kw, kw);
+    const match = ftsQuery(params.keyword, "title company");
+    if (match) {
+      where += " AND rowid IN (SELECT rowid FROM jobs_fts WHERE jobs_fts MATCH ?)";
+      queryParams.push(match);
+    } else {
+      where += " AND (LOWER(title) LIKE ? OR LOWER(company) LIKE ?)";
+      const kw = `%${params.keyword.toLowerCase()}%`;
+      queryParams.push(kw, kw);
+    }
   }
 
   if (params.source) {
     const sources = params.source.split(",").map(s => s.trim()).filter(Boolean);
-    if (sources.length === 1) {
-      where += " AND source LIKE ?";
-      queryParams.push(`%${sources[0]}%`);
-    } else if (sources.length > 1) {
-      const placeholders = sources.map(() => "source LIKE ?").join(" OR ");
-      where += ` AND (${placeholders})`;
+    if (sources.length > 0) {
+      // Substring match against the small sources table (migration 0007),
+      // then an IN lookup on the indexed jobs.source_id
+      const likes = sources.map(() => "name LIKE ?").join(" OR ");
+      where += ` AND source_id IN (SELECT id FROM sources WHERE ${likes})`;
       sources.forEach(s => queryParams.push(`%${s}%`));
     }
   }
@@ -168,23 +431,28 @@ export function getJobs(params: {
     queryParams.push(params.max_salary);
   }
 
+  const today = epochDay(new Date());
   if (params.today_only) {
-    const todayStr = new Date().toISOString().split("T")[0];
-    where += " AND posted_date = ?";
-    queryParams.push(todayStr);
+    where += " AND posted_day = ?";
+    queryParams.push(today);
   }
 
   if (params.max_days_ago !== undefined && params.max_days_ago > 0) {
-    const since = new Date();
-    since.setDate(since.getDate() - params.max_days_ago);
-    const sinceStr = since.toISOString().split("T")[0];
-    where += " AND posted_date >= ?";
-    queryParams.push(sinceStr);
+    where += " AND posted_day >= ?";
+    queryParams.push(today - params.max_days_ago);
   }
 
   if (params.company) {
-    where += " AND LOWER(company) LIKE ?";
-    queryParams.push(`%${params.company.toLowerCase()}%`);
+    // Substring match against known company names (scraper/companies.py),
+    // then an IN lookup on the indexed jobs.company_id
+    const alias = params.company.toLowerCase().replace(/[^a-z0-9]/g, "");
+    if (alias) {
+      where += " AND company_id IN (SELECT company_id FROM company_aliases WHERE alias LIKE ?)";
+      queryParams.push(`%${alias}%`);
+    } else {
+      where += " AND LOWER(company) LIKE ?";
+      queryParams.push(`%${params.company.toLowerCase()}%`);
+    }
   }
 
   if (params.visa_only) {
@@ -197,113 +465,111 @@ export function getJobs(params: {
 
   // Smart View: high score + fresh + has signal
   if (params.smart_view) {
-    where += " AND match_score >= 70";
-    const weekAgo = new Date();
-    weekAgo.setDate(weekAgo.getDate() - 7);
-    where += " AND (posted_date >= ? OR created_at >= ?)";
-    const weekStr = weekAgo.toISOString().split("T")[0];
-    queryParams.push(weekStr, weekStr);
+    where += " AND +match_score >= 70"; // the freshness window is the selective term
+    where += " AND (posted_day >= ? OR created_day >= ?)";
+    queryParams.push(today - 7, today - 7);
     where += " AND (salary_min_lpa > 0 OR remote = 1 OR is_india = 1 OR is_faang = 1)";
   }
 
-  // Determine sort order
-  let orderBy = "ORDER BY created_at DESC, match_score DESC";
-  if (params.sort_by === "smart" || params.smart_view) {
-    // Weighted composite: match(40%) + freshness(25%) + salary_signal(15%) + source_quality(20%)
-    orderBy = `ORDER BY (
-      (match_score * 0.4) +
-      (CASE
-        WHEN julianday('now') - julianday(COALESCE(posted_date, created_at)) <= 0 THEN 100
-        WHEN julianday('now') - julianday(COALESCE(posted_date, created_at)) <= 1 THEN 80
-        WHEN julianday('now') - julianday(COALESCE(posted_date, created_at)) <= 3 THEN 50
-        WHEN julianday('now') - julianday(COALESCE(posted_date, created_at)) <= 7 THEN 20
-        ELSE 5
-      END * 0.25) +
-      (CASE WHEN COALESCE(salary_min_lpa, 0) > 0 THEN MIN(COALESCE(salary_min_lpa, 0), 100) ELSE 0 END * 0.15) +
-      (CASE
-        WHEN source LIKE '%jsearch%' THEN 100
-        WHEN source LIKE '%greenhouse%' THEN 95
-        WHEN source LIKE '%lever%' THEN 90
-        WHEN source LIKE '%serp%' THEN 40
-        WHEN source LIKE '%adzuna%' THEN 30
-        ELSE 50
-      END * 0.2)
-    ) DESC`;
-  } else if (params.sort_by === "score") {
-    orderBy = "ORDER BY match_score DESC, created_at DESC";
-  } else if (params.sort_by === "salary") {
-    orderBy = "ORDER BY COALESCE(salary_min_lpa, 0) DESC, match_score DESC";
-  } else if (params.sort_by === "date") {
-    orderBy = "ORDER BY posted_date DESC, created_at DESC";
+  // One row per near-duplicate cluster (its oldest job); see scraper/dedup.py
+  if (params.collapse) {
+    where += " AND (cluster_id IS NULL OR cluster_id = rowid)";
   }
 
-  const total = db
-    .prepare(`SELECT COUNT(*) as cnt FROM jobs ${where}`)
-    .get(...queryParams) as { cnt: number };
+  const mode = sortMode(params.sort_by, params.smart_view);
+  const keys = SORT_KEYS[mode];
+
+  const total = countJobs(db, where, queryParams, params.count_cap);
+
+  let pageWhere = where;
+  const pageParams = [...queryParams];
+  let pageOffset = offset;
+  const generation = cursorGeneration(db);
+  if (params.cursor) {
+    const [values, rowid] = decodeCursor(params.cursor, mode, generation);
+    const keyset = keysetFilter(mode, values, rowid);
+    pageWhere += keyset.clause;
+    pageParams.push(...keyset.params);
+    pageOffset = 0;
+  }
 
-  const jobs = db
+  const keyCols = keys.map((k, i) => `, ${k} AS _k${i}`).join("");
+  const rows = db
     .prepare(
-      `SELECT * FROM jobs ${where} ${orderBy} LIMIT ? OFFSET ?`
+      `SELECT *, rowid AS _rowid${keyCols} FROM jobs ${pageWhere} ${orderByFor(mode)} LIMIT ? OFFSET ?`
     )
-    .all(...queryParams, perPage, offset) as Job[];
+    .all(...pageParams, perPage, pageOffset) as Record<string, unknown>[];
+
+  let nextCursor: string | null = null;
+  const jobs = rows.map((row, idx) => {
+    const { _rowid, ...job } = row;
+    const values = keys.map((_, i) => job[`_k${i}`]);
+    keys.forEach((_, i) => delete job[`_k${i}`]);
+    if (idx === rows.length - 1 && rows.length === perPage) {
+      nextCursor = encodeCursor(mode, values, _rowid as number, generation);
+    }
+    return job as unknown as Job;
+  });
+  overlaySaved(jobs);
 
   return {
     jobs,
-    total: total.cnt,
+    total: total.total,
+    total_is_estimate: total.estimated,
     page,
     per_page: perPage,
+    next_cursor: nextCursor,
+    ...(params.facets ? { facets: computeFacets(db, where, queryParams) } : {}),
   };
 }
 
 export function getStats(): StatsResponse {
   const db = getDb();
-  const total = (db.prepare("SELECT COUNT(*) as cnt FROM jobs").get() as { cnt: number }).cnt;
   const today = new Date().toISOString().split("T")[0];
-  const todayCount = (
-    db
-      .prepare("SELECT COUNT(*) as cnt FROM jobs WHERE created_at LIKE ?")
-      .get(`${today}%`) as { cnt: number }
-  ).cnt;
-
-  const sources = db
-    .prepare("SELECT source, COUNT(*) as cnt FROM jobs GROUP BY source")
-    .all() as { source: string; cnt: number }[];
-
-  let india = 0;
-  let remote = 0;
-  let faang = 0;
-  let withSalary = 0;
-  try {
-    india = (db.prepare("SELECT COUNT(*) as cnt FROM jobs WHERE is_india = 1").get() as { cnt: number }).cnt;
-    remote = (db.prepare("SELECT COUNT(*) as cnt FROM jobs WHERE remote = 1").get() as { cnt: number }).cnt;
-    faang = (db.prepare("SELECT COUNT(*) as cnt FROM jobs WHERE is_faang = 1").get() as { cnt: number }).cnt;
-    withSalary = (db.prepare("SELECT COUNT(*) as cnt FROM jobs WHERE salary_min_lpa IS NOT NULL AND salary_min_lpa > 0").get() as { cnt: number }).cnt;
-  } catch { }
-
-  // Companies – exclude junk names starting with http/https or digits
-  let companies: { company: string; cnt: number }[] = [];
-  try {
-    companies = db
-      .prepare(
-        `SELECT company, COUNT(*) as cnt FROM jobs
-         WHERE company != ''
-           AND company NOT LIKE 'http%'
-           AND company NOT GLOB '[0-9]*'
-         GROUP BY company
-         ORDER BY cnt DESC
-         LIMIT 100`
-      )
-      .all() as { company: string; cnt: number }[];
-  } catch { }
+
+  // job_stats is kept current by triggers (migration 0005), so these are
+  // primary-key / index range reads rather than full-table aggregates.
+  const rows = db
+    .prepare(
+      `SELECT dim, key, cnt FROM job_stats
+       WHERE dim IN ('total', 'source', 'flag') OR (dim = 'day' AND key = ?)`
+    )
+    .all(today) as { dim: string; key: string; cnt: number }[];
+
+  let total = 0;
+  let todayCount = 0;
+  const bySource: Record<string, number> = {};
+  const flags: Record<string, number> = {};
+  for (const r of rows) {
+    if (r.dim === "total") total = r.cnt;
+    else if (r.dim === "day") todayCount = r.cnt;
+    else if (r.dim === "source" && r.cnt > 0) bySource[r.key] = r.cnt;
+    else if (r.dim === "flag") flags[r.key] = r.cnt;
+  }
+
+  // Companies – counters are keyed by company_id (migration 0011); exclude
+  // junk names starting with http/https or digits
+  const companies = db
+    .prepare(
+      `SELECT c.name AS company, s.cnt FROM job_stats s
+       JOIN companies c ON c.id = CAST(s.key AS INTEGER)
+       WHERE s.dim = 'company' AND s.cnt > 0
+         AND s.key != ''
+         AND c.name NOT LIKE 'http%'
+         AND c.name NOT GLOB '[0-9]*'
+       ORDER BY s.cnt DESC
+       LIMIT 100`
+    )
+    .all() as { company: string; cnt: number }[];
 
   return {
     total,
     today: todayCount,
-    by_source: Object.fromEntries(sources.map((s) => [s.source, s.cnt])),
+    by_source: bySource,
     by_company: Object.fromEntries(companies.map((c) => [c.company, c.cnt])),
-    india,
-    remote,
-    faang,
-    with_salary: withSalary,
+    india: flags.india ?? 0,
+    remote: flags.remote ?? 0,
+    faang: flags.faang ?? 0,
+    with_salary: flags.with_salary ?? 0,
   };
 }
@@ -0,0 +1,88 @@
+import Database from "better-sqlite3";
+import path from "path";
+import fs from "fs";
+
+// Versioned migrations shared with the scraper (scraper/schema.py).
+// In Docker: cwd is /app/web, so ../scraper/migrations = /app/scraper/migrations
+function migrationsDir(): string {
+  const local = path.resolve(process.cwd(), "..", "scraper", "migrations");
+  return fs.existsSync(local) ? local : "/app/scraper/migrations";
+}
+
+interface Migration {
+  version: number;
+  name: string;
+  sql: string;
+}
+
+let migrations: Migration[] | null = null;
+
+function loadMigrations(): Migration[] {
+  if (!migrations) {
+    const dir = migrationsDir();
+    const found: Migration[] = [];
+    for (const file of fs.readdirSync(dir).sort()) {
+      const m = /^(\d{4})_[\w-]+\.sql$/.exec(file);
+      if (!m) continue;
+      found.push({
+        version: parseInt(m[1], 10),
+        name: file.replace(/\.sql$/, ""),
+        sql: fs.readFileSync(path.join(dir, file), "utf-8"),
+      });
+    }
+    found.forEach((mig, i) => {
+      if (mig.version !== i + 1) {
+        throw new Error(`Migration versions must be contiguous from 1, got ${mig.name}`);
+      }
+    });
+    migrations = found;
+  }
+  return migrations;
+}
+
+// Same rules as split_statements() in scraper/schema.py
+export function splitStatements(sql: string): string[] {
+  const statements: string[] = [];
+  let buf: string[] = [];
+  for (const line of sql.split(/\r?\n/)) {
+    const stripped = line.trim();
+    if (buf.length === 0 && (!stripped || stripped.startsWith("--"))) continue;
+    buf.push(line);
+    if (!stripped.endsWith(";")) continue;
+    if (/^\s*CREATE\s+TRIGGER\b/i.test(buf[0]) && stripped.toUpperCase() !== "END;") continue;
+    statements.push(buf.join("\n"));
+    buf = [];
+  }
+  if (buf.length > 0) statements.push(buf.join("\n"));
+  return statements;
+}
+
+export function latestVersion(): number {
+  return loadMigrations().length;
+}
+
+/** Apply pending migrations. A single PRAGMA read when the schema is current. */
+export function ensureSchema(db: Database.Database): void {
+  const current = db.pragma("user_version", { simple: true }) as number;
+  if (current >= latestVersion()) return;
+
+  for (const mig of loadMigrations()) {
+    db.transaction(() => {
+      // Re-check under the write lock: the scraper may have migrated already
+      if ((db.pragma("user_version", { simple: true }) as number) >= mig.version) return;
+      for (const stmt of splitStatements(mig.sql)) {
+        try {
+          db.exec(stmt);
+        } catch (err) {
+          const msg = err instanceof Error ? err.message : "";
+          if (/^\s*ALTER\s+TABLE\s+\S+\s+ADD\s+COLUMN\b/i.test(stmt) && msg.includes("duplicate column name")) {
+            continue;
+          }
+          throw err;
+        }
+      }
+      db.pragma(`user_version = ${mig.version}`);
+    }).immediate();
+    console.log(`[DB] Applied migration ${mig.name}`);
+  }
+}